@@ -0,0 +1,115 @@
+"""
+Benchmark the order slot extractor against the original per-slot loops.
+
+Builds a corpus of barista transcripts (customer and agent turns), checks
+both parsers agree on every utterance, and reports time per utterance.
+
+    uv run benchmark_order_parser.py --utterances 20000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from order_parser import DEFAULT_EXTRACTOR, OrderSlots
+
+TEMPLATES = [
+    "Hi, can I get a {size} {drink} please?",
+    "I'd like a {drink} with {milk} milk.",
+    "{size} {drink}, {milk} milk, and add {extra}.",
+    "My name is {name}.",
+    "It's for {name}, thanks!",
+    "Could you add {extra} and {extra2} to that?",
+    "Great choice! What size would you like for your {drink}?",
+    "Got it, a {size} {drink} with {milk} milk. Any extras?",
+    "Perfect, and what name should I put on the order?",
+    "Sure! One {size} {drink} with {extra} coming right up for {name}.",
+    "Hmm, I'm not sure yet, what do you recommend?",
+    "This is {name}, I'll take a {drink}.",
+    "Thanks for visiting Byte & Brew Cafe, have a lovely day!",
+]
+DRINKS = ["latte", "cappuccino", "americano", "mocha", "espresso", "macchiato", "flat white", "cold brew", "tea"]
+SIZES = ["small", "medium", "large", "regular"]
+MILKS = ["oat", "almond", "soy", "coconut", "whole", "skim", "nonfat", "2%"]
+EXTRAS = ["whipped cream", "an extra shot", "caramel drizzle", "vanilla syrup", "chocolate", "cinnamon"]
+NAMES = ["Priya", "Sam", "Rashid", "Balakrishna", "Jo", "Mei", "Olu", "Gangadir"]
+
+
+def build_corpus(size: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            drink=rng.choice(DRINKS), size=rng.choice(SIZES), milk=rng.choice(MILKS),
+            extra=rng.choice(EXTRAS), extra2=rng.choice(EXTRAS), name=rng.choice(NAMES),
+        )
+        for _ in range(size)
+    ]
+
+
+def legacy_extract(text: str) -> OrderSlots:
+    """The per-slot substring loops and re.search calls _parse_and_update used before."""
+    text_lower = text.lower()
+    drink = size = milk = name = None
+    extras: List[str] = []
+
+    for d in ['latte', 'cappuccino', 'americano', 'mocha', 'espresso', 'macchiato', 'flat white', 'cold brew']:
+        if d in text_lower and not drink:
+            drink = d
+    if 'small' in text_lower:
+        size = 'small'
+    elif 'medium' in text_lower:
+        size = 'medium'
+    elif 'large' in text_lower:
+        size = 'large'
+    for milk_type in ['oat', 'almond', 'soy', 'coconut', 'whole', 'skim', '2%', 'nonfat']:
+        if milk_type in text_lower and not milk:
+            milk = milk_type + (' milk' if milk_type in ['oat', 'almond', 'soy', 'coconut'] else '')
+    for extra in ['whipped cream', 'extra shot', 'caramel', 'vanilla', 'chocolate']:
+        if extra in text_lower and extra not in extras:
+            extras.append(extra)
+    for pattern in [r"my name is (\w+)", r"name is (\w+)", r"for (\w+)", r"i'm (\w+)", r"this is (\w+)"]:
+        match = re.search(pattern, text_lower)
+        if match and not name:
+            name = match.group(1).capitalize()
+            break
+    return OrderSlots(drink=drink, size=size, milk=milk, extras=tuple(extras), name=name)
+
+
+def time_per_call(fn, corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best / len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--utterances", type=int, default=20000, help="transcripts in the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.utterances, args.seed)
+    mismatches = [text for text in corpus if legacy_extract(text) != DEFAULT_EXTRACTOR.extract(text)]
+
+    legacy = time_per_call(legacy_extract, corpus, args.repeat)
+    compiled = time_per_call(DEFAULT_EXTRACTOR.extract, corpus, args.repeat)
+
+    print(f"📊 {len(corpus)} utterances, best of {args.repeat}\n")
+    print(f"   per-slot loops:    {legacy * 1e6:8.2f} µs/utterance")
+    print(f"   compiled extractor:{compiled * 1e6:8.2f} µs/utterance  ({legacy / compiled:.1f}x)")
+    print(f"\n   disagreements: {len(mismatches)}")
+    for text in mismatches[:5]:
+        print(f"     {text!r}: {legacy_extract(text)} vs {DEFAULT_EXTRACTOR.extract(text)}")
+
+
+if __name__ == "__main__":
+    main()
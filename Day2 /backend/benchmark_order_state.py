@@ -0,0 +1,126 @@
+"""
+Memory and serialization benchmark for OrderState.
+
+Builds thousands of concurrent sessions' orders with the previous dataclass
+and with the slotted OrderState, and reports the memory each session's order
+holds and the cost of the to_dict() calls made per update, receipt and save.
+
+    uv run benchmark_order_state.py --sessions 5000
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from order_state import OrderState
+
+DRINKS = ["latte", "cappuccino", "americano", "mocha", "espresso", "flat white"]
+SIZES = ["small", "medium", "large"]
+MILKS = ["oat milk", "almond milk", "whole", "skim"]
+EXTRAS = ["whipped cream", "extra shot", "caramel", "vanilla", "chocolate"]
+NAMES = ["Priya", "Sam", "Rashid", "Balakrishna", "Jo", "Mei", "Olu", "Gangadir"]
+
+
+@dataclass
+class LegacyOrderState:
+    """The plain dataclass OrderState used before."""
+
+    drinkType: Optional[str] = None
+    size: Optional[str] = None
+    milk: Optional[str] = None
+    extras: Optional[list[str]] = None
+    name: Optional[str] = None
+
+    def is_complete(self) -> bool:
+        return all([self.drinkType, self.size, self.milk, self.name])
+
+    def to_dict(self):
+        return {
+            "drinkType": self.drinkType,
+            "size": self.size,
+            "milk": self.milk,
+            "extras": self.extras or [],
+            "name": self.name,
+        }
+
+
+def fill(order, rng: random.Random) -> None:
+    """Fill an order the way a conversation does, from freshly transcribed strings."""
+    # Values arrive as new str objects from each transcript, not shared literals
+    order.drinkType = "".join(rng.choice(DRINKS))
+    order.size = "".join(rng.choice(SIZES))
+    order.milk = "".join(rng.choice(MILKS))
+    extras = ["".join(e) for e in rng.sample(EXTRAS, 2)]
+    if isinstance(order, OrderState):
+        for extra in extras:
+            order.add_extra(extra)
+    else:
+        order.extras = []
+        order.extras.extend(extras)
+    order.name = "".join(rng.choice(NAMES))
+
+
+def measure_memory(factory: Callable[[], object], sessions: int, serialize: bool) -> float:
+    """Bytes allocated per session for its order (and its dict form, if `serialize`)."""
+    rng = random.Random(1)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    orders: List[object] = []
+    keep: List[object] = []
+    for _ in range(sessions):
+        order = factory()
+        fill(order, rng)
+        if serialize:
+            # A session holds on to its latest dict form (pending update, receipt)
+            keep.append(order.to_dict())
+        orders.append(order)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Don't count the two lists holding everything
+    overhead = sys.getsizeof(orders) + sys.getsizeof(keep)
+    return (after - before - overhead) / sessions
+
+
+def measure_to_dict(factory: Callable[[], object], calls_per_change: int, changes: int, repeat: int = 5) -> float:
+    """Seconds per to_dict() call when each change is followed by several reads (best of `repeat`)."""
+    rng = random.Random(2)
+    order = factory()
+    fill(order, rng)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for i in range(changes):
+            order.size = SIZES[i % 3]
+            for _ in range(calls_per_change):
+                order.to_dict()
+        best = min(best, time.perf_counter() - started)
+    return best / (changes * calls_per_change)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000, help="concurrent sessions to simulate")
+    parser.add_argument("--reads", type=int, default=3, help="to_dict() calls per change (update, receipt, save)")
+    args = parser.parse_args()
+
+    print(f"📊 {args.sessions} concurrent sessions\n")
+    print(f"{'':<22}{'order only':>14}{'with dict':>14}{'per read':>14}")
+    for label, factory in (("dataclass (before)", LegacyOrderState), ("slotted OrderState", OrderState)):
+        bare = measure_memory(factory, args.sessions, serialize=False)
+        with_dict = measure_memory(factory, args.sessions, serialize=True)
+        per_call = measure_to_dict(factory, args.reads, 20000)
+        print(f"{label:<22}{bare:>12.0f} B{with_dict:>12.0f} B{per_call * 1e9:>11.0f} ns")
+    print(f"\nBytes per session include the order's own strings and lists; 'per read' is one change plus "
+          f"{args.reads} to_dict() calls, divided by {args.reads}.")
+
+
+if __name__ == "__main__":
+    main()
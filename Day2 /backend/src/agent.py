@@ -1,10 +1,5 @@
 import logging
-import json
-import os
-import re
-from datetime import datetime
 from typing import Optional
-from dataclasses import dataclass
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -23,36 +18,25 @@ from livekit.agents import (
 from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
+from order_parser import DEFAULT_EXTRACTOR, OrderSlotExtractor
+from order_state import OrderState
+from order_store import ORDERS_DIR, OrderStore
+from order_updates import OrderUpdatePublisher
+from receipt_service import ReceiptService
+from transcript_supervisor import TranscriptSupervisor
+
 logger = logging.getLogger("barista-agent")
 load_dotenv(".env")
 
-ORDERS_DIR = "orders"
-os.makedirs(ORDERS_DIR, exist_ok=True)
-
-
-@dataclass
-class OrderState:
-    drinkType: Optional[str] = None
-    size: Optional[str] = None
-    milk: Optional[str] = None
-    extras: Optional[list[str]] = None
-    name: Optional[str] = None
-    
-    def is_complete(self) -> bool:
-        return all([self.drinkType, self.size, self.milk, self.name])
-    
-    def to_dict(self):
-        return {
-            "drinkType": self.drinkType,
-            "size": self.size,
-            "milk": self.milk,
-            "extras": self.extras or [],
-            "name": self.name
-        }
-
 
 class BaristaAgent(Agent):
-    def __init__(self, agent_session: AgentSession) -> None:
+    def __init__(
+        self,
+        agent_session: AgentSession,
+        store: OrderStore,
+        receipts: ReceiptService,
+        extractor: OrderSlotExtractor = DEFAULT_EXTRACTOR,
+    ) -> None:
         super().__init__(
             instructions="""You are a friendly barista at Byte & Brew Cafe.
 
@@ -73,6 +57,10 @@ Be friendly, concise, and natural.""",
         self._last_transcript = ""
         self._order_confirmed = False
         self._order_id = None
+        self._store = store
+        self._receipts = receipts
+        self._extractor = extractor
+        self.order_updates = OrderUpdatePublisher(self._publish)
     
     @function_tool
     async def save_order(
@@ -90,88 +78,80 @@ Be friendly, concise, and natural.""",
         self.order.name = name
         self.order.extras = extras or []
         
-        # Save to JSON
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        order_id = f"order_{timestamp}_{name.replace(' ', '_')}"
-        filename = f"{ORDERS_DIR}/{order_id}.json"
-        
-        order_data = {
-            **self.order.to_dict(),
-            "timestamp": datetime.now().isoformat(),
-            "status": "completed"
-        }
-        
-        with open(filename, 'w') as f:
-            json.dump(order_data, f, indent=2)
-        
-        # Store order ID and automatically show receipt
-        self._order_id = order_id
-        self._order_confirmed = True
-        
-        # Automatically send receipt display command
-        await self._send_receipt_display()
-        
-        logger.info(f"✅ Order saved: {filename}")
-        logger.info(f"🧾 Receipt URL: /receipt/{order_id}")
-        logger.info(f"📤 Receipt display command sent automatically")
+        # Save and automatically show the receipt
+        await self._confirm_order()
         
         return f"Perfect! Your order for a {size} {drink_type} with {milk} is confirmed. Opening your receipt now. Thank you for visiting Byte & Brew Cafe!"
     
     @function_tool
-    async def show_receipt(self):
-        """Show the receipt to the customer when they request it."""
+    async def show_receipt(self, customer_name: Optional[str] = None):
+        """Show the receipt to the customer when they request it.
+        
+        Args:
+            customer_name: The customer's name, to find their latest order if none was placed in this conversation
+        """
         logger.info(f"🧾 show_receipt() called!")
         logger.info(f"   - Order confirmed: {self._order_confirmed}")
         logger.info(f"   - Order ID: {self._order_id}")
         
-        if not self._order_confirmed or not self._order_id:
+        order_id = self._order_id if self._order_confirmed else None
+        if not order_id and customer_name:
+            recent = self._receipts.recent_orders(customer_name)
+            order_id = recent[0] if recent else None
+        
+        if not order_id:
             logger.warning("⚠️ No order to show receipt for")
             return "Please complete your order first."
         
         # Send receipt display command to frontend
-        await self._send_receipt_display()
+        if not await self._send_receipt_display(order_id):
+            return "Sorry, I couldn't find that receipt."
         
-        logger.info(f"✅ Receipt display command sent for: {self._order_id}")
+        logger.info(f"✅ Receipt display command sent for: {order_id}")
         return "Great! Opening your receipt now. Thank you for visiting Byte & Brew Cafe!"
     
-    async def _send_update(self, complete: bool = False, order_id: Optional[str] = None):
-        """Send order update to frontend"""
+    async def _confirm_order(self):
+        """Save the current order and open its receipt"""
+        # Claim the confirmation first so the parser can't start a second save meanwhile
+        self._order_confirmed = True
         try:
-            message = {
-                "type": "order_update",
-                "order": self.order.to_dict(),
-                "complete": complete
-            }
-            
-            if order_id:
-                message["order_id"] = order_id
-            
-            await self._agent_session.room.local_participant.publish_data(
-                json.dumps(message).encode('utf-8'),
-                topic="order-updates"
-            )
-            
-            logger.info(f"📤 Sent to frontend: {message}")
-        except Exception as e:
-            logger.error(f"Failed to send update: {e}")
+            record = await self._store.save(self.order.to_dict())
+        except Exception:
+            self._order_confirmed = False
+            raise
+        self._order_id = record["order_id"]
+        
+        await self._send_receipt_display()
+        
+        logger.info(f"✅ Order saved: {self._order_id}")
+        logger.info(f"🧾 Receipt URL: /receipt/{self._order_id}")
+        logger.info(f"📤 Receipt display command sent!")
     
-    async def _send_receipt_display(self):
-        """Send command to display receipt"""
+    async def _publish(self, payload: bytes):
+        await self._agent_session.room.local_participant.publish_data(payload, topic="order-updates")
+    
+    def _send_update(self, complete: bool = False, order_id: Optional[str] = None):
+        """Queue an order update for the frontend; changes within a short window go out as one diff"""
+        self.order_updates.publish(self.order.to_dict(), complete=complete, order_id=order_id)
+    
+    async def _send_receipt_display(self, order_id: Optional[str] = None) -> bool:
+        """Send command to display a receipt (this session's order by default)"""
+        order_id = order_id or self._order_id
         try:
-            message = {
-                "type": "show_receipt",
-                "order_id": self._order_id,
-                "order": self.order.to_dict()
-            }
+            # Let queued order updates arrive before the receipt
+            await self.order_updates.flush()
+            payload = await self._receipts.receipt(order_id)
+            if payload is None:
+                logger.warning(f"⚠️ No stored order {order_id}")
+                return False
             
-            await self._agent_session.room.local_participant.publish_data(
-                json.dumps(message).encode('utf-8'),
-                topic="order-updates"
-            )
+            await self._agent_session.room.local_participant.publish_data(payload, topic="order-updates")
             
-            logger.info(f"🧾 Sent receipt display command: {message}")
+            logger.info(f"🧾 Sent receipt display command for {order_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to send receipt display: {e}")
+            return False
     
     async def on_agent_speech(self, text: str):
         """Called when agent speaks - parse for order info"""
@@ -183,102 +163,59 @@ Be friendly, concise, and natural.""",
     
     async def _parse_and_update(self, text: str):
         """Parse text and extract order information"""
-        text_lower = text.lower()
+        slots = self._extractor.extract(text)
         updated = False
         
-        # Extract drink type
-        drinks = ['latte', 'cappuccino', 'americano', 'mocha', 'espresso', 'macchiato', 'flat white', 'cold brew']
-        for drink in drinks:
-            if drink in text_lower and not self.order.drinkType:
-                self.order.drinkType = drink
-                updated = True
-                logger.info(f"🔍 Found drink: {drink}")
-        
-        # Extract size
-        if not self.order.size:
-            if 'small' in text_lower:
-                self.order.size = 'small'
-                updated = True
-            elif 'medium' in text_lower:
-                self.order.size = 'medium'
-                updated = True
-            elif 'large' in text_lower:
-                self.order.size = 'large'
-                updated = True
+        # Fill each slot the first time it is mentioned
+        if slots.drink and not self.order.drinkType:
+            self.order.drinkType = slots.drink
+            updated = True
+            logger.info(f"🔍 Found drink: {slots.drink}")
         
-        # Extract milk
-        milks = ['oat', 'almond', 'soy', 'coconut', 'whole', 'skim', '2%', 'nonfat']
-        for milk_type in milks:
-            if milk_type in text_lower and not self.order.milk:
-                self.order.milk = milk_type + (' milk' if milk_type in ['oat', 'almond', 'soy', 'coconut'] else '')
-                updated = True
-                logger.info(f"🔍 Found milk: {milk_type}")
+        if slots.size and not self.order.size:
+            self.order.size = slots.size
+            updated = True
         
-        # Extract extras
-        extras_keywords = ['whipped cream', 'extra shot', 'caramel', 'vanilla', 'chocolate']
-        for extra in extras_keywords:
-            if extra in text_lower:
-                if self.order.extras is None:
-                    self.order.extras = []
-                if extra not in self.order.extras:
-                    self.order.extras.append(extra)
-                    updated = True
-                    logger.info(f"🔍 Found extra: {extra}")
+        if slots.milk and not self.order.milk:
+            self.order.milk = slots.milk
+            updated = True
+            logger.info(f"🔍 Found milk: {slots.milk}")
         
-        # Extract name (look for "my name is X" or "for X")
-        name_patterns = [
-            r"my name is (\w+)",
-            r"name is (\w+)",
-            r"for (\w+)",
-            r"i'm (\w+)",
-            r"this is (\w+)"
-        ]
-        for pattern in name_patterns:
-            match = re.search(pattern, text_lower)
-            if match and not self.order.name:
-                self.order.name = match.group(1).capitalize()
+        for extra in slots.extras:
+            if self.order.add_extra(extra):
                 updated = True
-                logger.info(f"🔍 Found name: {self.order.name}")
-                break
+                logger.info(f"🔍 Found extra: {extra}")
+        
+        if slots.name and not self.order.name:
+            self.order.name = slots.name
+            updated = True
+            logger.info(f"🔍 Found name: {self.order.name}")
         
         # Check if order is complete and not yet confirmed
         if self.order.is_complete() and not self._order_confirmed:
             logger.info("🎯 Order is complete! Preparing receipt...")
             
-            # Save order to JSON
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            order_id = f"order_{timestamp}_{self.order.name.replace(' ', '_')}"
-            filename = f"{ORDERS_DIR}/{order_id}.json"
-            
-            order_data = {
-                **self.order.to_dict(),
-                "timestamp": datetime.now().isoformat(),
-                "status": "completed"
-            }
-            
-            with open(filename, 'w') as f:
-                json.dump(order_data, f, indent=2)
-            
-            # Store order ID and mark as confirmed
-            self._order_id = order_id
-            self._order_confirmed = True
-            
-            # Send receipt display command
-            await self._send_receipt_display()
-            
-            logger.info(f"✅ Order saved: {filename}")
-            logger.info(f"🧾 Receipt URL: /receipt/{order_id}")
-            logger.info(f"📤 Receipt display command sent!")
+            await self._confirm_order()
             
             updated = True
+        elif updated and self._order_id:
+            # Late changes to a confirmed order are saved too, which refreshes its cached receipt
+            await self._store.update(self._order_id, self.order.to_dict())
         
         # Send update if anything changed
         if updated:
-            await self._send_update(complete=self._order_confirmed)
+            self._send_update(complete=self._order_confirmed)
 
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    # Index the order log and customers' recent orders now rather than on the first confirmation
+    orders = OrderStore(ORDERS_DIR)
+    orders.open()
+    receipts = ReceiptService(orders)
+    receipts.warm()
+    proc.userdata["orders"] = orders
+    proc.userdata["receipts"] = receipts
 
 
 async def entrypoint(ctx: JobContext):
@@ -298,7 +235,14 @@ async def entrypoint(ctx: JobContext):
         preemptive_generation=True,
     )
     
-    agent = BaristaAgent(agent_session=session)
+    agent = BaristaAgent(
+        agent_session=session,
+        store=ctx.proc.userdata["orders"],
+        receipts=ctx.proc.userdata["receipts"],
+    )
+    
+    # Transcripts are parsed one at a time, in order, by a worker this session owns
+    transcripts = TranscriptSupervisor()
     
     # Hook into transcription events
     @session.on("user_speech_committed")
@@ -306,16 +250,13 @@ async def entrypoint(ctx: JobContext):
         if ev.alternatives and len(ev.alternatives) > 0:
             text = ev.alternatives[0].text
             logger.info(f"👤 User: {text}")
-            # Schedule the async call
-            import asyncio
-            asyncio.create_task(agent.on_user_speech(text))
+            transcripts.submit(agent.on_user_speech, text)
     
     @session.on("agent_speech_committed")
     def on_agent_speech(ev):
         text = ev.text
         logger.info(f"🤖 Agent: {text}")
-        import asyncio
-        asyncio.create_task(agent.on_agent_speech(text))
+        transcripts.submit(agent.on_agent_speech, text)
     
     usage_collector = metrics.UsageCollector()
     
@@ -330,6 +271,22 @@ async def entrypoint(ctx: JobContext):
     
     ctx.add_shutdown_callback(log_usage)
     
+    async def close_order_pipeline():
+        # Stop parsing before the last order updates are flushed
+        await transcripts.aclose()
+        await agent.order_updates.aclose()
+    
+    ctx.add_shutdown_callback(close_order_pipeline)
+    
+    # A frontend that (re)joins, or a reconnect of our own, needs the whole order again
+    @ctx.room.on("participant_connected")
+    def on_participant_connected(participant):
+        agent.order_updates.resync()
+    
+    @ctx.room.on("reconnected")
+    def on_reconnected():
+        agent.order_updates.resync()
+    
     await session.start(
         agent=agent,
         room=ctx.room,
@@ -0,0 +1,114 @@
+"""
+Slot extraction for coffee orders.
+Finds drink, size, milk, extras and the customer's name in a transcript with
+one pass of a single precompiled pattern built from the menu vocabulary.
+"""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# Positions of the single-valued slots while a transcript is being scanned
+_SLOT_INDEX = {"drink": 0, "size": 1, "milk": 2, "name": 3}
+
+
+def _terms(words: Sequence[str]) -> Dict[str, str]:
+    return {word: word for word in words}
+
+
+@dataclass(frozen=True)
+class MenuVocabulary:
+    """
+    Words the extractor listens for, mapped to the value stored on the order.
+
+    Within a slot, earlier entries win when a transcript mentions several.
+    Terms match at the start of a word ("lattes" is a latte, "boat" is not oat
+    milk); the word right after a name cue is taken as the customer's name.
+    """
+
+    drinks: Mapping[str, str] = field(default_factory=lambda: _terms(
+        ["latte", "cappuccino", "americano", "mocha", "espresso", "macchiato", "flat white", "cold brew"]
+    ))
+    sizes: Mapping[str, str] = field(default_factory=lambda: _terms(["small", "medium", "large"]))
+    milks: Mapping[str, str] = field(default_factory=lambda: {
+        "oat": "oat milk",
+        "almond": "almond milk",
+        "soy": "soy milk",
+        "coconut": "coconut milk",
+        "whole": "whole",
+        "skim": "skim",
+        "2%": "2%",
+        "nonfat": "nonfat",
+    })
+    extras: Mapping[str, str] = field(default_factory=lambda: _terms(
+        ["whipped cream", "extra shot", "caramel", "vanilla", "chocolate"]
+    ))
+    name_cues: Sequence[str] = ("my name is", "name is", "for", "i'm", "this is")
+
+
+DEFAULT_MENU = MenuVocabulary()
+
+
+class OrderSlots(NamedTuple):
+    """Everything one transcript mentions; slots it doesn't mention are None/empty."""
+
+    drink: Optional[str] = None
+    size: Optional[str] = None
+    milk: Optional[str] = None
+    extras: Tuple[str, ...] = ()
+    name: Optional[str] = None
+
+
+class OrderSlotExtractor:
+    """
+    Extracts every order slot from a transcript in one regex pass.
+
+    The whole menu is compiled once into a single alternation anchored at word
+    starts; each match is resolved to its slot with one dict lookup. A name
+    cue only peeks at the following word, so "for oat milk" still finds the
+    milk as well as the (wrong, but cheap to overwrite) name.
+    """
+
+    def __init__(self, menu: MenuVocabulary = DEFAULT_MENU):
+        self.menu = menu
+        # term -> (slot, priority within the slot, stored value; None for name cues)
+        self._terms: Dict[str, Tuple[str, int, Optional[str]]] = {}
+        vocabulary = (("drink", menu.drinks), ("size", menu.sizes), ("milk", menu.milks), ("extra", menu.extras))
+        for slot, terms in vocabulary:
+            for priority, (term, value) in enumerate(terms.items()):
+                self._terms.setdefault(term.lower(), (slot, priority, sys.intern(value)))
+        for priority, cue in enumerate(menu.name_cues):
+            self._terms.setdefault(cue.lower(), ("name", priority, None))
+
+        # Longest first: alternation takes the first alternative that matches, so
+        # "my name is" must be tried before "name is" and "flat white" before "flat"
+        alternatives = "|".join(re.escape(term) for term in sorted(self._terms, key=len, reverse=True))
+        self._pattern = re.compile(rf"\b({alternatives})(?: (?=(\w+)))?")
+
+    def extract(self, text: str) -> OrderSlots:
+        """All slots mentioned in `text`, case-insensitively."""
+        values: List[Optional[str]] = [None, None, None, None]
+        ranks = [len(self._terms)] * 4
+        extras: Optional[Dict[int, str]] = None
+        for term, following in self._pattern.findall(text.lower()):
+            slot, priority, value = self._terms[term]
+            if slot == "extra":
+                if extras is None:
+                    extras = {}
+                extras[priority] = value
+                continue
+            if value is None:
+                if not following:
+                    continue
+                value = following.capitalize()
+            index = _SLOT_INDEX[slot]
+            if priority < ranks[index]:
+                ranks[index] = priority
+                values[index] = value
+
+        drink, size, milk, name = values
+        return OrderSlots(drink, size, milk, tuple(extras[p] for p in sorted(extras)) if extras else (), name)
+
+
+DEFAULT_EXTRACTOR = OrderSlotExtractor()
@@ -0,0 +1,190 @@
+"""
+The order a barista session is building.
+Menu values are normalized through enums and shared, the state is slotted, and its dict form
+is built once per change instead of once per update, receipt and save.
+"""
+
+import sys
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+
+class MenuItem(str, Enum):
+    """A menu value; looked up case- and whitespace-insensitively."""
+
+    @classmethod
+    def _missing_(cls, value: object) -> Optional["MenuItem"]:
+        if not isinstance(value, str):
+            return None
+        key = " ".join(value.split()).lower()
+        for candidate in cls._candidates(key):
+            member = cls._value2member_map_.get(candidate)
+            if member is not None:
+                return member
+        return None
+
+    @classmethod
+    def _candidates(cls, key: str) -> Tuple[str, ...]:
+        return (key,)
+
+
+class Drink(MenuItem):
+    LATTE = "latte"
+    CAPPUCCINO = "cappuccino"
+    AMERICANO = "americano"
+    MOCHA = "mocha"
+    ESPRESSO = "espresso"
+    MACCHIATO = "macchiato"
+    FLAT_WHITE = "flat white"
+    COLD_BREW = "cold brew"
+
+
+class Size(MenuItem):
+    SMALL = "small"
+    MEDIUM = "medium"
+    LARGE = "large"
+
+
+class Milk(MenuItem):
+    OAT = "oat milk"
+    ALMOND = "almond milk"
+    SOY = "soy milk"
+    COCONUT = "coconut milk"
+    WHOLE = "whole"
+    SKIM = "skim"
+    TWO_PERCENT = "2%"
+    NONFAT = "nonfat"
+
+    @classmethod
+    def _candidates(cls, key: str) -> Tuple[str, ...]:
+        # "oat" and "oat milk" are the same milk
+        return (key, f"{key} milk", key.removesuffix(" milk"))
+
+
+class Extra(MenuItem):
+    WHIPPED_CREAM = "whipped cream"
+    EXTRA_SHOT = "extra shot"
+    CARAMEL = "caramel"
+    VANILLA = "vanilla"
+    CHOCOLATE = "chocolate"
+
+
+# value -> the member's own value string, so every order shares one object per menu value
+_CANONICAL: Dict[Type[MenuItem], Dict[str, str]] = {
+    kind: {member._value_: member._value_ for member in kind} for kind in (Drink, Size, Milk, Extra)
+}
+
+
+def menu_value(kind: Type[MenuItem], value: Optional[str]) -> Optional[str]:
+    """
+    The canonical spelling of a menu value ("Oat" -> "oat milk"), shared by
+    every order; off-menu values are kept as given, interned.
+    """
+    if value is None:
+        return None
+    canonical = _CANONICAL[kind].get(value)
+    if canonical is not None:
+        return canonical
+    try:
+        return kind(value)._value_
+    except ValueError:
+        return sys.intern(value)
+
+
+class _Field:
+    """A slot-backed attribute that coerces menu values and drops the cached dict when set."""
+
+    def __init__(self, kind: Optional[Type[MenuItem]] = None):
+        self.kind = kind
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = f"_{name}"
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if self.kind is not None:
+            value = menu_value(self.kind, value)
+        setattr(obj, self.slot, value)
+        obj._dict = None
+
+
+class _ExtrasField(_Field):
+    def __set__(self, obj: Any, value: Optional[Iterable[str]]) -> None:
+        extras: Tuple[str, ...] = ()
+        for extra in value or ():
+            extra = menu_value(Extra, extra)
+            if extra not in extras:
+                extras += (extra,)
+        obj._extras = extras
+        obj._dict = None
+
+
+class OrderState:
+    """
+    One customer's order.
+
+    Attributes take and return plain strings as before. Menu values are
+    normalized through the Drink/Size/Milk/Extra enums to their canonical
+    string, one object shared by every order; anything off-menu is kept as an
+    interned string. Extras are
+    an immutable tuple, changed with add_extra() or by assigning a new list.
+    to_dict() is cached until the next change, so callers must not mutate
+    what it returns.
+    """
+
+    __slots__ = ("_dict", "_drinkType", "_extras", "_milk", "_name", "_size")
+
+    drinkType = _Field(Drink)
+    size = _Field(Size)
+    milk = _Field(Milk)
+    extras = _ExtrasField()
+    name = _Field()
+
+    def __init__(
+        self,
+        drinkType: Optional[str] = None,
+        size: Optional[str] = None,
+        milk: Optional[str] = None,
+        extras: Optional[Iterable[str]] = None,
+        name: Optional[str] = None,
+    ):
+        self.drinkType = drinkType
+        self.size = size
+        self.milk = milk
+        self.extras = extras
+        self.name = name
+
+    def add_extra(self, extra: str) -> bool:
+        """Add an extra unless it's already on the order; returns whether it was added."""
+        value = menu_value(Extra, extra)
+        if value in self._extras:
+            return False
+        self._extras += (value,)
+        self._dict = None
+        return True
+
+    def is_complete(self) -> bool:
+        return all([self._drinkType, self._size, self._milk, self._name])
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._dict is None:
+            self._dict = {
+                "drinkType": self._drinkType,
+                "size": self._size,
+                "milk": self._milk,
+                "extras": list(self._extras),
+                "name": self._name,
+            }
+        return self._dict
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OrderState):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"OrderState({self.to_dict()})"
@@ -0,0 +1,281 @@
+"""
+Order storage for Byte & Brew Cafe.
+Confirmed orders are appended as one JSON line to orders/orders.jsonl by a
+background thread, so saving an order never blocks the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("barista-agent")
+
+ORDERS_DIR = "orders"
+ORDERS_FILE = "orders.jsonl"
+# The latest order's current record, for readers that shouldn't scan the log
+LATEST_FILE = "latest.json"
+
+
+def new_order_id(name: str, now: Optional[datetime] = None) -> str:
+    """
+    "order_20251123_092240_Washid_3fa9c1": readable, time-ordered, and with a
+    random tail so orders placed in the same second (in any worker process)
+    never share an id.
+    """
+    now = now or datetime.now()
+    return f"order_{now.strftime('%Y%m%d_%H%M%S')}_{name.replace(' ', '_')}_{secrets.token_hex(3)}"
+
+
+def _encode(order: Dict[str, Any]) -> bytes:
+    return (json.dumps(order, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class OrderStore:
+    """
+    Append-only log of orders with an in-memory index by order_id.
+    An update appends the order again; the newest line for an id wins.
+
+    Each order is written with a single O_APPEND write and fsynced on a
+    one-thread executor, so appends from every worker process interleave as
+    whole lines and this process's writes keep their order. The index maps
+    order_id to byte offset; lines appended by other processes are picked up
+    when a lookup misses. Legacy per-order files in the orders directory are
+    imported the first time the log is created.
+
+    The latest order is the one placed last (by its original timestamp), so
+    amending an older order doesn't make it the latest. Its current record
+    is also kept in latest.json, replaced atomically, for the frontend.
+    """
+
+    def __init__(self, orders_dir: str = ORDERS_DIR):
+        self.orders_dir = Path(orders_dir)
+        self.path = self.orders_dir / ORDERS_FILE
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        # order_id -> byte offset of its line
+        self._index: Dict[str, int] = {}
+        # (timestamp, order_id) of the order placed last
+        self._latest: Optional[Tuple[str, str]] = None
+        # Bytes of the log already indexed
+        self._indexed_size = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="order-store")
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call `listener(record)` in the event loop after every save or update."""
+        self._listeners.append(listener)
+
+    def _notify(self, record: Dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                logger.error(f"Order listener failed: {e}")
+
+    def open(self) -> None:
+        """Open the log and index it; done lazily otherwise, but cheaper to do at prewarm."""
+        with self._lock:
+            self._ensure_open()
+
+    def _ensure_open(self) -> int:
+        """Caller holds the lock."""
+        if self._fd is not None:
+            return self._fd
+        self.orders_dir.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            self._import_legacy()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size and os.pread(self._fd, 1, size - 1) != b"\n":
+            # Close off a line torn by a crash so the next order isn't glued onto it
+            logger.warning(f"⚠️ Incomplete order record at end of {self.path.name}")
+            os.write(self._fd, b"\n")
+        self._catch_up()
+        if self._latest is not None and not (self.orders_dir / LATEST_FILE).exists():
+            record = self._read_at(self._index[self._latest[1]])
+            self._write_latest(record)
+        logger.info(f"📒 Order store ready with {len(self._index)} orders")
+        return self._fd
+
+    def _import_legacy(self) -> None:
+        """Seed the log from order_*.json files written before it existed."""
+        orders = []
+        for file in sorted(self.orders_dir.glob("order_*.json")):
+            try:
+                order = json.loads(file.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠️ Skipping legacy order {file.name}: {e}")
+                continue
+            orders.append({**order, "order_id": file.stem})
+
+        temp_file = self.path.with_suffix(".tmp")
+        with open(temp_file, "wb") as f:
+            for order in orders:
+                f.write(_encode(order))
+            f.flush()
+            os.fsync(f.fileno())
+        # Another worker may have created the log meanwhile; keep theirs
+        try:
+            os.link(temp_file, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            temp_file.unlink()
+        if orders:
+            logger.info(f"📥 Imported {len(orders)} legacy order files")
+
+    def _catch_up(self) -> None:
+        """Index complete lines appended since the last scan. Caller holds the lock."""
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    # Being written by another process, or torn; read again later
+                    break
+                try:
+                    record = json.loads(line)
+                    order_id = record["order_id"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(f"⚠️ Skipping unreadable order record at byte {offset}")
+                else:
+                    self._index[order_id] = offset
+                    self._track_latest(record)
+                offset += len(line)
+            self._indexed_size = offset
+
+    def _append(self, order: Dict[str, Any]) -> None:
+        with self._lock:
+            fd = self._ensure_open()
+            self._catch_up()
+            line = _encode(order)
+            os.write(fd, line)
+            os.fsync(fd)
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+            self._index[order["order_id"]] = end - len(line)
+            if end - len(line) == self._indexed_size:
+                self._indexed_size = end
+            if self._track_latest(order):
+                self._write_latest(order)
+
+    def _track_latest(self, record: Dict[str, Any]) -> bool:
+        """Note a record; returns whether it is (a version of) the latest order. Caller holds the lock."""
+        key = (record.get("timestamp") or "", record["order_id"])
+        if self._latest is not None and key[1] != self._latest[1] and key < self._latest:
+            return False
+        self._latest = key
+        return True
+
+    def _write_latest(self, record: Dict[str, Any]) -> None:
+        """Replace latest.json with the latest order's record. Caller holds the lock."""
+        latest_path = self.orders_dir / LATEST_FILE
+        temp_file = latest_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            temp_file.write_bytes(_encode(record))
+            os.replace(temp_file, latest_path)
+        except OSError as e:
+            # Only the frontend reads it, and it falls back to the log
+            logger.error(f"Failed to write {LATEST_FILE}: {e}")
+
+    def _read_at(self, offset: int) -> Dict[str, Any]:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def _get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_open()
+            if order_id not in self._index:
+                self._catch_up()
+            offset = self._index.get(order_id)
+            if offset is None:
+                return None
+            return self._read_at(offset)
+
+    def iter_orders(self) -> Iterator[Dict[str, Any]]:
+        """Every record in the log, oldest first (an updated order appears once per version)."""
+        with self._lock:
+            self._ensure_open()
+            self._catch_up()
+            size = self._indexed_size
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in iter(f.readline, b""):
+                offset += len(line)
+                if offset > size:
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def _get_latest(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_open()
+            self._catch_up()
+            latest = self._latest
+        return self._get(latest[1]) if latest else None
+
+    async def save(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a confirmed order.
+
+        Args:
+            order: The order's slots (drinkType, size, milk, extras, name)
+
+        Returns:
+            The stored record, with its new order_id, timestamp and status
+        """
+        now = datetime.now()
+        record = {
+            **order,
+            "order_id": new_order_id(order.get("name") or "Guest", now),
+            "timestamp": now.isoformat(),
+            "status": "completed",
+        }
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._append, record)
+        self._notify(record)
+        return record
+
+    async def update(self, order_id: str, order: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Record a change to a saved order by appending its new version.
+
+        Returns:
+            The updated record, or None if no order has that id
+        """
+        previous = await self.get(order_id)
+        if previous is None:
+            return None
+        record = {**previous, **order, "order_id": order_id, "updated_at": datetime.now().isoformat()}
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._append, record)
+        self._notify(record)
+        return record
+
+    async def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """An order by id, or None."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, order_id)
+
+    async def latest(self) -> Optional[Dict[str, Any]]:
+        """The order placed most recently (updates don't count), or None."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get_latest)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_open()
+            return len(self._index)
+
+    def close(self) -> None:
+        """Finish queued writes and close the log."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
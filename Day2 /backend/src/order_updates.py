@@ -0,0 +1,127 @@
+"""
+Coalescing publisher for order_update messages on the order-updates topic.
+Slot changes made within a short window go out as one message holding only
+the fields that changed; a full snapshot is sent first and after reconnects.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("barista-agent")
+
+# Seconds to wait for further changes before publishing
+DEFAULT_WINDOW = 0.25
+
+
+class OrderUpdatePublisher:
+    """
+    Batches order updates and publishes them as diffs.
+
+    Every message carries ``seq``, incremented per message, so a receiver can
+    spot a gap. ``{"snapshot": true, "order": {...}}`` replaces the receiver's
+    state; ``{"changes": {...}}`` patches it. After resync() (a participant
+    joined or the room reconnected) or a failed send, the next message is a
+    snapshot again.
+    """
+
+    def __init__(self, send: Callable[[bytes], Awaitable[None]], window: float = DEFAULT_WINDOW):
+        self._send = send
+        self.window = window
+        self.seq = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.updates_coalesced = 0
+
+        self._pending: Optional[Dict[str, Any]] = None
+        # Last state sent, and what the receiver is known to hold (None until a snapshot went out)
+        self._last: Optional[Dict[str, Any]] = None
+        self._published: Optional[Dict[str, Any]] = None
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def publish(self, order: Dict[str, Any], complete: bool = False, order_id: Optional[str] = None) -> None:
+        """Queue the latest order state; it goes out once the window closes."""
+        # Copy lists too: OrderState appends extras in place
+        snapshot = {k: list(v) if isinstance(v, list) else v for k, v in order.items()}
+        state: Dict[str, Any] = {"order": snapshot, "complete": complete}
+        if order_id:
+            state["order_id"] = order_id
+        if self._pending is not None:
+            self.updates_coalesced += 1
+        self._pending = state
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def resync(self) -> None:
+        """Send a full snapshot next, e.g. when the frontend (re)joins the room."""
+        self._published = None
+        if self._pending is None:
+            self._pending = self._last
+        if self._pending is not None and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        # Cancelling the timer must not cut a send in half
+        await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        """Publish whatever is pending now instead of waiting for the window."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            state, self._pending = self._pending, None
+            if state is None:
+                return
+            message = self._message(state)
+            if message is None:
+                return
+
+            payload = json.dumps(message).encode("utf-8")
+            try:
+                await self._send(payload)
+            except Exception as e:
+                # The receiver may have missed this change; start over from a snapshot
+                self._published = None
+                logger.error(f"Failed to send update: {e}")
+                return
+
+            self._last = self._published = state
+            self.messages_sent += 1
+            self.bytes_sent += len(payload)
+            logger.info(f"📤 Sent to frontend: {message}")
+
+    def _message(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The message moving the receiver from what it holds to `state`, or None if nothing changed."""
+        published = self._published
+        if published is None:
+            self.seq += 1
+            return {"type": "order_update", "seq": self.seq, "snapshot": True, **state}
+
+        changes = {k: v for k, v in state["order"].items() if published["order"].get(k) != v}
+        message: Dict[str, Any] = {}
+        if changes:
+            message["changes"] = changes
+        if state["complete"] != published["complete"]:
+            message["complete"] = state["complete"]
+        if state.get("order_id") != published.get("order_id"):
+            message["order_id"] = state.get("order_id")
+        if not message:
+            return None
+        self.seq += 1
+        return {"type": "order_update", "seq": self.seq, **message}
+
+    async def aclose(self) -> None:
+        """Send anything still pending and stop the timer."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+        await self.flush()
+        logger.info(
+            f"📊 Order updates: {self.messages_sent} message(s), {self.bytes_sent} bytes, "
+            f"{self.updates_coalesced} coalesced"
+        )
@@ -0,0 +1,109 @@
+"""
+Receipt payloads for Byte & Brew Cafe.
+Keeps rendered show_receipt messages in memory so repeat requests are served
+without reading the order log, plus a per-customer index of recent orders.
+"""
+
+import json
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from order_store import OrderStore
+
+logger = logging.getLogger("barista-agent")
+
+DEFAULT_MAX_RECEIPTS = 256
+DEFAULT_RECENT_PER_CUSTOMER = 5
+
+
+def render_receipt(order: Dict[str, Any]) -> bytes:
+    """The show_receipt message the frontend opens a receipt from."""
+    message = {"type": "show_receipt", "order_id": order["order_id"], "order": order}
+    return json.dumps(message).encode("utf-8")
+
+
+def _customer_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class ReceiptService:
+    """
+    LRU cache of rendered receipts by order_id, kept current by the store.
+
+    The service subscribes to the OrderStore: every save or update replaces
+    the order's cached receipt (so an amended order is never shown stale)
+    and moves it to the front of its customer's recent orders. A cache miss
+    reads the order once from the store and keeps the rendering.
+    """
+
+    def __init__(
+        self,
+        store: OrderStore,
+        max_receipts: int = DEFAULT_MAX_RECEIPTS,
+        recent_per_customer: int = DEFAULT_RECENT_PER_CUSTOMER,
+    ):
+        if max_receipts < 1:
+            raise ValueError("max_receipts must be at least 1")
+        self.store = store
+        self.max_receipts = max_receipts
+        self.recent_per_customer = recent_per_customer
+        self.hits = 0
+        self.misses = 0
+
+        # order_id -> rendered payload; least recently used first
+        self._receipts: "OrderedDict[str, bytes]" = OrderedDict()
+        # customer name (casefolded) -> their order ids, newest first
+        self._by_customer: Dict[str, Deque[str]] = {}
+        store.subscribe(self._on_order_saved)
+
+    def warm(self) -> None:
+        """Index customers' recent orders from the whole log; run at prewarm."""
+        for order in self.store.iter_orders():
+            if order.get("order_id") and order.get("name"):
+                self._remember_customer(order["name"], order["order_id"])
+        logger.info(f"🧾 Receipt index ready for {len(self._by_customer)} customers")
+
+    def _on_order_saved(self, order: Dict[str, Any]) -> None:
+        self._put(order["order_id"], render_receipt(order))
+        if order.get("name"):
+            self._remember_customer(order["name"], order["order_id"])
+
+    def _put(self, order_id: str, payload: bytes) -> None:
+        self._receipts[order_id] = payload
+        self._receipts.move_to_end(order_id)
+        while len(self._receipts) > self.max_receipts:
+            self._receipts.popitem(last=False)
+
+    def _remember_customer(self, name: str, order_id: str) -> None:
+        recent = self._by_customer.setdefault(_customer_key(name), deque(maxlen=self.recent_per_customer))
+        if order_id in recent:
+            recent.remove(order_id)
+        recent.appendleft(order_id)
+
+    def invalidate(self, order_id: str) -> None:
+        """Drop a cached receipt; the next request re-reads the order."""
+        self._receipts.pop(order_id, None)
+
+    async def receipt(self, order_id: str) -> Optional[bytes]:
+        """The rendered show_receipt message for an order, or None if it doesn't exist."""
+        payload = self._receipts.get(order_id)
+        if payload is not None:
+            self.hits += 1
+            self._receipts.move_to_end(order_id)
+            return payload
+
+        self.misses += 1
+        order = await self.store.get(order_id)
+        if order is None:
+            return None
+        if order_id in self._receipts:
+            # Saved or updated while we were reading; that rendering is newer
+            return self._receipts[order_id]
+        payload = render_receipt(order)
+        self._put(order_id, payload)
+        return payload
+
+    def recent_orders(self, name: str) -> List[str]:
+        """A customer's most recent order ids, newest first (name matched case-insensitively)."""
+        return list(self._by_customer.get(_customer_key(name), ()))
@@ -0,0 +1,105 @@
+"""
+Per-session worker for transcript hooks.
+Speech events are queued and handled one at a time by a single task the
+session owns, instead of one unreferenced task per event.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("barista-agent")
+
+DEFAULT_MAX_QUEUE = 32
+
+TranscriptHandler = Callable[[str], Awaitable[None]]
+
+
+class TranscriptSupervisor:
+    """
+    Runs transcript handlers in order on one worker task.
+
+    submit() never blocks the event callback: it enqueues and returns. The
+    queue holds at most ``max_queue`` transcripts; beyond that new ones are
+    dropped (and counted) rather than piling up. Handlers run one at a time,
+    so they never race on the agent's order, and a handler that raises is
+    logged without stopping the worker. aclose() cancels the worker and
+    discards whatever is still queued.
+    """
+
+    def __init__(self, max_queue: int = DEFAULT_MAX_QUEUE):
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        self.max_queue = max_queue
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.max_depth = 0
+
+        # Created on first submit, inside the session's event loop
+        self._queue: Optional["asyncio.Queue[Tuple[TranscriptHandler, str]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        """Transcripts waiting to be handled."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, handler: TranscriptHandler, text: str) -> bool:
+        """Queue `handler(text)`; returns False if it was dropped."""
+        if self._closed:
+            return False
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._worker = asyncio.create_task(self._run(), name="transcript-supervisor")
+
+        self.submitted += 1
+        try:
+            self._queue.put_nowait((handler, text))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"⚠️ Transcript queue full ({self.max_queue}), dropped: {text[:50]!r}")
+            return False
+
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            handler, text = await self._queue.get()
+            try:
+                await handler(text)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Transcript handler failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued transcript has been handled."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def aclose(self) -> None:
+        """Stop the worker, cancelling the handler in flight and discarding the queue."""
+        self._closed = True
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+        logger.info(f"📊 Transcript queue: {self.metrics()}")
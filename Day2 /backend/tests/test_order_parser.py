@@ -0,0 +1,50 @@
+from order_parser import (
+    DEFAULT_EXTRACTOR,
+    MenuVocabulary,
+    OrderSlotExtractor,
+    OrderSlots,
+)
+
+
+def test_extracts_every_slot_in_one_call() -> None:
+    slots = DEFAULT_EXTRACTOR.extract("Can I get a Large Oat Latte with whipped cream and vanilla? My name is Priya")
+    assert slots == OrderSlots(
+        drink="latte", size="large", milk="oat milk", extras=("whipped cream", "vanilla"), name="Priya"
+    )
+
+
+def test_earlier_vocabulary_entries_win() -> None:
+    # Menu order, not position in the sentence, decides between two mentions
+    slots = DEFAULT_EXTRACTOR.extract("a mocha, or maybe a latte, small or large, vanilla then caramel")
+    assert slots.drink == "latte"
+    assert slots.size == "small"
+    assert slots.extras == ("caramel", "vanilla")
+
+
+def test_name_patterns_are_tried_in_order() -> None:
+    assert DEFAULT_EXTRACTOR.extract("this is Sam, ordering for Alex").name == "Alex"
+    assert DEFAULT_EXTRACTOR.extract("a latte for me please, my name is sam").name == "Sam"
+
+
+def test_overlapping_mentions_are_all_found() -> None:
+    slots = DEFAULT_EXTRACTOR.extract("flat white for oat drinkers")
+    assert slots.drink == "flat white"
+    assert slots.milk == "oat milk"
+    assert slots.name == "Oat"
+
+
+def test_nothing_mentioned() -> None:
+    assert DEFAULT_EXTRACTOR.extract("hello there!") == OrderSlots()
+
+
+def test_custom_menu() -> None:
+    extractor = OrderSlotExtractor(MenuVocabulary(
+        drinks={"chai": "chai latte", "chai latte": "chai latte"},
+        sizes={"tall": "small", "venti": "large"},
+        milks={"oat": "oat milk"},
+        extras={},
+        name_cues=("call me",),
+    ))
+    assert extractor.extract("Venti chai latte, call me Jo") == OrderSlots(
+        drink="chai latte", size="large", name="Jo"
+    )
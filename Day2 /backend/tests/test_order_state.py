@@ -0,0 +1,43 @@
+import json
+
+from order_state import Drink, Milk, OrderState, Size
+
+
+def test_menu_values_are_normalized_and_shared() -> None:
+    order = OrderState(drinkType="Flat  White", size="LARGE", milk="oat", name="Sam")
+    assert order.drinkType == Drink.FLAT_WHITE.value
+    assert order.size == "large"
+    assert order.milk is Milk.OAT.value
+    assert OrderState(milk="".join("oat milk")).milk is order.milk
+    assert OrderState(size="".join("large")).size is Size.LARGE.value
+    assert order.is_complete()
+
+    # Off-menu values are kept as given
+    order.drinkType = "Pumpkin Spice Latte"
+    assert order.drinkType == "Pumpkin Spice Latte"
+    assert json.loads(json.dumps(order.to_dict()))["milk"] == "oat milk"
+
+
+def test_to_dict_is_cached_until_the_order_changes() -> None:
+    order = OrderState(drinkType="latte")
+    first = order.to_dict()
+    assert order.to_dict() is first
+    assert first == {"drinkType": "latte", "size": None, "milk": None, "extras": [], "name": None}
+
+    order.size = "small"
+    second = order.to_dict()
+    assert second is not first
+    assert second["size"] == "small"
+
+    assert order.add_extra("Vanilla")
+    assert not order.add_extra("vanilla")
+    assert order.to_dict()["extras"] == ["vanilla"]
+    assert order.to_dict() is not second
+
+
+def test_assigning_extras_replaces_them_without_duplicates() -> None:
+    order = OrderState(extras=["caramel", "caramel", "cinnamon"])
+    assert order.extras == ("caramel", "cinnamon")
+    order.extras = None
+    assert order.to_dict()["extras"] == []
+    assert not order.is_complete()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+from datetime import datetime
+
+from order_store import LATEST_FILE, ORDERS_FILE, OrderStore, new_order_id
+
+
+def _slots(name: str = "Sam", drink: str = "latte"):
+    return {"drinkType": drink, "size": "large", "milk": "oat milk", "extras": [], "name": name}
+
+
+async def test_orders_saved_in_the_same_second_get_distinct_ids(tmp_path) -> None:
+    store = OrderStore(tmp_path)
+    records = await asyncio.gather(*(store.save(_slots()) for _ in range(20)))
+
+    ids = {r["order_id"] for r in records}
+    assert len(ids) == 20
+    assert all(r["status"] == "completed" and r["timestamp"] for r in records)
+    lines = (tmp_path / ORDERS_FILE).read_text().splitlines()
+    assert len(lines) == 20
+    assert await store.get(records[7]["order_id"]) == records[7]
+    store.close()
+
+
+def test_order_ids_keep_the_receipt_time_format() -> None:
+    order_id = new_order_id("Mary Jane", datetime(2025, 11, 23, 9, 22, 40))
+    assert order_id.startswith("order_20251123_092240_Mary_Jane_")
+    assert order_id.split("_")[2] == "092240"
+
+
+async def test_other_processes_appends_are_found(tmp_path) -> None:
+    ours, theirs = OrderStore(tmp_path), OrderStore(tmp_path)
+    mine = await ours.save(_slots("Ana"))
+    other = await theirs.save(_slots("Olu", "mocha"))
+
+    assert (await ours.get(other["order_id"]))["name"] == "Olu"
+    assert (await ours.latest())["order_id"] == other["order_id"]
+    assert (await theirs.get(mine["order_id"]))["name"] == "Ana"
+    ours.close()
+    theirs.close()
+
+
+async def test_legacy_order_files_are_imported_once(tmp_path) -> None:
+    legacy = {**_slots("Washid", "cappuccino"), "timestamp": "2025-11-23T09:22:40", "status": "completed"}
+    (tmp_path / "order_20251123_092240_Washid.json").write_text(json.dumps(legacy, indent=2))
+
+    store = OrderStore(tmp_path)
+    assert (await store.get("order_20251123_092240_Washid"))["drinkType"] == "cappuccino"
+    await store.save(_slots())
+    store.close()
+
+    reopened = OrderStore(tmp_path)
+    assert len(reopened) == 2
+    reopened.close()
+
+
+async def test_a_torn_last_line_does_not_swallow_the_next_order(tmp_path) -> None:
+    (tmp_path / ORDERS_FILE).write_bytes(b'{"order_id":"order_1","name":"A"}\n{"order_id":"ord')
+    store = OrderStore(tmp_path)
+    record = await store.save(_slots())
+    assert await store.get(record["order_id"]) == record
+    assert len(store) == 2
+    store.close()
+
+
+async def test_amending_an_older_order_does_not_make_it_the_latest(tmp_path) -> None:
+    store = OrderStore(tmp_path)
+    first = await store.save(_slots("Ana"))
+    second = await store.save(_slots("Olu", "mocha"))
+    await store.update(first["order_id"], {"size": "small"})
+
+    assert (await store.latest())["order_id"] == second["order_id"]
+    assert json.loads((tmp_path / LATEST_FILE).read_text()) == second
+    await store.update(second["order_id"], {"milk": "whole milk"})
+    assert json.loads((tmp_path / LATEST_FILE).read_text())["milk"] == "whole milk"
+    store.close()
+
+    # Rebuilt from the log when missing, still by original timestamp
+    (tmp_path / LATEST_FILE).unlink()
+    reopened = OrderStore(tmp_path)
+    assert (await reopened.latest())["order_id"] == second["order_id"]
+    assert json.loads((tmp_path / LATEST_FILE).read_text())["order_id"] == second["order_id"]
+    reopened.close()
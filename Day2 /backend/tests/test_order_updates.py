@@ -0,0 +1,81 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from order_updates import OrderUpdatePublisher
+
+
+class Channel:
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+        self.fail = False
+
+    async def send(self, payload: bytes) -> None:
+        if self.fail:
+            raise ConnectionError("data channel closed")
+        self.messages.append(json.loads(payload))
+
+
+def _order(**slots: Any) -> Dict[str, Any]:
+    order = {"drinkType": None, "size": None, "milk": None, "extras": [], "name": None}
+    order.update(slots)
+    return order
+
+
+async def test_updates_within_the_window_are_coalesced_into_one_snapshot() -> None:
+    channel = Channel()
+    updates = OrderUpdatePublisher(channel.send, window=0.01)
+    updates.publish(_order(drinkType="latte"))
+    updates.publish(_order(drinkType="latte", size="large"))
+    updates.publish(_order(drinkType="latte", size="large", milk="oat milk"))
+    await asyncio.sleep(0.05)
+
+    assert channel.messages == [{
+        "type": "order_update", "seq": 1, "snapshot": True, "complete": False,
+        "order": _order(drinkType="latte", size="large", milk="oat milk"),
+    }]
+    assert updates.updates_coalesced == 2
+
+
+async def test_later_messages_carry_only_what_changed() -> None:
+    channel = Channel()
+    updates = OrderUpdatePublisher(channel.send, window=0.01)
+    extras: List[str] = []
+    updates.publish(_order(drinkType="mocha", extras=extras))
+    await updates.flush()
+
+    # In-place changes to the caller's lists are still seen as changes
+    extras.append("caramel")
+    updates.publish(_order(drinkType="mocha", extras=extras))
+    await updates.flush()
+    updates.publish(_order(drinkType="mocha", extras=extras))
+    await updates.flush()
+    updates.publish(_order(drinkType="mocha", extras=extras, name="Sam"), complete=True, order_id="order-1")
+    await updates.aclose()
+
+    assert [m["seq"] for m in channel.messages] == [1, 2, 3]
+    assert channel.messages[1] == {"type": "order_update", "seq": 2, "changes": {"extras": ["caramel"]}}
+    assert channel.messages[2] == {
+        "type": "order_update", "seq": 3, "changes": {"name": "Sam"}, "complete": True, "order_id": "order-1",
+    }
+
+
+async def test_resync_and_failed_sends_fall_back_to_a_snapshot() -> None:
+    channel = Channel()
+    updates = OrderUpdatePublisher(channel.send, window=0.01)
+    updates.publish(_order(drinkType="latte"))
+    await updates.flush()
+
+    updates.resync()
+    await updates.flush()
+    assert channel.messages[-1]["snapshot"] is True
+    assert channel.messages[-1]["order"]["drinkType"] == "latte"
+
+    channel.fail = True
+    updates.publish(_order(drinkType="latte", size="small"))
+    await updates.flush()
+    channel.fail = False
+    updates.publish(_order(drinkType="latte", size="small", milk="whole"))
+    await updates.flush()
+    assert channel.messages[-1]["snapshot"] is True
+    assert channel.messages[-1]["order"]["milk"] == "whole"
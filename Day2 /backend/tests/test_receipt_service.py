@@ -0,0 +1,80 @@
+import json
+
+from order_store import OrderStore
+from receipt_service import ReceiptService
+
+
+def _slots(name: str = "Sam", drink: str = "latte"):
+    return {"drinkType": drink, "size": "large", "milk": "oat milk", "extras": [], "name": name}
+
+
+async def test_repeat_receipts_are_served_from_memory(tmp_path) -> None:
+    store = OrderStore(tmp_path)
+    receipts = ReceiptService(store)
+    record = await store.save(_slots())
+
+    reads = 0
+    original_get = store.get
+
+    async def counting_get(order_id):
+        nonlocal reads
+        reads += 1
+        return await original_get(order_id)
+
+    store.get = counting_get
+    for _ in range(3):
+        payload = await receipts.receipt(record["order_id"])
+        message = json.loads(payload)
+        assert message["type"] == "show_receipt"
+        assert message["order"] == record
+    assert reads == 0
+    assert receipts.hits == 3
+    store.close()
+
+
+async def test_updates_replace_the_cached_receipt(tmp_path) -> None:
+    store = OrderStore(tmp_path)
+    receipts = ReceiptService(store)
+    record = await store.save(_slots())
+    await receipts.receipt(record["order_id"])
+
+    await store.update(record["order_id"], {**_slots(), "extras": ["vanilla"]})
+    message = json.loads(await receipts.receipt(record["order_id"]))
+    assert message["order"]["extras"] == ["vanilla"]
+    assert (await store.get(record["order_id"]))["extras"] == ["vanilla"]
+
+    receipts.invalidate(record["order_id"])
+    message = json.loads(await receipts.receipt(record["order_id"]))
+    assert message["order"]["extras"] == ["vanilla"]
+    assert receipts.misses == 1
+    assert await receipts.receipt("order_missing") is None
+    store.close()
+
+
+async def test_cache_is_bounded(tmp_path) -> None:
+    store = OrderStore(tmp_path)
+    receipts = ReceiptService(store, max_receipts=2)
+    first = await store.save(_slots("Ana"))
+    await store.save(_slots("Bo"))
+    await store.save(_slots("Cy"))
+
+    assert await receipts.receipt(first["order_id"]) is not None
+    assert receipts.misses == 1
+    store.close()
+
+
+async def test_recent_orders_by_customer_survive_a_restart(tmp_path) -> None:
+    store = OrderStore(tmp_path)
+    receipts = ReceiptService(store, recent_per_customer=2)
+    ids = [(await store.save(_slots("Mary Jane")))["order_id"] for _ in range(3)]
+    await store.save(_slots("Olu"))
+
+    assert receipts.recent_orders("mary  JANE") == [ids[2], ids[1]]
+    store.close()
+
+    reopened = OrderStore(tmp_path)
+    warmed = ReceiptService(reopened, recent_per_customer=2)
+    warmed.warm()
+    assert warmed.recent_orders("Mary Jane") == [ids[2], ids[1]]
+    assert warmed.recent_orders("nobody") == []
+    reopened.close()
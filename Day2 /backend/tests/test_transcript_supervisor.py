@@ -0,0 +1,79 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from transcript_supervisor import TranscriptSupervisor
+
+
+async def test_handlers_run_one_at_a_time_in_order() -> None:
+    seen: List[str] = []
+    running = 0
+
+    async def handler(text: str) -> None:
+        nonlocal running
+        running += 1
+        assert running == 1
+        await asyncio.sleep(0.001)
+        seen.append(text)
+        running -= 1
+
+    transcripts = TranscriptSupervisor()
+    for text in ["a latte", "large please", "my name is Sam"]:
+        assert transcripts.submit(handler, text)
+    await transcripts.join()
+
+    assert seen == ["a latte", "large please", "my name is Sam"]
+    assert transcripts.metrics()["processed"] == 3
+    assert transcripts.max_depth >= 2
+    await transcripts.aclose()
+
+
+async def test_full_queue_drops_new_transcripts() -> None:
+    release = asyncio.Event()
+
+    async def handler(text: str) -> None:
+        await release.wait()
+
+    transcripts = TranscriptSupervisor(max_queue=2)
+    results = [transcripts.submit(handler, str(i)) for i in range(4)]
+    assert results == [True, True, False, False]
+    assert transcripts.dropped == 2
+
+    release.set()
+    await transcripts.join()
+    assert transcripts.processed == 2
+    await transcripts.aclose()
+
+
+async def test_failures_are_counted_and_close_cancels_pending_work() -> None:
+    started = asyncio.Event()
+    cancelled = False
+
+    async def failing(text: str) -> None:
+        raise ValueError("bad transcript")
+
+    async def slow(text: str) -> None:
+        nonlocal cancelled
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    transcripts = TranscriptSupervisor()
+    transcripts.submit(failing, "x")
+    transcripts.submit(slow, "y")
+    transcripts.submit(slow, "z")
+    await started.wait()
+    assert transcripts.failed == 1
+
+    await transcripts.aclose()
+    assert cancelled
+    assert not transcripts.submit(slow, "after close")
+
+
+def test_max_queue_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        TranscriptSupervisor(max_queue=0)
@@ -1,27 +1,6 @@
 import { notFound } from 'next/navigation';
-import { readFile } from 'fs/promises';
-import { join } from 'path';
 import { ReceiptView } from '@/components/app/receipt-view';
-
-interface OrderData {
-  drinkType: string;
-  size: string;
-  milk: string;
-  extras: string[];
-  name: string;
-  timestamp: string;
-  status: string;
-}
-
-async function getOrder(orderId: string): Promise<OrderData | null> {
-  try {
-    const orderPath = join(process.cwd(), '..', 'backend', 'orders', `${orderId}.json`);
-    const orderData = await readFile(orderPath, 'utf-8');
-    return JSON.parse(orderData);
-  } catch (error) {
-    return null;
-  }
-}
+import { readOrder } from '@/lib/orders';
 
 export default async function ReceiptPage({
   params,
@@ -29,7 +8,7 @@ export default async function ReceiptPage({
   params: Promise<{ orderId: string }>;
 }) {
   const { orderId } = await params;
-  const order = await getOrder(orderId);
+  const order = await readOrder(orderId);
 
   if (!order) {
     notFound();
@@ -0,0 +1,135 @@
+import { open, readFile, readdir, type FileHandle } from 'fs/promises';
+import { join } from 'path';
+
+// Written by backend/src/order_store.py: one JSON line per confirmed order, oldest first
+const ORDERS_DIR = join(process.cwd(), '..', 'backend', 'orders');
+const ORDERS_LOG = join(ORDERS_DIR, 'orders.jsonl');
+// The latest order's current record, replaced atomically on every save
+const ORDERS_LATEST = join(ORDERS_DIR, 'latest.json');
+
+export interface StoredOrder {
+  order_id?: string;
+  drinkType: string;
+  size: string;
+  milk: string;
+  extras: string[];
+  name: string;
+  timestamp: string;
+  status: string;
+}
+
+const READ_CHUNK = 64 * 1024;
+
+/** Complete log lines from newest to oldest, reading the file backwards a chunk at a time. */
+async function* orderLogFromEnd(): AsyncGenerator<StoredOrder> {
+  let handle: FileHandle;
+  try {
+    handle = await open(ORDERS_LOG, 'r');
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code !== 'ENOENT') {
+      throw error;
+    }
+    return;
+  }
+  try {
+    let position = (await handle.stat()).size;
+    // Bytes after the last newline seen so far; at the end of the file, a line still being written
+    let rest = Buffer.alloc(0);
+    let atEnd = true;
+    while (position > 0) {
+      const length = Math.min(READ_CHUNK, position);
+      position -= length;
+      const chunk = Buffer.alloc(length);
+      await handle.read(chunk, 0, length, position);
+      const buffer = Buffer.concat([chunk, rest]);
+      let lineEnd = buffer.length;
+      for (let i = buffer.length - 1; i >= 0; i--) {
+        if (buffer[i] !== 0x0a) {
+          continue;
+        }
+        if (!atEnd) {
+          const order = parseLine(buffer.subarray(i + 1, lineEnd));
+          if (order) {
+            yield order;
+          }
+        }
+        atEnd = false;
+        lineEnd = i;
+      }
+      rest = buffer.subarray(0, lineEnd);
+    }
+    if (!atEnd && rest.length > 0) {
+      const order = parseLine(rest);
+      if (order) {
+        yield order;
+      }
+    }
+  } finally {
+    await handle.close();
+  }
+}
+
+function parseLine(line: Buffer): StoredOrder | null {
+  try {
+    return JSON.parse(line.toString('utf-8'));
+  } catch {
+    // Record torn by a crash; the backend skips it too
+    return null;
+  }
+}
+
+/** An order by id, from the log or (before the backend first ran) its own legacy file. */
+export async function readOrder(orderId: string): Promise<StoredOrder | null> {
+  // Receipts are usually for recent orders, so this rarely reads far back
+  for await (const order of orderLogFromEnd()) {
+    if (order.order_id === orderId) {
+      return order;
+    }
+  }
+
+  if (!/^order_[\w-]+$/.test(orderId)) {
+    return null;
+  }
+  try {
+    return JSON.parse(await readFile(join(ORDERS_DIR, `${orderId}.json`), 'utf-8'));
+  } catch {
+    return null;
+  }
+}
+
+/** The most recently placed order and its id, or null if there are none. */
+export async function readLatestOrder(): Promise<{ order: StoredOrder; orderId: string } | null> {
+  // Kept by the backend, so amending an older order never makes it the latest
+  try {
+    const latest: StoredOrder = JSON.parse(await readFile(ORDERS_LATEST, 'utf-8'));
+    if (latest.order_id) {
+      return { order: latest, orderId: latest.order_id };
+    }
+  } catch (error) {
+    if (!(error instanceof SyntaxError) && (error as NodeJS.ErrnoException).code !== 'ENOENT') {
+      throw error;
+    }
+  }
+
+  // No pointer yet: pick by original timestamp, since an amended order is appended again
+  let newest: StoredOrder | null = null;
+  for await (const order of orderLogFromEnd()) {
+    if (order.order_id && (!newest || order.timestamp > newest.timestamp)) {
+      newest = order;
+    }
+  }
+  if (newest?.order_id) {
+    return { order: newest, orderId: newest.order_id };
+  }
+
+  // Per-order files from before the log, not yet imported by the backend
+  const files = await readdir(ORDERS_DIR);
+  const orderFiles = files.filter((f) => f.startsWith('order_') && f.endsWith('.json'));
+  if (orderFiles.length === 0) {
+    return null;
+  }
+  orderFiles.sort().reverse();
+  const orderId = orderFiles[0].replace('.json', '');
+  const order = JSON.parse(await readFile(join(ORDERS_DIR, orderFiles[0]), 'utf-8'));
+  return { order, orderId };
+}
@@ -0,0 +1,135 @@
+"""
+Load benchmark for the Notion tools, run against the local fake Notion API.
+
+Simulates concurrent users each adding intentions, listing tasks and
+completing one, through WellnessCompanion's own tool methods, and reports
+p50/p99 latency per tool.
+
+    uv run benchmark_notion.py --users 20 --rounds 3 --latency 0.15 --rate-limit 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+# The fake Notion API is a test helper, not part of the agent
+sys.path.insert(0, str(Path(__file__).parent / "tests"))
+
+from fake_notion import FakeNotionServer
+
+DATABASE_ID = "bench-db"
+TODO_PAGE_ID = "bench-todo"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (seconds)."""
+    ordered = sorted(samples)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def is_failure(reply: str) -> bool:
+    return "trouble" in reply or "encountered an error" in reply or "couldn't" in reply
+
+
+async def run(args: argparse.Namespace, server: FakeNotionServer) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+    """Drive the tools from `args.users` concurrent users; returns timings and failure counts per tool."""
+    # agent.py reads its Notion settings at import
+    os.environ.update({
+        "NOTION_API_URL": server.url,
+        "NOTION_API_KEY": "fake",
+        "NOTION_DATABASE_ID": DATABASE_ID,
+        "NOTION_TODO_PAGE_ID": TODO_PAGE_ID,
+    })
+    from agent import WellnessCompanion
+    from notion_api import get_notion_client
+    from notion_tasks import NotionTaskMirror
+    from wellness_storage import WellnessStorage
+
+    with server.store.lock:
+        for i in range(args.seed_tasks):
+            server.store.create_page({
+                "parent": {"database_id": DATABASE_ID},
+                "properties": {
+                    "Name": {"title": [{"text": {"content": f"Existing task {i}"}}]},
+                    "Status": {"select": {"name": "todo"}},
+                    "Date": {"date": {"start": f"2025-11-{1 + i % 28:02d}"}},
+                },
+            })
+
+    notion = get_notion_client()
+    mirror = NotionTaskMirror(notion, DATABASE_ID, TODO_PAGE_ID)
+    timings: Dict[str, List[float]] = defaultdict(list)
+    failures: Dict[str, int] = defaultdict(int)
+
+    async def timed(name: str, call) -> str:
+        started = time.perf_counter()
+        reply = await call
+        timings[name].append(time.perf_counter() - started)
+        if is_failure(reply):
+            failures[name] += 1
+        return reply
+
+    async def user(n: int, data_dir: str) -> None:
+        companion = WellnessCompanion(None, WellnessStorage(data_dir), mirror)
+        for r in range(args.rounds):
+            intentions = [f"User {n} round {r} walk", f"User {n} round {r} read"]
+            await timed("add_to_notion", companion.add_to_notion(None, intentions, "calm", "6"))
+            await timed("get_notion_tasks", companion.get_notion_tasks(None, "Todo"))
+            await timed("complete_notion_task", companion.complete_notion_task(None, intentions[0]))
+
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            await asyncio.gather(*(user(n, data_dir) for n in range(args.users)))
+    finally:
+        await notion.aclose()
+
+    return timings, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Notion tools against a local fake Notion API")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--rounds", type=int, default=3, help="add/list/complete rounds per user")
+    parser.add_argument("--seed-tasks", type=int, default=50, help="tasks in the database before the run")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds the fake API adds to every response")
+    parser.add_argument("--jitter", type=float, default=0.05, help="extra random latency, up to this many seconds")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests per second before the fake answers 429")
+    parser.add_argument("--burst", type=int, default=10, help="requests allowed at once before rate limiting")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    with FakeNotionServer(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit, burst=args.burst) as server:
+        started = time.perf_counter()
+        timings, failures = asyncio.run(run(args, server))
+        elapsed = time.perf_counter() - started
+        counts = dict(server.counts)
+
+    print(f"📊 {args.users} users x {args.rounds} rounds in {elapsed:.2f}s "
+          f"(latency {args.latency}s +{args.jitter}s, rate limit {args.rate_limit or 'off'})\n")
+    print(f"{'tool':<22}{'calls':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'failed':>8}")
+    results = {}
+    for name, samples in timings.items():
+        failed = failures.get(name, 0)
+        p50, p99 = percentile(samples, 50), percentile(samples, 99)
+        results[name] = {"calls": len(samples), "p50": p50, "p99": p99, "max": max(samples), "failed": failed}
+        print(f"{name:<22}{len(samples):>7}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}{max(samples) * 1000:>10.1f}{failed:>8}")
+
+    print(f"\nNotion requests: {sum(v for k, v in counts.items() if k != '429')}, rate limited: {counts.get('429', 0)}")
+    for route, count in sorted(counts.items()):
+        if route != "429":
+            print(f"   {count:>6}  {route}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"elapsed": elapsed, "tools": results, "requests": counts}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Import legacy wellness_log.json files into a wellness storage engine."""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from wellness_engines import ENGINES, import_legacy_log, open_engine
+from wellness_partitions import PartitionedWellnessStorage
+from wellness_storage import WellnessStorage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("logs", nargs="+", type=Path, help="wellness_log.json files to import")
+    parser.add_argument("--data-dir", type=Path, default=Path("."), help="directory holding the target store")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="jsonl", help="storage engine to import into")
+    parser.add_argument("--user", help="participant identity whose partition under --data-dir receives the sessions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logs = []
+    for log in args.logs:
+        if log.exists():
+            logs.append(log)
+        else:
+            print(f"⚠️  {log} not found, skipping")
+
+    if args.user:
+        # Through WellnessStorage, so the partition's streak and summary are brought up to date too
+        path = PartitionedWellnessStorage(args.data_dir).path_for(args.user)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        storage = WellnessStorage(path, engine=args.engine)
+        try:
+            total = sum(storage.import_legacy(log) for log in logs)
+            print(f"✅ Imported {total} session(s); {storage.get_session_count()} stored for {args.user} at {path}")
+        finally:
+            storage.close()
+        return
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    engine = open_engine(args.engine, args.data_dir)
+    try:
+        total = sum(import_legacy_log(engine, log) for log in logs)
+        print(f"✅ Imported {total} session(s); {engine.count()} stored in {args.engine} engine at {args.data_dir}")
+    finally:
+        engine.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,13 @@ Health & Wellness Voice Companion Agent.
 Conducts daily check-ins, tracks mood and intentions, and provides supportive guidance.
 """
 
+import asyncio
 import logging
 import os
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, List
 
-import httpx
 from dotenv import load_dotenv
 from livekit.agents import (
     Agent,
@@ -27,32 +28,50 @@ from livekit.agents import (
 from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
-from wellness_storage import WellnessStorage
+from notion_api import NotionAPIError, get_notion_client
+from notion_tasks import NotionTaskMirror
+from wellness_partitions import PartitionedWellnessStorage
+from wellness_storage import WELLNESS_LOG_FILE, WellnessStorage
 
 logger = logging.getLogger("wellness-agent")
 load_dotenv(".env")
 
-# Notion configuration
-NOTION_API_KEY = os.getenv("NOTION_API_KEY")
+# Notion configuration (the API key is read by notion_api)
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
 NOTION_TODO_PAGE_ID = os.getenv("NOTION_TODO_PAGE_ID")
+# Tasks read out per get_notion_tasks answer
+MAX_LISTED_TASKS = 10
 
-# Initialize wellness storage
-wellness_storage = WellnessStorage()
+# Wellness storage, partitioned per participant
+WELLNESS_DATA_DIR = os.getenv("WELLNESS_DATA_DIR", "wellness_data")
+wellness_partitions = PartitionedWellnessStorage(WELLNESS_DATA_DIR)
+if Path(WELLNESS_LOG_FILE).exists():
+    # History saved before partitioning belongs to one person; only they should get it
+    logger.warning(
+        f"⚠️ {WELLNESS_LOG_FILE} is not used by partitioned storage; import it with "
+        f"migrate_wellness_log.py {WELLNESS_LOG_FILE} --data-dir {WELLNESS_DATA_DIR} --user <identity>"
+    )
 
 
 class WellnessCompanion(Agent):
     """A supportive wellness companion that conducts daily check-ins."""
     
-    def __init__(self, agent_session: AgentSession) -> None:
-        # Get context from previous sessions
-        last_session = wellness_storage.get_last_session()
-        recent_sessions = wellness_storage.get_recent_sessions(limit=3)
-        session_count = wellness_storage.get_session_count()
-        streak = wellness_storage.get_streak()
+    def __init__(
+        self,
+        agent_session: AgentSession,
+        storage: WellnessStorage,
+        notion_tasks: Optional[NotionTaskMirror] = None,
+    ) -> None:
+        # Get context from this user's previous sessions (one read of the log)
+        history = storage.get_context(recent_limit=3)
         
         # Build context for the agent
-        context = self._build_context(last_session, recent_sessions, session_count, streak)
+        context = self._build_context(
+            history["last_session"],
+            history["recent_sessions"],
+            history["session_count"],
+            history["streak"],
+        )
         
         super().__init__(
             instructions=f"""You are a warm, supportive wellness companion. Your role is to conduct brief daily check-ins to help users reflect on their wellbeing and set intentions.
@@ -110,6 +129,8 @@ Remember: You're here to listen, reflect, and support - not to fix or diagnose."
         )
         
         self._agent_session = agent_session
+        self._storage = storage
+        self._notion_tasks = notion_tasks
         self._session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self._check_in_complete = False
     
@@ -200,7 +221,7 @@ Remember: You're here to listen, reflect, and support - not to fix or diagnose."
             return "Check-in already saved for this session."
         
         # Get reference to previous session
-        last_session = wellness_storage.get_last_session()
+        last_session = self._storage.get_last_session()
         previous_reference = None
         if last_session:
             previous_reference = f"Previous: {last_session.get('mood')} mood, {last_session.get('energy_level')} energy"
@@ -210,7 +231,7 @@ Remember: You're here to listen, reflect, and support - not to fix or diagnose."
             agent_summary = f"User feeling {mood} with {energy_level} energy. Focusing on: {', '.join(intentions[:2])}"
         
         # Save to storage
-        success = wellness_storage.save_session(
+        success = self._storage.save_session(
             session_id=self._session_id,
             mood=mood,
             energy_level=energy_level,
@@ -222,7 +243,7 @@ Remember: You're here to listen, reflect, and support - not to fix or diagnose."
         
         if success:
             self._check_in_complete = True
-            streak = wellness_storage.get_streak()
+            streak = self._storage.get_streak()
             
             logger.info(f"✅ Wellness check-in saved: {self._session_id}")
             logger.info(f"   Mood: {mood} | Energy: {energy_level}")
@@ -252,90 +273,77 @@ Remember: You're here to listen, reflect, and support - not to fix or diagnose."
             mood: User's current mood
             energy_level: User's energy level
         """
-        if not NOTION_API_KEY or not NOTION_DATABASE_ID:
+        if not self._notion_tasks:
             logger.error("Notion credentials not configured")
             return "I'm having trouble connecting to Notion. Please check the configuration."
         
-        try:
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
+        started = datetime.now().isoformat()
+        energy = self._parse_energy(energy_level)
+        
+        async def create_task(intention: str) -> bool:
+            # Create in Wellness Database (with mood, energy, etc.)
+            properties = {
+                "Name": {
+                    "title": [{"text": {"content": intention}}]
+                },
+                "Status": {
+                    "select": {"name": "todo"}
+                },
+                "Date": {
+                    "date": {"start": started}
+                },
+                "Mood": {
+                    "select": {"name": mood.capitalize()}
+                },
+                "Energy": {
+                    "number": energy
+                }
             }
             
-            tasks_created = 0
-            async with httpx.AsyncClient() as client:
-                for intention in intentions:
-                    # 1. Create in Wellness Database (with mood, energy, etc.)
-                    database_data = {
-                        "parent": {"database_id": NOTION_DATABASE_ID},
-                        "properties": {
-                            "Name": {
-                                "title": [{"text": {"content": intention}}]
-                            },
-                            "Status": {
-                                "select": {"name": "todo"}
-                            },
-                            "Date": {
-                                "date": {"start": datetime.now().isoformat()}
-                            },
-                            "Mood": {
-                                "select": {"name": mood.capitalize()}
-                            },
-                            "Energy": {
-                                "number": self._parse_energy(energy_level)
-                            }
-                        }
-                    }
-                    
-                    db_response = await client.post(
-                        "https://api.notion.com/v1/pages",
-                        headers=headers,
-                        json=database_data,
-                        timeout=10.0
-                    )
-                    
-                    if db_response.status_code == 200:
-                        logger.info(f"✅ Created in Wellness Database: {intention}")
-                        
-                        # 2. Also create a simple to-do item (checkbox) in To Do List page
-                        if NOTION_TODO_PAGE_ID:
-                            todo_block = {
-                                "children": [
-                                    {
-                                        "object": "block",
-                                        "type": "to_do",
-                                        "to_do": {
-                                            "rich_text": [{"type": "text", "text": {"content": intention}}],
-                                            "checked": False,
-                                            "color": "default"
-                                        }
-                                    }
-                                ]
-                            }
-                            
-                            todo_response = await client.patch(
-                                f"https://api.notion.com/v1/blocks/{NOTION_TODO_PAGE_ID}/children",
-                                headers=headers,
-                                json=todo_block,
-                                timeout=10.0
-                            )
-                            
-                            if todo_response.status_code == 200:
-                                logger.info(f"✅ Added to To Do List page: {intention}")
-                                tasks_created += 1
-                            else:
-                                logger.error(f"Failed to add to To Do List: {todo_response.status_code} - {todo_response.text}")
-                                logger.info(f"Make sure 'To Do List' page is shared with the integration!")
-                        
-                        tasks_created += 1
+            if await self._notion_tasks.create_page(properties) is None:
+                return False
+            
+            logger.info(f"✅ Created in Wellness Database: {intention}")
+            return True
+        
+        try:
+            # 1. Create every database page concurrently (the client caps requests in flight)
+            results = await asyncio.gather(*(create_task(i) for i in intentions), return_exceptions=True)
+            
+            created, failed = [], []
+            for intention, result in zip(intentions, results):
+                if result is True:
+                    created.append(intention)
+                else:
+                    if isinstance(result, BaseException):
+                        logger.error(f"Error creating Notion task '{intention}': {result}")
+                    failed.append(intention)
+            
+            # 2. Append a to-do item (checkbox) for each created task to the To Do List page, in one request
+            todo_failed = False
+            if created and NOTION_TODO_PAGE_ID:
+                try:
+                    if await self._notion_tasks.append_todos(created):
+                        logger.info(f"✅ Added {len(created)} item(s) to To Do List page")
                     else:
-                        logger.error(f"Failed to create Notion task: {db_response.text}")
+                        todo_failed = True
+                        logger.info(f"Make sure 'To Do List' page is shared with the integration!")
+                except Exception as e:
+                    todo_failed = True
+                    logger.error(f"Error adding to To Do List: {e}")
             
-            if tasks_created > 0:
-                return f"Done! I've added {tasks_created} task{'s' if tasks_created > 1 else ''} to your Notion database and to-do list."
-            else:
+            if not created:
                 return "I had trouble adding tasks to Notion. Please try again."
+            
+            response_text = f"Done! I've added {len(created)} task{'s' if len(created) > 1 else ''} to your Notion database"
+            if NOTION_TODO_PAGE_ID and not todo_failed:
+                response_text += " and to-do list"
+            response_text += "."
+            if failed:
+                response_text += f" I couldn't add: {', '.join(failed)}."
+            if todo_failed:
+                response_text += " I couldn't update your to-do list page, though."
+            return response_text
                 
         except Exception as e:
             logger.error(f"Error adding to Notion: {e}")
@@ -355,118 +363,39 @@ Remember: You're here to listen, reflect, and support - not to fix or diagnose."
         Args:
             task_name: Name of the task to mark as complete
         """
-        if not NOTION_API_KEY or not NOTION_DATABASE_ID:
+        if not self._notion_tasks:
             return "I'm having trouble connecting to Notion."
         
         try:
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
+            # Look the task up in the local mirror; re-sync once in case it was just added in Notion
+            if self._notion_tasks.has_synced:
+                self._notion_tasks.sync_in_background()
+            else:
+                await self._notion_tasks.sync()
+            task = self._notion_tasks.find_pending(task_name)
+            if task is None:
+                await self._notion_tasks.sync(force=True)
+                task = self._notion_tasks.find_pending(task_name)
             
-            async with httpx.AsyncClient() as client:
-                # Search for the task in database (database_id goes in URL, not body)
-                query_data = {
-                    "filter": {
-                        "property": "Name",
-                        "title": {
-                            "contains": task_name
-                        }
-                    }
-                }
-                
-                search_response = await client.post(
-                    f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query",
-                    headers=headers,
-                    json=query_data,
-                    timeout=10.0
-                )
+            if task is None:
+                return f"I couldn't find a task called '{task_name}' in your todo list. Could you try rephrasing?"
+            
+            if not await self._notion_tasks.set_status(task, "Done"):
+                return "I had trouble updating that task."
+            
+            logger.info(f"✅ Marked as complete in database: {task.name}")
+            
+            # Also try to check off the to-do item in the To Do List page
+            if NOTION_TODO_PAGE_ID:
+                try:
+                    item = self._notion_tasks.find_todo(task_name)
+                    if item and not item.checked and await self._notion_tasks.check_todo(item):
+                        logger.info(f"✅ Checked off in To Do List: {item.text}")
+                except Exception as e:
+                    logger.warning(f"Could not update To Do List page: {e}")
+            
+            return f"Great job! I've marked '{task_name}' as complete in your Notion database."
                 
-                if search_response.status_code == 200:
-                    results = search_response.json().get("results", [])
-                    
-                    # Filter for non-completed tasks
-                    pending_tasks = []
-                    for result in results:
-                        status_prop = result.get("properties", {}).get("Status", {})
-                        status = status_prop.get("select", {}).get("name", "").lower() if status_prop.get("select") else ""
-                        if status not in ["done", "completed"]:
-                            pending_tasks.append(result)
-                    
-                    if pending_tasks:
-                        # Update the first matching pending task
-                        page_id = pending_tasks[0]["id"]
-                        
-                        update_data = {
-                            "properties": {
-                                "Status": {
-                                    "select": {"name": "Done"}
-                                }
-                            }
-                        }
-                        
-                        update_response = await client.patch(
-                            f"https://api.notion.com/v1/pages/{page_id}",
-                            headers=headers,
-                            json=update_data,
-                            timeout=10.0
-                        )
-                        
-                        if update_response.status_code == 200:
-                            logger.info(f"✅ Marked as complete in database: {task_name}")
-                            
-                            # Also try to check off the to-do item in the To Do List page
-                            if NOTION_TODO_PAGE_ID:
-                                try:
-                                    # Get all blocks from the To Do List page
-                                    blocks_response = await client.get(
-                                        f"https://api.notion.com/v1/blocks/{NOTION_TODO_PAGE_ID}/children",
-                                        headers=headers,
-                                        timeout=10.0
-                                    )
-                                    
-                                    if blocks_response.status_code == 200:
-                                        blocks = blocks_response.json().get("results", [])
-                                        
-                                        # Find matching to-do block
-                                        for block in blocks:
-                                            if block.get("type") == "to_do":
-                                                todo_content = block.get("to_do", {}).get("rich_text", [])
-                                                if todo_content:
-                                                    text = todo_content[0].get("text", {}).get("content", "")
-                                                    if task_name.lower() in text.lower():
-                                                        # Update the to-do block to checked
-                                                        block_id = block["id"]
-                                                        check_data = {
-                                                            "to_do": {
-                                                                "checked": True
-                                                            }
-                                                        }
-                                                        
-                                                        check_response = await client.patch(
-                                                            f"https://api.notion.com/v1/blocks/{block_id}",
-                                                            headers=headers,
-                                                            json=check_data,
-                                                            timeout=10.0
-                                                        )
-                                                        
-                                                        if check_response.status_code == 200:
-                                                            logger.info(f"✅ Checked off in To Do List: {task_name}")
-                                                        break
-                                except Exception as e:
-                                    logger.warning(f"Could not update To Do List page: {e}")
-                            
-                            return f"Great job! I've marked '{task_name}' as complete in your Notion database."
-                        else:
-                            logger.error(f"Failed to update task: {update_response.text}")
-                            return "I had trouble updating that task."
-                    else:
-                        return f"I couldn't find a task called '{task_name}' in your todo list. Could you try rephrasing?"
-                else:
-                    logger.error(f"Failed to search tasks: {search_response.text}")
-                    return "I had trouble searching for that task."
-                    
         except Exception as e:
             logger.error(f"Error completing task: {e}")
             return "I encountered an error while updating the task."
@@ -485,106 +414,67 @@ Remember: You're here to listen, reflect, and support - not to fix or diagnose."
         Args:
             status: Optional filter by status ("Todo", "In Progress", "Done"). If not provided, returns all tasks.
         """
-        if not NOTION_API_KEY or not NOTION_DATABASE_ID:
+        if not self._notion_tasks:
             return "I'm having trouble connecting to Notion. Please check the configuration."
         
         try:
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
-            
-            async with httpx.AsyncClient() as client:
-                # Build query (database_id goes in URL, not body)
-                query_data = {
-                    "sorts": [
-                        {
-                            "property": "Date",
-                            "direction": "descending"
-                        }
-                    ]
-                }
-                
-                # Add status filter if provided (case-insensitive)
-                if status:
-                    # Try to match the status case-insensitively
-                    status_lower = status.lower()
-                    query_data["filter"] = {
-                        "property": "Status",
-                        "select": {
-                            "equals": status_lower if status_lower in ["todo", "in progress", "done"] else status
-                        }
-                    }
-                
-                response = await client.post(
-                    f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query",
-                    headers=headers,
-                    json=query_data,
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    results = response.json().get("results", [])
-                    
-                    if not results:
-                        if status:
-                            return f"You don't have any tasks with status '{status}' in your Notion database."
-                        else:
-                            return "Your Notion database is empty. Would you like to add some tasks?"
-                    
-                    # Format tasks for response
-                    tasks = []
-                    for page in results:
-                        props = page.get("properties", {})
-                        
-                        # Get task name
-                        name_prop = props.get("Name", {})
-                        title = name_prop.get("title", [])
-                        task_name = title[0].get("text", {}).get("content", "Untitled") if title else "Untitled"
-                        
-                        # Get status
-                        status_prop = props.get("Status", {})
-                        task_status = status_prop.get("select", {}).get("name", "Unknown") if status_prop.get("select") else "Unknown"
-                        
-                        # Get energy if available
-                        energy_prop = props.get("Energy", {})
-                        energy = energy_prop.get("number") if energy_prop else None
-                        
-                        # Get mood if available
-                        mood_prop = props.get("Mood", {})
-                        mood = mood_prop.get("select", {}).get("name") if mood_prop.get("select") else None
-                        
-                        task_info = f"• {task_name} [{task_status}]"
-                        if energy:
-                            task_info += f" (Energy: {energy}/10)"
-                        if mood:
-                            task_info += f" (Mood: {mood})"
-                        
-                        tasks.append(task_info)
-                    
-                    # Build response
-                    if status:
-                        response_text = f"Here are your {status} tasks:\n\n" + "\n".join(tasks[:10])
-                    else:
-                        response_text = f"Here are your tasks:\n\n" + "\n".join(tasks[:10])
-                    
-                    if len(results) > 10:
-                        response_text += f"\n\n...and {len(results) - 10} more tasks."
-                    
-                    return response_text
-                else:
-                    logger.error(f"Failed to fetch tasks: {response.status_code} - {response.text}")
-                    return "I had trouble fetching your tasks from Notion. Please make sure the database is shared with the integration."
-                    
+            if self._notion_tasks.has_synced:
+                # Answer from the mirror now and refresh it for next time; newest first,
+                # status matched case-insensitively, only the listed rows get formatted
+                self._notion_tasks.sync_in_background()
+                results = self._notion_tasks.tasks(status)
+                listed = results[:MAX_LISTED_TASKS]
+                more: Optional[int] = len(results) - len(listed)
+            else:
+                # Mirror not filled yet: fetch just one row past what we read out, and fill it meanwhile
+                self._notion_tasks.sync_in_background()
+                listed = [task async for task in self._notion_tasks.stream_tasks(status, limit=MAX_LISTED_TASKS + 1)]
+                more = None if len(listed) > MAX_LISTED_TASKS else 0
+                listed = listed[:MAX_LISTED_TASKS]
+                if more is None:
+                    # Saying how many more needs every row: wait for the mirror (joins the sync started above)
+                    try:
+                        await self._notion_tasks.sync()
+                        results = self._notion_tasks.tasks(status)
+                        listed = results[:MAX_LISTED_TASKS]
+                        more = len(results) - len(listed)
+                    except NotionAPIError as e:
+                        logger.warning(f"Could not count the remaining tasks: {e}")
+        except NotionAPIError as e:
+            logger.error(f"Failed to fetch tasks: {e}")
+            return "I had trouble fetching your tasks from Notion. Please make sure the database is shared with the integration."
         except Exception as e:
             logger.error(f"Error fetching tasks: {e}")
             return "I encountered an error while fetching tasks from Notion."
+        
+        if not listed:
+            if status:
+                return f"You don't have any tasks with status '{status}' in your Notion database."
+            else:
+                return "Your Notion database is empty. Would you like to add some tasks?"
+        
+        # Build response
+        tasks = "\n".join(task.describe() for task in listed)
+        if status:
+            response_text = f"Here are your {status} tasks:\n\n" + tasks
+        else:
+            response_text = f"Here are your tasks:\n\n" + tasks
+        
+        if more is None:
+            response_text += "\n\n...and more tasks."
+        elif more > 0:
+            response_text += f"\n\n...and {more} more tasks."
+        
+        return response_text
 
 
 def prewarm(proc: JobProcess):
-    """Prewarm models for faster startup."""
+    """Prewarm models, the shared Notion client and the task mirror for faster startup."""
     proc.userdata["vad"] = silero.VAD.load()
+    notion = get_notion_client()
+    proc.userdata["notion"] = notion
+    if notion and NOTION_DATABASE_ID:
+        proc.userdata["notion_tasks"] = NotionTaskMirror(notion, NOTION_DATABASE_ID, NOTION_TODO_PAGE_ID)
 
 
 async def entrypoint(ctx: JobContext):
@@ -597,10 +487,28 @@ async def entrypoint(ctx: JobContext):
     
     logger.info("🌱 Starting Wellness Companion Agent")
     
+    # Open a pooled Notion connection and fill the task mirror while the user joins
+    notion = ctx.proc.userdata.get("notion")
+    notion_tasks = ctx.proc.userdata.get("notion_tasks")
+    notion_warmup = None
+    if notion_tasks:
+        notion_warmup = asyncio.create_task(notion_tasks.sync())
+    elif notion:
+        notion_warmup = asyncio.create_task(notion.warm())
+    
+    # Join the room and wait for the user, whose identity selects their history
+    await ctx.connect()
+    participant = await ctx.wait_for_participant()
+    storage = await wellness_partitions.acquire_async(participant.identity)
+    
+    async def release_storage():
+        wellness_partitions.release(participant.identity)
+    
+    ctx.add_shutdown_callback(release_storage)
+    
     # Log session stats
-    session_count = wellness_storage.get_session_count()
-    streak = wellness_storage.get_streak()
-    logger.info(f"📊 Total sessions: {session_count} | Current streak: {streak} days")
+    history = storage.get_context(recent_limit=3)
+    logger.info(f"📊 Total sessions: {history['session_count']} | Current streak: {history['streak']} days")
     
     # Set up voice AI pipeline
     session = AgentSession(
@@ -642,15 +550,20 @@ async def entrypoint(ctx: JobContext):
     
     # Start the session
     await session.start(
-        agent=WellnessCompanion(session),
+        agent=WellnessCompanion(session, storage, notion_tasks),
         room=ctx.room,
         room_input_options=RoomInputOptions(
+            # Listen to the participant whose partition this session writes to
+            participant_identity=participant.identity,
             noise_cancellation=noise_cancellation.BVC(),
         ),
     )
     
-    # Join the room
-    await ctx.connect()
+    if notion_warmup:
+        try:
+            await notion_warmup
+        except Exception as e:
+            logger.warning(f"Could not sync Notion tasks ahead of time: {e}")
     
     logger.info("✅ Wellness Companion connected and ready")
 
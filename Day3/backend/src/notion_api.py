@@ -0,0 +1,265 @@
+"""
+Shared Notion API client.
+One pooled HTTP client per process, reused by every Notion tool call, with
+retries on rate limits and transient failures that can't duplicate a write.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import random
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("notion-client")
+
+DEFAULT_NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+DEFAULT_MAX_CONNECTIONS = 10
+# Notion allows an average of three requests per second per integration
+DEFAULT_MAX_CONCURRENCY = 3
+KEEPALIVE_EXPIRY = 60.0
+
+# Largest page_size Notion accepts on paginated endpoints
+MAX_PAGE_SIZE = 100
+
+# Rate limited, or Notion briefly unavailable
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Rejected before Notion did anything, so safe to resend even a write
+REJECTED_STATUSES = frozenset({429})
+
+# Methods that can be repeated without changing the outcome
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Failed before the request was sent
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class NotionAPIError(RuntimeError):
+    """Notion answered with an error status."""
+
+    def __init__(self, response: httpx.Response):
+        self.status_code = response.status_code
+        super().__init__(f"Notion returned {response.status_code}: {response.text}")
+
+
+class NotionClient:
+    """
+    Pooled, retrying client for the Notion REST API.
+
+    The underlying httpx.AsyncClient is created on first use and kept for the
+    life of the process, so voice turns after the first reuse warm keep-alive
+    connections (multiplexed over HTTP/2 when h2 is installed) instead of
+    paying TCP and TLS setup on every tool call. At most ``max_concurrency``
+    requests are in flight at once, so fanned-out writes stay near Notion's
+    rate limit instead of tripping it. Retries use full-jitter exponential
+    backoff, up to ``max_retries`` times, honouring Retry-After when Notion
+    sends it. Idempotent requests are retried on 429, a 5xx or any transport
+    error. Other writes (creating a page, appending blocks) may already have
+    been applied when a response is lost or a 5xx comes back, so they are only
+    retried on 429 or when the connection failed before the request was sent.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            api_key: Notion integration secret
+            base_url: API root, defaulting to $NOTION_API_URL or the public API; point it
+                at a local stand-in server for tests and benchmarks
+            transport: Custom httpx transport (e.g. httpx.MockTransport in tests)
+        """
+        self.base_url = (base_url or os.getenv("NOTION_API_URL", DEFAULT_NOTION_API_URL)).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Notion-Version": NOTION_VERSION,
+        }
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled httpx client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers,
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE and self._transport is None,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    def _slots(self) -> asyncio.Semaphore:
+        """Semaphore limiting requests in flight; backoff sleeps happen outside it."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        Send a request to the Notion API, retrying rate limits and transient failures.
+
+        Args:
+            method: HTTP method
+            path: Path below the API root, e.g. "/pages" or f"/blocks/{block_id}/children"
+            idempotent: Whether repeating the request is harmless, e.g. a POST
+                database query or a PATCH setting a property; defaults to
+                True for GET, PUT and DELETE and False otherwise
+
+        Returns:
+            The final response; after the last retry this may still be a 429 or 5xx
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else REJECTED_STATUSES
+        attempt = 0
+        while True:
+            response: Optional[httpx.Response] = None
+            try:
+                async with self._slots():
+                    response = await self.client.request(method, path, json=json, params=params)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries or not (idempotent or isinstance(e, NOT_SENT_ERRORS)):
+                    raise
+                logger.warning(f"Notion {method} {path} failed ({e!r}), retrying")
+            else:
+                if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                    return response
+                logger.warning(f"Notion {method} {path} returned {response.status_code}, retrying")
+
+            await asyncio.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    async def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", path, **kwargs)
+
+    async def paginate(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the results of a paginated endpoint, fetching pages only as they are consumed.
+
+        The cursor goes in the body for POST (database queries) and in the query
+        string for GET (block children). With `limit`, page sizes shrink to what
+        is still needed and no page is requested past the limit.
+
+        Raises:
+            NotionAPIError: If Notion answers a page request with an error
+        """
+        body = dict(json or {}) if method != "GET" else None
+        query = dict(params or {})
+        cursor_holder = query if body is None else body
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            cursor_holder["page_size"] = MAX_PAGE_SIZE if remaining is None else min(MAX_PAGE_SIZE, remaining)
+            # Paginated endpoints only read, whatever the method
+            response = await self.request(method, path, json=body, params=query or None, idempotent=True)
+            if response.status_code != 200:
+                raise NotionAPIError(response)
+
+            data = response.json()
+            for result in data.get("results", []):
+                yield result
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+
+            if not data.get("has_more") or not data.get("next_cursor"):
+                return
+            cursor_holder["start_cursor"] = data["next_cursor"]
+
+    async def warm(self) -> None:
+        """Open a pooled connection ahead of the first tool call. Failures are only logged."""
+        try:
+            await self.client.get("/users/me")
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not pre-connect to Notion: {e!r}")
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._semaphore = None
+
+
+_shared_client: Optional[NotionClient] = None
+
+
+def get_notion_client() -> Optional[NotionClient]:
+    """
+    The process-wide Notion client, or None when NOTION_API_KEY is not configured.
+    """
+    global _shared_client
+    if _shared_client is None:
+        api_key = os.getenv("NOTION_API_KEY")
+        if not api_key:
+            return None
+        _shared_client = NotionClient(api_key)
+        logger.info(f"Notion client ready for {_shared_client.base_url} (HTTP/2: {HTTP2_AVAILABLE})")
+    return _shared_client
@@ -0,0 +1,327 @@
+"""
+Local mirror of the Notion task database and To Do List page.
+Task questions are answered from memory; Notion is only asked for what changed.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from notion_api import NotionClient
+
+logger = logging.getLogger("notion-tasks")
+
+# Answer from the mirror without asking Notion if it synced this recently
+DEFAULT_MAX_AGE = 30.0
+# Re-read everything this often, to drop pages deleted or archived in Notion
+DEFAULT_FULL_SYNC_INTERVAL = 600.0
+
+DONE_STATUSES = frozenset({"done", "completed"})
+# Status names as stored in the database; anything else is passed through as spoken
+KNOWN_STATUSES = frozenset({"todo", "in progress", "done"})
+
+
+def _plain_text(rich_text: List[Dict[str, Any]]) -> str:
+    return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in rich_text)
+
+
+class NotionTask:
+    """One page of the task database, reduced to what the agent reports."""
+
+    __slots__ = ("date", "energy", "last_edited_time", "mood", "name", "page_id", "status")
+
+    def __init__(self, page: Dict[str, Any]):
+        props = page.get("properties", {})
+        status = (props.get("Status") or {}).get("select") or {}
+        mood = (props.get("Mood") or {}).get("select") or {}
+        date = (props.get("Date") or {}).get("date") or {}
+        self.page_id: str = page["id"]
+        self.name: str = _plain_text((props.get("Name") or {}).get("title", [])) or "Untitled"
+        self.status: str = status.get("name", "Unknown")
+        self.date: str = date.get("start") or ""
+        self.energy: Optional[float] = (props.get("Energy") or {}).get("number")
+        self.mood: Optional[str] = mood.get("name")
+        self.last_edited_time: str = page.get("last_edited_time", "")
+
+    @property
+    def is_done(self) -> bool:
+        return self.status.lower() in DONE_STATUSES
+
+    def describe(self) -> str:
+        """One line for the agent: "• Go to the gym [todo] (Energy: 6/10) (Mood: Tired)"."""
+        line = f"• {self.name} [{self.status}]"
+        if self.energy:
+            line += f" (Energy: {self.energy}/10)"
+        if self.mood:
+            line += f" (Mood: {self.mood})"
+        return line
+
+
+class TodoItem:
+    """One to_do block on the To Do List page."""
+
+    __slots__ = ("block_id", "checked", "text")
+
+    def __init__(self, block: Dict[str, Any]):
+        to_do = block.get("to_do", {})
+        self.block_id: str = block["id"]
+        self.text: str = _plain_text(to_do.get("rich_text", []))
+        self.checked: bool = bool(to_do.get("checked"))
+
+
+class NotionTaskMirror:
+    """
+    In-memory copy of the task database and the To Do List page.
+
+    Tasks are indexed by page id and to-do items by block id. sync() asks the
+    database only for pages edited since the newest last_edited_time already
+    mirrored, and is skipped entirely while the mirror is younger than
+    ``max_age`` seconds. The To Do List page has no such filter, so it is
+    re-listed only on a full sync (every ``full_sync_interval`` seconds) or
+    the sync after a to-do write. Once the mirror has synced, callers answer
+    from it and refresh it with sync_in_background().
+
+    Writes made through the mirror update Notion first and then the local
+    copy, so the agent's own changes are visible at once. A sync merges into
+    the live copy and never overwrites or drops what was written while it ran.
+    """
+
+    def __init__(
+        self,
+        notion: NotionClient,
+        database_id: str,
+        todo_page_id: Optional[str] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        full_sync_interval: float = DEFAULT_FULL_SYNC_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.notion = notion
+        self.database_id = database_id
+        self.todo_page_id = todo_page_id
+        self.max_age = max_age
+        self.full_sync_interval = full_sync_interval
+        self._clock = clock
+
+        self._tasks: Dict[str, NotionTask] = {}
+        # Block ids in page order, plus the items themselves
+        self._todo_order: List[str] = []
+        self._todos: Dict[str, TodoItem] = {}
+        # Set by to-do writes; the next sync re-lists the To Do List page
+        self._todos_stale = False
+        # Page and block ids written through the mirror since the current sync started
+        self._written_pages: Set[str] = set()
+        self._written_blocks: Set[str] = set()
+        self._watermark: Optional[str] = None
+        self._synced_at: Optional[float] = None
+        self._full_synced_at: Optional[float] = None
+        # Created on first sync, inside the event loop that uses it
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._background_sync: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._synced_at is not None and self._clock() - self._synced_at < self.max_age
+
+    @property
+    def has_synced(self) -> bool:
+        return self._synced_at is not None
+
+    async def sync(self, force: bool = False) -> None:
+        """
+        Bring the mirror up to date with Notion.
+
+        Raises:
+            NotionAPIError: If Notion answers a query with an error
+        """
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        async with self._sync_lock:
+            if self.is_fresh and not force:
+                return
+
+            now = self._clock()
+            full = self._full_synced_at is None or now - self._full_synced_at >= self.full_sync_interval
+            self._written_pages.clear()
+            self._written_blocks.clear()
+            await self._fetch_tasks(None if full else self._watermark, full)
+            if full:
+                self._full_synced_at = now
+            self._watermark = max((t.last_edited_time for t in self._tasks.values()), default=None)
+
+            if self.todo_page_id and (full or self._todos_stale):
+                self._todos_stale = False
+                await self._fetch_todos()
+
+            self._synced_at = now
+            logger.info(
+                f"🔄 Synced Notion mirror ({'full' if full else 'incremental'}): "
+                f"{len(self._tasks)} tasks, {len(self._todos)} to-do items"
+            )
+
+    async def _fetch_tasks(self, edited_since: Optional[str], full: bool) -> None:
+        query: Dict[str, Any] = {"sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]}
+        if edited_since:
+            # last_edited_time is only minute-precise, so re-read the boundary minute
+            query["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": edited_since}}
+
+        pages = [page async for page in self.notion.paginate("POST", f"/databases/{self.database_id}/query", json=query)]
+        # Pages written through the mirror meanwhile are newer than what the query saw
+        for page in pages:
+            if page["id"] not in self._written_pages:
+                self._record_page(page)
+        if full:
+            seen = {page["id"] for page in pages} | self._written_pages
+            for page_id in [page_id for page_id in self._tasks if page_id not in seen]:
+                del self._tasks[page_id]
+
+    async def _fetch_todos(self) -> None:
+        blocks = [block async for block in self.notion.paginate("GET", f"/blocks/{self.todo_page_id}/children")]
+        order: List[str] = []
+        for block in blocks:
+            if block.get("type") != "to_do":
+                continue
+            block_id = block["id"]
+            order.append(block_id)
+            if block_id not in self._written_blocks:
+                self._todos[block_id] = TodoItem(block)
+        # Keep items appended while the page was being listed, after the rest
+        listed = set(order)
+        order += [block_id for block_id in self._todo_order if block_id in self._written_blocks and block_id not in listed]
+        for block_id in [block_id for block_id in self._todos if block_id not in listed and block_id not in self._written_blocks]:
+            del self._todos[block_id]
+        self._todo_order = order
+
+    async def stream_tasks(self, status: Optional[str] = None, limit: Optional[int] = None) -> AsyncIterator[NotionTask]:
+        """
+        Query Notion directly for tasks, newest Date first, stopping after `limit`.
+
+        For answering before the mirror has ever synced; pages are requested
+        only as the caller consumes them.
+        """
+        query: Dict[str, Any] = {"sorts": [{"property": "Date", "direction": "descending"}]}
+        if status:
+            status_lower = status.lower()
+            query["filter"] = {
+                "property": "Status",
+                "select": {"equals": status_lower if status_lower in KNOWN_STATUSES else status},
+            }
+        async for page in self.notion.paginate("POST", f"/databases/{self.database_id}/query", json=query, limit=limit):
+            yield NotionTask(page)
+
+    def sync_in_background(self) -> None:
+        """Start a sync without waiting for it; a failure is only logged."""
+        if self._background_sync is not None and not self._background_sync.done():
+            return
+        self._background_sync = asyncio.create_task(self.sync())
+        self._background_sync.add_done_callback(self._log_background_failure)
+
+    @staticmethod
+    def _log_background_failure(task: "asyncio.Task[None]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background Notion sync failed: {task.exception()}")
+
+    def _record_page(self, page: Dict[str, Any]) -> None:
+        """Mirror one page; archived or trashed pages are dropped."""
+        if page.get("archived") or page.get("in_trash"):
+            self._tasks.pop(page["id"], None)
+        else:
+            self._tasks[page["id"]] = NotionTask(page)
+
+    def upsert_page(self, page: Dict[str, Any]) -> None:
+        """Record a page returned by a write to Notion."""
+        self._written_pages.add(page["id"])
+        self._record_page(page)
+
+    def upsert_blocks(self, blocks: List[Dict[str, Any]]) -> None:
+        """Record to_do blocks returned by a write to Notion (e.g. from an append)."""
+        for block in blocks:
+            if block.get("type") != "to_do":
+                continue
+            item = TodoItem(block)
+            if item.block_id not in self._todos:
+                self._todo_order.append(item.block_id)
+            self._todos[item.block_id] = item
+            self._written_blocks.add(item.block_id)
+        # Confirm the page's order against Notion on the next sync
+        self._todos_stale = True
+
+    def tasks(self, status: Optional[str] = None) -> List[NotionTask]:
+        """Mirrored tasks, newest Date first, optionally only those with a status (any case)."""
+        tasks = self._tasks.values()
+        if status:
+            wanted = status.lower()
+            tasks = [t for t in tasks if t.status.lower() == wanted]
+        return sorted(tasks, key=lambda t: t.date, reverse=True)
+
+    def find_pending(self, name: str) -> Optional[NotionTask]:
+        """The newest task not yet done whose name contains `name` (any case)."""
+        needle = name.lower()
+        for task in self.tasks():
+            if not task.is_done and needle in task.name.lower():
+                return task
+        return None
+
+    def find_todo(self, name: str) -> Optional[TodoItem]:
+        """The first to-do item containing `name`, preferring unchecked ones."""
+        needle = name.lower()
+        matches = [self._todos[b] for b in self._todo_order if needle in self._todos[b].text.lower()]
+        for item in matches:
+            if not item.checked:
+                return item
+        return matches[0] if matches else None
+
+    async def create_page(self, properties: Dict[str, Any]) -> Optional[NotionTask]:
+        """Create a task page in the database; returns None if Notion refuses it."""
+        response = await self.notion.post("/pages", json={"parent": {"database_id": self.database_id}, "properties": properties})
+        if response.status_code != 200:
+            logger.error(f"Failed to create Notion task: {response.status_code} - {response.text}")
+            return None
+        page = response.json()
+        self.upsert_page(page)
+        return self._tasks.get(page["id"])
+
+    async def append_todos(self, texts: List[str]) -> bool:
+        """Append unchecked to-do items to the To Do List page in one request."""
+        if not self.todo_page_id or not texts:
+            return False
+        children = [
+            {
+                "object": "block",
+                "type": "to_do",
+                "to_do": {
+                    "rich_text": [{"type": "text", "text": {"content": text}}],
+                    "checked": False,
+                    "color": "default",
+                },
+            }
+            for text in texts
+        ]
+        response = await self.notion.patch(f"/blocks/{self.todo_page_id}/children", json={"children": children})
+        if response.status_code != 200:
+            logger.error(f"Failed to add to To Do List: {response.status_code} - {response.text}")
+            return False
+        self.upsert_blocks(response.json().get("results", []))
+        return True
+
+    async def set_status(self, task: NotionTask, status: str) -> bool:
+        """Change a task's Status in Notion and in the mirror."""
+        response = await self.notion.patch(
+            f"/pages/{task.page_id}", json={"properties": {"Status": {"select": {"name": status}}}}, idempotent=True
+        )
+        if response.status_code != 200:
+            logger.error(f"Failed to update task: {response.status_code} - {response.text}")
+            return False
+        self.upsert_page(response.json())
+        return True
+
+    async def check_todo(self, item: TodoItem) -> bool:
+        """Tick a to-do item in Notion and in the mirror."""
+        response = await self.notion.patch(
+            f"/blocks/{item.block_id}", json={"to_do": {"checked": True}}, idempotent=True
+        )
+        if response.status_code != 200:
+            logger.error(f"Failed to check off to-do item: {response.status_code} - {response.text}")
+            return False
+        self.upsert_blocks([response.json()])
+        return True
@@ -0,0 +1,241 @@
+"""
+Storage engines for wellness check-in sessions.
+Each engine appends a session in O(1) and keeps an index by timestamp.
+"""
+
+import bisect
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger("wellness-storage")
+
+JSONL_LOG_FILE = "wellness_log.jsonl"
+SQLITE_LOG_FILE = "wellness_log.db"
+
+
+class StorageEngine(ABC):
+    """Interface every wellness storage engine implements."""
+
+    name = "base"
+
+    @abstractmethod
+    def append(self, session: Dict[str, Any]) -> None:
+        """Persist one session."""
+
+    @abstractmethod
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """The last `limit` sessions in the order they were saved, oldest first."""
+
+    @abstractmethod
+    def all(self) -> List[Dict[str, Any]]:
+        """Every session in the order they were saved."""
+
+    @abstractmethod
+    def between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """Sessions with start <= timestamp <= end (ISO 8601 strings), by timestamp."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored sessions."""
+
+    def close(self) -> None:  # noqa: B027 - optional; not every engine holds resources
+        """Release open files or connections."""
+
+
+class JsonlEngine(StorageEngine):
+    """
+    One JSON object per line in wellness_log.jsonl.
+
+    Appends write a single line. The byte offset of every line is kept in
+    memory, in save order and sorted by timestamp, so recent and range reads
+    seek straight to the lines they need.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, data_dir: Path):
+        self.path = Path(data_dir) / JSONL_LOG_FILE
+        self._lock = threading.Lock()
+        self._offsets: List[int] = []
+        self._by_time: List[Tuple[str, int]] = []
+        self._size = 0
+        self._scan()
+
+    def _scan(self) -> None:
+        if not self.path.exists():
+            self.path.touch()
+            return
+
+        with open(self.path, "rb+") as f:
+            offset = 0
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Dropping incomplete session at end of {self.path.name}")
+                    f.truncate(offset)
+                    break
+                try:
+                    timestamp = json.loads(line)["timestamp"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.error(f"Skipping unreadable session in {self.path.name} at byte {offset}")
+                else:
+                    self._offsets.append(offset)
+                    self._by_time.append((timestamp, offset))
+                offset += len(line)
+            self._size = offset
+        self._by_time.sort()
+
+    def _read_at(self, offsets: List[int]) -> List[Dict[str, Any]]:
+        if not offsets:
+            return []
+        sessions = []
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                sessions.append(json.loads(f.readline()))
+        return sessions
+
+    def append(self, session: Dict[str, Any]) -> None:
+        line = (json.dumps(session) + "\n").encode("utf-8")
+        with self._lock:
+            with open(self.path, "ab") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            offset = self._size
+            self._size += len(line)
+            self._offsets.append(offset)
+            entry = (session["timestamp"], offset)
+            if not self._by_time or entry >= self._by_time[-1]:
+                self._by_time.append(entry)
+            else:
+                bisect.insort(self._by_time, entry)
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            offsets = self._offsets[-limit:] if limit > 0 else []
+        return self._read_at(offsets)
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            if not self._offsets:
+                return []
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            lo = bisect.bisect_left(self._by_time, (start,))
+            hi = bisect.bisect_right(self._by_time, (end, float("inf")))
+            offsets = [offset for _, offset in self._by_time[lo:hi]]
+        return self._read_at(offsets)
+
+    def count(self) -> int:
+        return len(self._offsets)
+
+
+class SqliteEngine(StorageEngine):
+    """Sessions as JSON documents in a SQLite table indexed by timestamp."""
+
+    name = "sqlite"
+
+    def __init__(self, data_dir: Path):
+        self.path = Path(data_dir) / SQLITE_LOG_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT,
+                timestamp TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp)")
+        self._conn.commit()
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def append(self, session: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, timestamp, data) VALUES (?, ?, ?)",
+                (session.get("session_id"), session["timestamp"], json.dumps(session)),
+            )
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        sessions = self._query("SELECT data FROM sessions ORDER BY id DESC LIMIT ?", (limit,))
+        sessions.reverse()
+        return sessions
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT data FROM sessions ORDER BY id")
+
+    def between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT data FROM sessions WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, id",
+            (start, end),
+        )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+ENGINES = {
+    JsonlEngine.name: JsonlEngine,
+    SqliteEngine.name: SqliteEngine,
+}
+
+
+def open_engine(name: str, data_dir: Path) -> StorageEngine:
+    """Open the storage engine called `name` ("jsonl" or "sqlite") in data_dir."""
+    try:
+        engine_cls = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown wellness storage engine: {name!r} (choose from {', '.join(ENGINES)})") from None
+    return engine_cls(Path(data_dir))
+
+
+def import_legacy_log(engine: StorageEngine, legacy_file: Path) -> int:
+    """
+    Copy sessions from a legacy wellness_log.json into an engine.
+
+    Sessions already present (same session_id and timestamp) are skipped, so
+    running the import twice is harmless.
+
+    Returns:
+        Number of sessions imported
+    """
+    legacy_file = Path(legacy_file)
+    if not legacy_file.exists():
+        return 0
+
+    with open(legacy_file) as f:
+        sessions = json.load(f).get("sessions", [])
+
+    existing = {(s.get("session_id"), s.get("timestamp")) for s in engine.all()} if engine.count() else set()
+    imported = 0
+    for session in sessions:
+        key = (session.get("session_id"), session.get("timestamp"))
+        if key in existing or "timestamp" not in session:
+            continue
+        engine.append(session)
+        existing.add(key)
+        imported += 1
+
+    logger.info(f"Imported {imported} session(s) from {legacy_file} into {engine.name} storage")
+    return imported
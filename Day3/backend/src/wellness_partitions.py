@@ -0,0 +1,122 @@
+"""
+Per-user partitions of wellness storage.
+Gives every participant their own WellnessStorage, laid out in hashed shard
+directories, with a bounded cache of open partitions.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from wellness_storage import WellnessStorage
+
+logger = logging.getLogger("wellness-storage")
+
+DEFAULT_MAX_OPEN = 128
+
+
+def partition_key(identity: str) -> str:
+    """Stable, filesystem-safe key for a participant identity."""
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+class PartitionedWellnessStorage:
+    """
+    One WellnessStorage per user under ``data_dir/<shard>/<key>/``.
+
+    ``key`` is the SHA-1 of the participant identity and ``shard`` its first two
+    hex digits, so no directory holds more than a few hundred entries. A user's
+    reads and writes only ever touch their own partition.
+
+    Open partitions are cached, least recently used first. acquire() pins a
+    partition while a session uses it; only unpinned partitions are closed when
+    the cache grows past ``max_open``. acquire() opens files, so async callers
+    use acquire_async(), which runs it on a worker thread.
+
+    The shared wellness_log.json written before storage was partitioned is
+    never imported automatically; migrate_wellness_log.py --user moves it into
+    the partition of the person it belongs to.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "wellness_data",
+        max_open: int = DEFAULT_MAX_OPEN,
+        engine: Optional[str] = None,
+    ):
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1")
+        self.data_dir = Path(data_dir)
+        self.max_open = max_open
+        self.engine = engine
+        self._lock = threading.Lock()
+        # key -> open storage; least recently used first
+        self._open: "OrderedDict[str, WellnessStorage]" = OrderedDict()
+        self._pins: Dict[str, int] = {}
+
+    def path_for(self, identity: str) -> Path:
+        """Directory holding a user's partition."""
+        key = partition_key(identity)
+        return self.data_dir / key[:2] / key
+
+    def acquire(self, identity: str) -> WellnessStorage:
+        """Open (or reuse) a user's partition and pin it until release()."""
+        key = partition_key(identity)
+        with self._lock:
+            storage = self._open.get(key)
+            if storage is None:
+                path = self.path_for(identity)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                storage = WellnessStorage(path, engine=self.engine)
+                self._open[key] = storage
+                logger.info(f"Opened wellness partition {key[:8]} ({len(self._open)} open)")
+            else:
+                self._open.move_to_end(key)
+            self._pins[key] = self._pins.get(key, 0) + 1
+            self._evict()
+        return storage
+
+    async def acquire_async(self, identity: str) -> WellnessStorage:
+        """acquire() on a worker thread, keeping file access off the event loop."""
+        return await asyncio.to_thread(self.acquire, identity)
+
+    def release(self, identity: str) -> None:
+        """Unpin a partition acquired for a session that has ended."""
+        key = partition_key(identity)
+        with self._lock:
+            pins = self._pins.get(key, 0) - 1
+            if pins > 0:
+                self._pins[key] = pins
+            else:
+                self._pins.pop(key, None)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Close least recently used unpinned partitions beyond max_open. Caller holds the lock."""
+        excess = len(self._open) - self.max_open
+        if excess <= 0:
+            return
+        victims: List[str] = []
+        for key in self._open:
+            if len(victims) == excess:
+                break
+            if key not in self._pins:
+                victims.append(key)
+        for key in victims:
+            self._open.pop(key).close()
+
+    def close(self) -> None:
+        """Close every open partition."""
+        with self._lock:
+            for storage in self._open.values():
+                storage.close()
+            self._open.clear()
+            self._pins.clear()
+
+    def __len__(self) -> int:
+        """Number of open partitions."""
+        return len(self._open)
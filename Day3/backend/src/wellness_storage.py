@@ -1,71 +1,129 @@
 """
 Wellness data storage utility.
-Handles reading and writing wellness check-in sessions to JSON.
+Handles reading and writing wellness check-in sessions through a pluggable
+storage engine (append-only JSONL or SQLite, see wellness_engines.py).
 """
 
 import json
 import os
-from datetime import datetime
+import threading
+from datetime import date, datetime
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 import logging
 
+from wellness_engines import ENGINES, import_legacy_log, open_engine
+from wellness_streak import STREAK_FILE, StreakState, load_streak, save_streak, session_date
+
 logger = logging.getLogger("wellness-storage")
 
+# Legacy single-document log; imported into the engine on first use
 WELLNESS_LOG_FILE = "wellness_log.json"
+DEFAULT_ENGINE = "jsonl"
+
+# Stats and recent sessions for the frontend, the same whichever engine is in use
+SUMMARY_FILE = "wellness_summary.json"
+SUMMARY_RECENT_SESSIONS = 5
 
 
 class WellnessStorage:
     """Manages persistent storage of wellness check-in sessions."""
     
-    def __init__(self, data_dir: str = "."):
+    def __init__(self, data_dir: str = ".", engine: Optional[str] = None):
         """
         Initialize wellness storage.
         
         Args:
-            data_dir: Directory where wellness_log.json will be stored
+            data_dir: Directory where the wellness log will be stored
+            engine: Storage engine name, one of "jsonl" or "sqlite"
+                (defaults to $WELLNESS_STORAGE_ENGINE, else "jsonl")
         """
+        engine = engine or os.getenv("WELLNESS_STORAGE_ENGINE", DEFAULT_ENGINE)
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown wellness storage engine: {engine!r}")
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.log_file = self.data_dir / WELLNESS_LOG_FILE
-        self._ensure_log_file()
+        self.streak_file = self.data_dir / STREAK_FILE
+        self.summary_file = self.data_dir / SUMMARY_FILE
+        self.engine = open_engine(engine, self.data_dir)
+        # Parsed copy of every session, loaded on first read and dropped on write
+        self._snapshot: Optional[List[Dict[str, Any]]] = None
+        self._snapshot_lock = threading.Lock()
     
-    def _ensure_log_file(self) -> None:
-        """Create wellness log file if it doesn't exist."""
-        if not self.log_file.exists():
-            initial_data = {"sessions": []}
-            with open(self.log_file, 'w') as f:
-                json.dump(initial_data, f, indent=2)
-            logger.info(f"Created new wellness log: {self.log_file}")
+        if self.engine.count() == 0 and self.log_file.exists():
+            try:
+                import_legacy_log(self.engine, self.log_file)
+            except Exception as e:
+                logger.error(f"Could not import legacy wellness log {self.log_file}: {e}")
     
-    def _read_log(self) -> Dict[str, Any]:
-        """Read the wellness log file."""
+        self._streak_lock = threading.Lock()
+        self._streak_state = self._load_streak_state()
+        if not self.summary_file.exists():
+            self._write_summary()
+
+    def import_legacy(self, legacy_file: Path) -> int:
+        """
+        Import sessions from a legacy wellness_log.json into this storage.
+
+        Returns:
+            Number of sessions imported (already stored ones are skipped)
+        """
+        imported = import_legacy_log(self.engine, legacy_file)
+        if imported:
+            self._invalidate()
+            with self._streak_lock:
+                self._streak_state = self.recompute_streak()
+                save_streak(self.streak_file, self._streak_state)
+            self._write_summary()
+        return imported
+
+    def _write_summary(self) -> None:
+        """Write the frontend's summary of this log atomically."""
         try:
-            with open(self.log_file, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            logger.error("Corrupted wellness log, creating backup and starting fresh")
-            # Backup corrupted file
-            backup_file = self.log_file.with_suffix('.json.backup')
-            self.log_file.rename(backup_file)
-            self._ensure_log_file()
-            return {"sessions": []}
+            recent = self.engine.recent(SUMMARY_RECENT_SESSIONS)
+            summary = {
+                "total_sessions": self.engine.count(),
+                "current_streak": self._streak_state.current,
+                "last_check_in": recent[-1]["timestamp"] if recent else None,
+                "recent_sessions": recent[::-1],
+            }
+            temp_file = self.summary_file.with_suffix(".json.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(summary, f, indent=2)
+            temp_file.replace(self.summary_file)
         except Exception as e:
-            logger.error(f"Error reading wellness log: {e}")
-            return {"sessions": []}
-    
-    def _write_log(self, data: Dict[str, Any]) -> None:
-        """Write data to wellness log file."""
+            # Only the frontend reads it; the next save rewrites it
+            logger.error(f"Error writing wellness summary: {e}")
+
+    def _load_streak_state(self) -> StreakState:
+        """Load the persisted streak, recomputing it if it does not match the log."""
+        state = load_streak(self.streak_file)
+        if state is not None and state.session_count == self.engine.count():
+            return state
+
+        logger.info("Rebuilding check-in streak from the wellness log")
+        state = self.recompute_streak()
         try:
-            # Write to temp file first, then rename (atomic operation)
-            temp_file = self.log_file.with_suffix('.json.tmp')
-            with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            temp_file.replace(self.log_file)
-            logger.info("Wellness log updated successfully")
+            save_streak(self.streak_file, state)
         except Exception as e:
-            logger.error(f"Error writing wellness log: {e}")
-            raise
+            logger.error(f"Error writing streak state: {e}")
+        return state
+    
+    def recompute_streak(self) -> StreakState:
+        """Compute the streak state from scratch by reading every session."""
+        return StreakState.from_dates(session_date(s) for s in self._sessions())
+
+    def _sessions(self) -> List[Dict[str, Any]]:
+        """All sessions, parsed once and shared until the next write."""
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                self._snapshot = self.engine.all()
+            return self._snapshot
+
+    def _invalidate(self) -> None:
+        with self._snapshot_lock:
+            self._snapshot = None
     
     def save_session(
         self,
@@ -93,8 +151,6 @@ class WellnessStorage:
             True if saved successfully, False otherwise
         """
         try:
-            data = self._read_log()
-            
             session_entry = {
                 "session_id": session_id,
                 "timestamp": datetime.now().isoformat(),
@@ -106,8 +162,13 @@ class WellnessStorage:
                 "previous_session_reference": previous_reference
             }
             
-            data["sessions"].append(session_entry)
-            self._write_log(data)
+            try:
+                self.engine.append(session_entry)
+            finally:
+                self._invalidate()
+
+            self._record_streak(session_date(session_entry))
+            self._write_summary()
             
             logger.info(f"✅ Saved wellness session: {session_id}")
             return True
@@ -115,6 +176,18 @@ class WellnessStorage:
         except Exception as e:
             logger.error(f"Failed to save session: {e}")
             return False
+
+    def _record_streak(self, day: date) -> None:
+        """Advance the streak for a check-in saved on `day` and persist it."""
+        with self._streak_lock:
+            if not self._streak_state.record(day):
+                # Saved before the last check-in (clock moved back); start over
+                self._streak_state = self.recompute_streak()
+            try:
+                save_streak(self.streak_file, self._streak_state)
+            except Exception as e:
+                # The log is the source of truth; a stale file is rebuilt on next start
+                logger.error(f"Error writing streak state: {e}")
     
     def get_recent_sessions(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -127,9 +200,9 @@ class WellnessStorage:
             List of recent session dictionaries
         """
         try:
-            data = self._read_log()
-            sessions = data.get("sessions", [])
-            return sessions[-limit:] if sessions else []
+            if self._snapshot is not None:
+                return self._sessions()[-limit:] if limit > 0 else []
+            return self.engine.recent(limit)
         except Exception as e:
             logger.error(f"Error getting recent sessions: {e}")
             return []
@@ -152,51 +225,77 @@ class WellnessStorage:
             List of all session dictionaries
         """
         try:
-            data = self._read_log()
-            return data.get("sessions", [])
+            return list(self._sessions())
         except Exception as e:
             logger.error(f"Error getting all sessions: {e}")
             return []
     
+    def get_sessions_between(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        Get sessions whose timestamp falls within [start, end], using the timestamp index.
+
+        Returns:
+            List of session dictionaries ordered by timestamp
+        """
+        try:
+            return self.engine.between(start.isoformat(), end.isoformat())
+        except Exception as e:
+            logger.error(f"Error getting sessions between {start} and {end}: {e}")
+            return []
+
     def get_session_count(self) -> int:
         """Get total number of wellness sessions."""
-        return len(self.get_all_sessions())
+        try:
+            if self._snapshot is not None:
+                return len(self._snapshot)
+            return self.engine.count()
+        except Exception as e:
+            logger.error(f"Error counting sessions: {e}")
+            return 0
     
     def get_streak(self) -> int:
         """
-        Calculate current check-in streak (consecutive days).
+        Get current check-in streak (consecutive days up to the last check-in).
         
         Returns:
             Number of consecutive days with check-ins
         """
+        return self._streak_state.current
+
+    def get_streak_info(self) -> Dict[str, Any]:
+        """
+        Get current streak, longest streak and the date of the last check-in.
+
+        Returns:
+            Dict with current, longest and last_date (ISO date or None)
+        """
+        state = self._streak_state
+        return {
+            "current": state.current,
+            "longest": state.longest,
+            "last_date": state.last_date.isoformat() if state.last_date else None,
+        }
+
+    def get_context(self, recent_limit: int = 3) -> Dict[str, Any]:
+        """
+        Everything a new check-in needs to greet the user, from a single read of the log.
+
+        Returns:
+            Dict with last_session, recent_sessions, session_count and streak
+        """
         try:
-            sessions = self.get_all_sessions()
-            if not sessions:
-                return 0
-            
-            # Get unique dates (ignoring time)
-            dates = []
-            for session in sessions:
-                timestamp = datetime.fromisoformat(session["timestamp"])
-                dates.append(timestamp.date())
-            
-            # Remove duplicates and sort
-            unique_dates = sorted(set(dates), reverse=True)
-            
-            if not unique_dates:
-                return 0
-            
-            # Count consecutive days
-            streak = 1
-            for i in range(len(unique_dates) - 1):
-                diff = (unique_dates[i] - unique_dates[i + 1]).days
-                if diff == 1:
-                    streak += 1
-                else:
-                    break
+            sessions = self._sessions()
+        except Exception as e:
+            logger.error(f"Error loading wellness context: {e}")
+            sessions = []
             
-            return streak
+        return {
+            "last_session": sessions[-1] if sessions else None,
+            "recent_sessions": sessions[-recent_limit:] if sessions and recent_limit > 0 else [],
+            "session_count": len(sessions),
+            "streak": self.get_streak(),
+        }
             
-        except Exception as e:
-            logger.error(f"Error calculating streak: {e}")
-            return 0
+    def close(self) -> None:
+        """Release the storage engine's files or connections."""
+        self.engine.close()
@@ -0,0 +1,117 @@
+"""
+Check-in streak tracking.
+Keeps the current streak, longest streak and last check-in date up to date as
+sessions are saved, persisted next to the wellness log.
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger("wellness-storage")
+
+STREAK_FILE = "wellness_streak.json"
+
+
+class StreakState:
+    """
+    Streak counters for one wellness log.
+
+    ``current`` counts consecutive days ending at ``last_date`` (the most recent
+    check-in), ``longest`` is the best run ever recorded, and ``session_count``
+    is the number of sessions the state accounts for. A count that disagrees
+    with the log means the state is stale and must be recomputed.
+    """
+
+    __slots__ = ("current", "last_date", "longest", "session_count")
+
+    def __init__(self, current: int = 0, longest: int = 0, last_date: Optional[date] = None, session_count: int = 0):
+        self.current = current
+        self.longest = longest
+        self.last_date = last_date
+        self.session_count = session_count
+
+    @classmethod
+    def from_dates(cls, dates: Iterable[date]) -> "StreakState":
+        """Compute the state from scratch from every check-in date."""
+        dates = list(dates)
+        state = cls(session_count=len(dates))
+        for day in sorted(set(dates)):
+            if state.last_date is not None and (day - state.last_date).days == 1:
+                state.current += 1
+            else:
+                state.current = 1
+            state.last_date = day
+            state.longest = max(state.longest, state.current)
+        return state
+
+    def record(self, day: date) -> bool:
+        """
+        Count one more check-in on `day`.
+
+        Returns:
+            False if `day` is before the last check-in, in which case the state
+            cannot be updated incrementally and must be recomputed
+        """
+        if self.last_date is not None and day < self.last_date:
+            return False
+
+        if self.last_date is None or (day - self.last_date).days > 1:
+            self.current = 1
+        elif (day - self.last_date).days == 1:
+            self.current += 1
+        self.last_date = day
+        self.longest = max(self.longest, self.current)
+        self.session_count += 1
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "current": self.current,
+            "longest": self.longest,
+            "last_date": self.last_date.isoformat() if self.last_date else None,
+            "session_count": self.session_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreakState":
+        last_date = data.get("last_date")
+        return cls(
+            current=int(data["current"]),
+            longest=int(data["longest"]),
+            last_date=date.fromisoformat(last_date) if last_date else None,
+            session_count=int(data["session_count"]),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, StreakState) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"StreakState({self.to_dict()})"
+
+
+def session_date(session: Dict[str, Any]) -> date:
+    """Calendar date of a session's timestamp."""
+    return datetime.fromisoformat(session["timestamp"]).date()
+
+
+def load_streak(path: Path) -> Optional[StreakState]:
+    """Read a persisted streak state, or None if it is missing or unreadable."""
+    try:
+        with open(path) as f:
+            return StreakState.from_dict(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable streak state {path}: {e}")
+        return None
+
+
+def save_streak(path: Path, state: StreakState) -> None:
+    """Persist a streak state atomically."""
+    temp_file = path.with_suffix(".json.tmp")
+    with open(temp_file, "w") as f:
+        json.dump(state.to_dict(), f, indent=2)
+    temp_file.replace(path)
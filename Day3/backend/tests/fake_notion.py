@@ -0,0 +1,365 @@
+"""
+Local stand-in for the Notion API.
+Serves the endpoints the wellness tools use (pages, database queries, block
+children) from memory, with configurable latency and rate limiting, so the
+Notion integration can be tested and benchmarked offline.
+
+Run it directly and point the agent at it:
+    python tests/fake_notion.py --port 8765 --latency 0.15 --rate-limit 3
+    NOTION_API_URL=http://127.0.0.1:8765/v1 NOTION_API_KEY=fake ...
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+MAX_PAGE_SIZE = 100
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _sort_value(page: Dict[str, Any], sort: Dict[str, Any]) -> str:
+    """A page's key for one entry of a query's "sorts": a timestamp, or a date property's start."""
+    if "timestamp" in sort:
+        return page[sort["timestamp"]]
+    date = (page["properties"].get(sort["property"]) or {}).get("date") or {}
+    return date.get("start") or ""
+
+
+def _with_plain_text(rich_text: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{**part, "plain_text": part.get("text", {}).get("content", "")} for part in rich_text]
+
+
+class _TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> Optional[float]:
+        """Take a token; returns None on success, else seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return (1 - self._tokens) / self.rate
+
+
+class FakeNotionStore:
+    """In-memory pages and blocks, shaped like Notion's JSON."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        # parent block/page id -> child block ids in order
+        self.children: Dict[str, List[str]] = {}
+        self.blocks: Dict[str, Dict[str, Any]] = {}
+
+    def create_page(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        properties = {}
+        for name, value in body.get("properties", {}).items():
+            if "title" in value:
+                value = {**value, "title": _with_plain_text(value["title"])}
+            properties[name] = value
+        now = _now()
+        page = {
+            "object": "page",
+            "id": str(uuid.uuid4()),
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "in_trash": False,
+            "parent": body.get("parent", {}),
+            "properties": properties,
+        }
+        self.pages[page["id"]] = page
+        return page
+
+    def update_page(self, page_id: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        page = self.pages.get(page_id)
+        if page is None:
+            return None
+        page["properties"].update(body.get("properties", {}))
+        if "archived" in body:
+            page["archived"] = page["in_trash"] = bool(body["archived"])
+        page["last_edited_time"] = _now()
+        return page
+
+    def query(self, database_id: str, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        pages = [
+            p for p in self.pages.values()
+            if p["parent"].get("database_id") == database_id and not p["archived"] and self._matches(p, body.get("filter"))
+        ]
+        for sort in reversed(body.get("sorts", [])):
+            pages.sort(key=lambda p, sort=sort: _sort_value(p, sort), reverse=sort.get("direction") == "descending")
+        return pages
+
+    @staticmethod
+    def _matches(page: Dict[str, Any], condition: Optional[Dict[str, Any]]) -> bool:
+        if not condition:
+            return True
+        if "and" in condition:
+            return all(FakeNotionStore._matches(page, c) for c in condition["and"])
+        if "or" in condition:
+            return any(FakeNotionStore._matches(page, c) for c in condition["or"])
+        if "timestamp" in condition:
+            value = page[condition["timestamp"]]
+            check = condition[condition["timestamp"]]
+            if "on_or_after" in check:
+                return value >= check["on_or_after"]
+            if "after" in check:
+                return value > check["after"]
+            return True
+
+        prop = page["properties"].get(condition.get("property"), {})
+        if "select" in condition:
+            name = (prop.get("select") or {}).get("name")
+            return name == condition["select"].get("equals")
+        if "title" in condition:
+            title = "".join(part.get("plain_text", "") for part in prop.get("title", []))
+            return condition["title"].get("contains", "").lower() in title.lower()
+        return True
+
+    def append_children(self, parent_id: str, children: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        added = []
+        for child in children:
+            block = {**child, "object": "block", "id": str(uuid.uuid4()), "has_children": False,
+                     "created_time": _now(), "last_edited_time": _now(), "archived": False}
+            block_type = block.get("type")
+            if block_type and "rich_text" in block.get(block_type, {}):
+                block[block_type] = {**block[block_type], "rich_text": _with_plain_text(block[block_type]["rich_text"])}
+            self.blocks[block["id"]] = block
+            self.children.setdefault(parent_id, []).append(block["id"])
+            added.append(block)
+        return added
+
+    def update_block(self, block_id: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        block = self.blocks.get(block_id)
+        if block is None:
+            return None
+        block_type = block.get("type")
+        if block_type in body:
+            block[block_type] = {**block[block_type], **body[block_type]}
+        block["last_edited_time"] = _now()
+        return block
+
+
+def _paginate(items: List[Dict[str, Any]], start_cursor: Optional[str], page_size: Any) -> Dict[str, Any]:
+    start = int(start_cursor) if start_cursor else 0
+    size = max(1, min(MAX_PAGE_SIZE, int(page_size or MAX_PAGE_SIZE)))
+    chunk = items[start:start + size]
+    has_more = start + size < len(items)
+    return {
+        "object": "list",
+        "results": chunk,
+        "has_more": has_more,
+        "next_cursor": str(start + size) if has_more else None,
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeNotionServer"
+
+    ROUTES: ClassVar[List[Tuple[str, "re.Pattern[str]", str]]] = [
+        ("GET", re.compile(r"^/v1/users/me$"), "_me"),
+        ("POST", re.compile(r"^/v1/pages$"), "_create_page"),
+        ("GET", re.compile(r"^/v1/pages/([^/]+)$"), "_get_page"),
+        ("PATCH", re.compile(r"^/v1/pages/([^/]+)$"), "_update_page"),
+        ("POST", re.compile(r"^/v1/databases/([^/]+)/query$"), "_query"),
+        ("GET", re.compile(r"^/v1/blocks/([^/]+)/children$"), "_list_children"),
+        ("PATCH", re.compile(r"^/v1/blocks/([^/]+)/children$"), "_append_children"),
+        ("PATCH", re.compile(r"^/v1/blocks/([^/]+)$"), "_update_block"),
+    ]
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - overrides BaseHTTPRequestHandler
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, {"object": "error", "status": status, "code": code, "message": message}, headers)
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        server = self.server
+        server.count(f"{method} {url.path}")
+
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+
+        wait = server.bucket.take() if server.bucket else None
+        if wait is not None:
+            server.count("429")
+            self._error(429, "rate_limited", "Rate limited", {"Retry-After": f"{wait:.3f}"})
+            return
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._error(401, "unauthorized", "API token is invalid.")
+            return
+
+        for route_method, pattern, handler in self.ROUTES:
+            match = pattern.match(url.path)
+            if route_method == method and match:
+                try:
+                    body = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    self._error(400, "invalid_json", "Body failed to parse as JSON.")
+                    return
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                with server.store.lock:
+                    status, payload = getattr(self, handler)(*match.groups(), body=body, params=params)
+                self._send(status, payload)
+                return
+        self._error(404, "object_not_found", f"No route for {method} {url.path}")
+
+    def _me(self, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        return 200, {"object": "user", "id": "fake-bot", "type": "bot", "name": "Fake Notion"}
+
+    def _create_page(self, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        return 200, self.server.store.create_page(body)
+
+    def _get_page(self, page_id: str, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        page = self.server.store.pages.get(page_id)
+        return (200, page) if page else (404, {"object": "error", "status": 404, "code": "object_not_found"})
+
+    def _update_page(self, page_id: str, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        page = self.server.store.update_page(page_id, body)
+        return (200, page) if page else (404, {"object": "error", "status": 404, "code": "object_not_found"})
+
+    def _query(self, database_id: str, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        pages = self.server.store.query(database_id, body)
+        return 200, _paginate(pages, body.get("start_cursor"), body.get("page_size"))
+
+    def _list_children(self, block_id: str, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        store = self.server.store
+        blocks = [store.blocks[b] for b in store.children.get(block_id, [])]
+        return 200, _paginate(blocks, params.get("start_cursor"), params.get("page_size"))
+
+    def _append_children(self, block_id: str, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        added = self.server.store.append_children(block_id, body.get("children", []))
+        return 200, {"object": "list", "results": added, "has_more": False, "next_cursor": None}
+
+    def _update_block(self, block_id: str, body: Dict[str, Any], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        block = self.server.store.update_block(block_id, body)
+        return (200, block) if block else (404, {"object": "error", "status": 404, "code": "object_not_found"})
+
+
+class FakeNotionServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server speaking enough of the Notion API for the wellness tools.
+
+    Every request sleeps ``latency`` plus up to ``jitter`` seconds before it is
+    answered. With ``rate_limit`` set, requests beyond that many per second
+    (after a burst of ``burst``) get a 429 with Retry-After, like Notion's own
+    limiter. ``counts`` records requests per "METHOD /path" and 429s.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: Optional[float] = None,
+        burst: int = 10,
+    ):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.bucket = _TokenBucket(rate_limit, burst) if rate_limit else None
+        self.store = FakeNotionStore()
+        self.counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """API root to use as NOTION_API_URL."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, key: str) -> None:
+        with self._counts_lock:
+            self.counts[key] += 1
+
+    def start(self) -> "FakeNotionServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-notion", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeNotionServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Notion API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests per second before answering 429")
+    parser.add_argument("--burst", type=int, default=10, help="requests allowed at once before rate limiting")
+    args = parser.parse_args()
+
+    server = FakeNotionServer(args.host, args.port, args.latency, args.jitter, args.rate_limit, args.burst)
+    print(f"🧪 Fake Notion API on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
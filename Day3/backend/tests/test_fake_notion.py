@@ -0,0 +1,44 @@
+from fake_notion import FakeNotionServer
+
+from notion_api import NotionClient
+from notion_tasks import NotionTaskMirror
+
+
+async def test_mirror_round_trip_against_the_fake_server() -> None:
+    with FakeNotionServer() as server:
+        notion = NotionClient("fake", base_url=server.url)
+        mirror = NotionTaskMirror(notion, "db", "todo-page", max_age=0)
+        try:
+            for i, name in enumerate(["Stretch", "Go to the gym", "Read a book"]):
+                await mirror.create_page({
+                    "Name": {"title": [{"text": {"content": name}}]},
+                    "Status": {"select": {"name": "todo"}},
+                    "Date": {"date": {"start": f"2025-11-2{i}"}},
+                })
+            assert await mirror.append_todos(["Go to the gym"])
+
+            streamed = [t.name async for t in mirror.stream_tasks("Todo", limit=2)]
+            assert streamed == ["Read a book", "Go to the gym"]
+
+            task = mirror.find_pending("gym")
+            assert await mirror.set_status(task, "Done")
+            assert await mirror.check_todo(mirror.find_todo("gym"))
+
+            await mirror.sync(force=True)
+            assert [t.name for t in mirror.tasks("todo")] == ["Read a book", "Stretch"]
+            assert mirror.find_todo("gym").checked
+        finally:
+            await notion.aclose()
+
+
+async def test_rate_limited_requests_are_retried_after_the_advertised_delay() -> None:
+    with FakeNotionServer(rate_limit=20, burst=1) as server:
+        notion = NotionClient("fake", base_url=server.url, max_retries=5)
+        try:
+            first = await notion.get("/users/me")
+            second = await notion.get("/users/me")
+            assert first.status_code == second.status_code == 200
+            assert server.counts["429"] >= 1
+        finally:
+            await notion.aclose()
+
@@ -0,0 +1,183 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from notion_api import NOTION_VERSION, NotionAPIError, NotionClient
+
+
+def _client(handler, **kwargs) -> NotionClient:
+    kwargs.setdefault("backoff_base", 0.001)
+    return NotionClient(
+        "secret",
+        base_url="https://notion.test/v1",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+async def test_requests_share_headers_and_base_url() -> None:
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"object": "page"})
+
+    notion = _client(handler)
+    response = await notion.post("/pages", json={"parent": {}})
+    await notion.get("/blocks/abc/children")
+
+    assert response.json() == {"object": "page"}
+    assert [str(r.url) for r in seen] == [
+        "https://notion.test/v1/pages",
+        "https://notion.test/v1/blocks/abc/children",
+    ]
+    assert seen[0].headers["Authorization"] == "Bearer secret"
+    assert seen[0].headers["Notion-Version"] == NOTION_VERSION
+    # One pooled client for every call
+    assert notion.client is notion.client
+    await notion.aclose()
+
+
+async def test_retries_rate_limits_and_server_errors() -> None:
+    statuses = iter([429, 503, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        return httpx.Response(status, headers={"Retry-After": "0"} if status == 429 else {})
+
+    notion = _client(handler)
+    response = await notion.patch("/pages/p1", json={}, idempotent=True)
+    assert response.status_code == 200
+    await notion.aclose()
+
+
+async def test_writes_are_only_resent_when_notion_cannot_have_applied_them() -> None:
+    outcomes = iter([
+        httpx.ConnectError("refused"),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.ReadTimeout("no response"),
+    ])
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    notion = _client(handler)
+    # The timeout may have come after the page was created, so it is not sent a fourth time
+    with pytest.raises(httpx.ReadTimeout):
+        await notion.post("/pages", json={})
+    assert len(calls) == 3
+
+    calls.clear()
+    notion = _client(lambda request: calls.append(request) or httpx.Response(503))
+    assert (await notion.patch("/blocks/b/children", json={})).status_code == 503
+    assert len(calls) == 1
+    await notion.aclose()
+
+
+async def test_gives_up_after_max_retries() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(502)
+
+    notion = _client(handler, max_retries=2)
+    response = await notion.get("/users/me")
+    assert response.status_code == 502
+    assert len(calls) == 3
+    await notion.aclose()
+
+
+async def test_client_errors_are_not_retried() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"message": "bad filter"})
+
+    notion = _client(handler)
+    assert (await notion.post("/databases/db/query", json={})).status_code == 400
+    assert len(calls) == 1
+    await notion.aclose()
+
+
+async def test_transport_errors_are_retried_then_raised() -> None:
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    notion = _client(handler, max_retries=1)
+    with pytest.raises(httpx.ConnectError):
+        await notion.get("/users/me")
+    assert len(attempts) == 2
+    await notion.aclose()
+
+
+def test_base_url_from_environment(monkeypatch) -> None:
+    monkeypatch.setenv("NOTION_API_URL", "http://127.0.0.1:9999/v1/")
+    assert NotionClient("secret").base_url == "http://127.0.0.1:9999/v1"
+
+
+async def test_requests_in_flight_are_capped() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={})
+
+    notion = _client(handler, max_concurrency=2)
+    responses = await asyncio.gather(*(notion.post("/pages", json={}) for _ in range(6)))
+    assert all(r.status_code == 200 for r in responses)
+    assert peak == 2
+    await notion.aclose()
+
+
+async def test_paginate_follows_cursors_and_stops_at_limit() -> None:
+    rows = [{"id": str(i)} for i in range(250)]
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else {}
+        cursor_source = body if request.method == "POST" else dict(request.url.params)
+        requests.append(cursor_source)
+        start = int(cursor_source.get("start_cursor", 0))
+        size = int(cursor_source["page_size"])
+        more = start + size < len(rows)
+        return httpx.Response(200, json={
+            "results": rows[start:start + size],
+            "has_more": more,
+            "next_cursor": str(start + size) if more else None,
+        })
+
+    notion = _client(handler)
+    everything = [r["id"] async for r in notion.paginate("POST", "/databases/db/query", json={"sorts": []})]
+    assert len(everything) == 250 and everything[-1] == "249"
+    assert [r.get("start_cursor") for r in requests] == [None, "100", "200"]
+
+    requests.clear()
+    first = [r async for r in notion.paginate("GET", "/blocks/b/children", limit=11)]
+    assert len(first) == 11
+    assert len(requests) == 1 and requests[0]["page_size"] == "11"
+    await notion.aclose()
+
+
+async def test_paginate_raises_on_error_status() -> None:
+    notion = _client(lambda request: httpx.Response(404, json={"message": "missing"}))
+    with pytest.raises(NotionAPIError) as excinfo:
+        [r async for r in notion.paginate("POST", "/databases/db/query")]
+    assert excinfo.value.status_code == 404
+    await notion.aclose()
@@ -0,0 +1,242 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import httpx
+
+from notion_api import NotionClient
+from notion_tasks import NotionTaskMirror
+
+
+class FakeNotion:
+    """Just enough of the Notion API for the mirror, counting requests by route."""
+
+    def __init__(self):
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.blocks: List[Dict[str, Any]] = []
+        self.calls: List[str] = []
+        self.queries: List[Dict[str, Any]] = []
+        self.minute = 0
+
+    def _now(self) -> str:
+        self.minute += 1
+        return f"2025-11-24T10:{self.minute:02d}:00.000Z"
+
+    def add_page(self, name: str, status: str = "todo", date: str = "2025-11-24") -> Dict[str, Any]:
+        page = {
+            "object": "page",
+            "id": f"page-{len(self.pages) + 1}",
+            "last_edited_time": self._now(),
+            "properties": {
+                "Name": {"title": [{"plain_text": name, "text": {"content": name}}]},
+                "Status": {"select": {"name": status}},
+                "Date": {"date": {"start": date}},
+                "Energy": {"number": 6},
+                "Mood": {"select": {"name": "Calm"}},
+            },
+        }
+        self.pages[page["id"]] = page
+        return page
+
+    def add_todo(self, text: str) -> Dict[str, Any]:
+        block = {
+            "object": "block",
+            "id": f"block-{len(self.blocks) + 1}",
+            "type": "to_do",
+            "to_do": {"rich_text": [{"plain_text": text, "text": {"content": text}}], "checked": False},
+        }
+        self.blocks.append(block)
+        return block
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/v1")
+        body = json.loads(request.content) if request.content else {}
+        self.calls.append(f"{request.method} {path}")
+
+        if request.method == "POST" and path.endswith("/query"):
+            self.queries.append(body)
+            pages = sorted(self.pages.values(), key=lambda p: p["last_edited_time"])
+            since = body.get("filter", {}).get("last_edited_time", {}).get("on_or_after")
+            if since:
+                pages = [p for p in pages if p["last_edited_time"] >= since]
+            start = int(body.get("start_cursor") or 0)
+            size = body.get("page_size", 100)
+            chunk = pages[start:start + size]
+            more = start + size < len(pages)
+            return httpx.Response(200, json={
+                "results": chunk, "has_more": more, "next_cursor": str(start + size) if more else None,
+            })
+        if request.method == "POST" and path == "/pages":
+            page = self.add_page(body["properties"]["Name"]["title"][0]["text"]["content"])
+            return httpx.Response(200, json=page)
+        if request.method == "PATCH" and path.startswith("/pages/"):
+            page = self.pages[path.split("/")[2]]
+            page["properties"].update(body["properties"])
+            page["last_edited_time"] = self._now()
+            return httpx.Response(200, json=page)
+        if request.method == "GET" and path.endswith("/children"):
+            return httpx.Response(200, json={"results": self.blocks, "has_more": False, "next_cursor": None})
+        if request.method == "PATCH" and path.endswith("/children"):
+            added = [self.add_todo(child["to_do"]["rich_text"][0]["text"]["content"]) for child in body["children"]]
+            return httpx.Response(200, json={"results": added})
+        if request.method == "PATCH" and path.startswith("/blocks/"):
+            block = next(b for b in self.blocks if b["id"] == path.split("/")[2])
+            block["to_do"]["checked"] = body["to_do"]["checked"]
+            return httpx.Response(200, json=block)
+        return httpx.Response(404, json={"message": "not found"})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _mirror(fake: FakeNotion, clock: Clock, **kwargs) -> NotionTaskMirror:
+    notion = NotionClient("secret", base_url="https://notion.test/v1", transport=httpx.MockTransport(fake.handler))
+    return NotionTaskMirror(notion, "db", "todo-page", clock=clock, **kwargs)
+
+
+async def test_reads_are_served_from_the_mirror_until_stale() -> None:
+    fake, clock = FakeNotion(), Clock()
+    fake.add_page("Go to the gym", date="2025-11-23")
+    fake.add_page("Read a book", status="Done", date="2025-11-24")
+    mirror = _mirror(fake, clock, max_age=30)
+
+    await mirror.sync()
+    assert [t.name for t in mirror.tasks()] == ["Read a book", "Go to the gym"]
+    assert [t.name for t in mirror.tasks("TODO")] == ["Go to the gym"]
+    requests = len(fake.calls)
+
+    clock.now = 10
+    await mirror.sync()
+    assert len(fake.calls) == requests
+
+    # Past max_age only pages edited since the newest one seen are requested
+    fake.add_page("Call mom")
+    clock.now = 40
+    await mirror.sync()
+    assert fake.queries[-1]["filter"]["last_edited_time"]["on_or_after"] == "2025-11-24T10:02:00.000Z"
+    assert len(mirror.tasks()) == 3
+
+
+async def test_full_sync_drops_pages_removed_in_notion() -> None:
+    fake, clock = FakeNotion(), Clock()
+    fake.add_page("Stretch")
+    gone = fake.add_page("Old task")
+    mirror = _mirror(fake, clock, max_age=0, full_sync_interval=100)
+    await mirror.sync()
+
+    del fake.pages[gone["id"]]
+    clock.now = 50
+    await mirror.sync()
+    assert len(mirror.tasks()) == 2
+    clock.now = 150
+    await mirror.sync()
+    assert [t.name for t in mirror.tasks()] == ["Stretch"]
+
+
+async def test_writes_go_through_to_notion_and_the_mirror() -> None:
+    fake, clock = FakeNotion(), Clock()
+    mirror = _mirror(fake, clock)
+    await mirror.sync()
+
+    task = await mirror.create_page({"Name": {"title": [{"text": {"content": "Walk 10,000 steps"}}]}})
+    assert task is not None and task.name == "Walk 10,000 steps"
+    assert await mirror.append_todos(["Walk 10,000 steps", "Drink water"])
+    assert [call for call in fake.calls if call.endswith("/children")] == [
+        "GET /blocks/todo-page/children",
+        "PATCH /blocks/todo-page/children",
+    ]
+
+    found = mirror.find_pending("walk")
+    assert found is task
+    assert await mirror.set_status(found, "Done")
+    assert mirror.find_pending("walk") is None
+    assert mirror.tasks("done")[0].page_id == task.page_id
+
+    item = mirror.find_todo("WALK")
+    assert item is not None and not item.checked
+    assert await mirror.check_todo(item)
+    assert mirror.find_todo("walk").checked
+    assert fake.blocks[0]["to_do"]["checked"] is True
+
+
+async def test_stream_tasks_stops_after_the_limit() -> None:
+    fake, clock = FakeNotion(), Clock()
+    for i in range(30):
+        fake.add_page(f"Task {i}")
+    mirror = _mirror(fake, clock)
+
+    streamed = [task async for task in mirror.stream_tasks("Todo", limit=11)]
+    assert len(streamed) == 11
+    assert len(fake.queries) == 1
+    assert fake.queries[0]["page_size"] == 11
+    assert fake.queries[0]["filter"] == {"property": "Status", "select": {"equals": "todo"}}
+    assert not mirror.has_synced
+
+
+async def test_todo_page_is_only_relisted_on_full_syncs_and_after_writes() -> None:
+    fake, clock = FakeNotion(), Clock()
+    fake.add_todo("Drink water")
+    mirror = _mirror(fake, clock, max_age=0, full_sync_interval=100)
+
+    def listings() -> int:
+        return fake.calls.count("GET /blocks/todo-page/children")
+
+    await mirror.sync()
+    clock.now = 10
+    await mirror.sync()
+    assert listings() == 1
+
+    assert await mirror.append_todos(["Stretch"])
+    clock.now = 20
+    await mirror.sync()
+    assert listings() == 2
+    clock.now = 30
+    await mirror.sync()
+    assert listings() == 2
+
+    clock.now = 150
+    await mirror.sync()
+    assert listings() == 3
+    assert [mirror.find_todo(t).text for t in ("water", "stretch")] == ["Drink water", "Stretch"]
+
+
+async def test_writes_during_a_full_sync_are_kept() -> None:
+    fake, clock = FakeNotion(), Clock()
+    stretch = fake.add_page("Stretch")
+    fake.add_todo("Drink water")
+    paused: "asyncio.Queue[str]" = asyncio.Queue()
+    resume = asyncio.Event()
+    gate = False
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # Answer from Notion's state before the writes below, then let them land first
+        response = fake.handler(request)
+        if gate and request.method in ("POST", "GET") and request.url.path != "/v1/pages":
+            paused.put_nowait(request.method)
+            await resume.wait()
+            resume.clear()
+        return response
+
+    notion = NotionClient("secret", base_url="https://notion.test/v1", transport=httpx.MockTransport(handler))
+    mirror = NotionTaskMirror(notion, "db", "todo-page", clock=clock, max_age=0, full_sync_interval=0)
+    await mirror.sync()
+
+    gate = True
+    syncing = asyncio.create_task(mirror.sync())
+    assert await paused.get() == "POST"
+    assert await mirror.set_status(mirror.find_pending("stretch"), "Done")
+    created = await mirror.create_page({"Name": {"title": [{"text": {"content": "Call mom"}}]}})
+    resume.set()
+    assert await paused.get() == "GET"
+    assert await mirror.append_todos(["Call mom"])
+    resume.set()
+    await syncing
+
+    assert mirror.tasks("done")[0].page_id == stretch["id"]
+    assert mirror.find_pending("call mom") is created
+    assert [mirror.find_todo(t).text for t in ("water", "call mom")] == ["Drink water", "Call mom"]
@@ -0,0 +1,91 @@
+import json
+import threading
+
+from wellness_partitions import PartitionedWellnessStorage, partition_key
+from wellness_storage import SUMMARY_FILE
+
+
+def test_users_get_separate_sharded_partitions(tmp_path) -> None:
+    partitions = PartitionedWellnessStorage(tmp_path)
+    alice = partitions.acquire("alice")
+    bob = partitions.acquire("bob")
+    alice.save_session("a1", "good", "7/10", [], ["walk"], "")
+    alice.save_session("a2", "tired", "4/10", [], ["rest"], "")
+    bob.save_session("b1", "calm", "6/10", [], ["read"], "")
+
+    assert alice.get_session_count() == 2
+    assert bob.get_session_count() == 1
+    assert bob.get_last_session()["session_id"] == "b1"
+
+    key = partition_key("alice")
+    assert partitions.path_for("alice") == tmp_path / key[:2] / key
+    assert (tmp_path / key[:2] / key / "wellness_log.jsonl").exists()
+    assert partitions.acquire("alice") is alice
+
+
+def test_open_partitions_are_bounded_but_pinned_ones_survive(tmp_path) -> None:
+    partitions = PartitionedWellnessStorage(tmp_path, max_open=2, engine="sqlite")
+    active = partitions.acquire("active")
+    for user in ("u1", "u2", "u3"):
+        partitions.acquire(user).save_session(f"{user}-1", "ok", "5/10", [], [], "")
+        partitions.release(user)
+    assert len(partitions) == 2
+
+    # The pinned partition was never closed and still works
+    assert active.save_session("active-1", "ok", "5/10", [], [], "")
+    partitions.release("active")
+
+    reopened = partitions.acquire("u1")
+    assert reopened.get_last_session()["session_id"] == "u1-1"
+    partitions.close()
+    assert len(partitions) == 0
+
+
+def test_legacy_log_is_only_imported_for_the_user_it_is_meant_for(tmp_path) -> None:
+    legacy = tmp_path / "wellness_log.json"
+    legacy.write_text(json.dumps({"sessions": [
+        {"session_id": "old-1", "timestamp": "2025-11-20T09:00:00", "mood": "ok"},
+        {"session_id": "old-2", "timestamp": "2025-11-21T09:00:00", "mood": "good"},
+    ]}))
+    partitions = PartitionedWellnessStorage(tmp_path / "data")
+
+    # Nobody picks up the shared log just by checking in first
+    assert partitions.acquire("someone-else").get_session_count() == 0
+
+    owner = partitions.acquire("returning-user")
+    assert owner.import_legacy(legacy) == 2
+    assert [s["session_id"] for s in owner.get_all_sessions()] == ["old-1", "old-2"]
+    assert owner.get_streak() == 2
+    summary = json.loads((partitions.path_for("returning-user") / SUMMARY_FILE).read_text())
+    assert summary["total_sessions"] == 2
+    assert summary["recent_sessions"][0]["session_id"] == "old-2"
+    partitions.close()
+
+
+async def test_acquire_async_runs_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    partitions = PartitionedWellnessStorage(tmp_path)
+    threads = []
+    original = partitions.acquire
+
+    def acquire(identity):
+        threads.append(threading.current_thread())
+        return original(identity)
+
+    monkeypatch.setattr(partitions, "acquire", acquire)
+    storage = await partitions.acquire_async("alice")
+    assert storage.save_session("a1", "good", "7/10", [], [], "")
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_summary_is_written_for_every_engine(tmp_path) -> None:
+    for engine in ("jsonl", "sqlite"):
+        partitions = PartitionedWellnessStorage(tmp_path / engine, engine=engine)
+        storage = partitions.acquire("alice")
+        for i in range(7):
+            storage.save_session(f"s{i}", "ok", "5/10", [], [], "")
+        summary = json.loads((partitions.path_for("alice") / SUMMARY_FILE).read_text())
+        assert summary["total_sessions"] == 7
+        assert summary["current_streak"] == 1
+        assert [s["session_id"] for s in summary["recent_sessions"]] == ["s6", "s5", "s4", "s3", "s2"]
+        assert summary["last_check_in"] == summary["recent_sessions"][0]["timestamp"]
+        partitions.close()
@@ -0,0 +1,174 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from wellness_engines import StorageEngine
+from wellness_storage import WellnessStorage
+
+
+def _legacy_log(path, sessions):
+    path.write_text(json.dumps({"sessions": sessions}, indent=2))
+
+
+def _session(session_id, timestamp):
+    return {
+        "session_id": session_id,
+        "timestamp": timestamp,
+        "mood": "okay",
+        "energy_level": "5/10",
+        "stress_factors": [],
+        "intentions": ["stretch"],
+        "agent_summary": "",
+        "previous_session_reference": None,
+    }
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def engine(request):
+    return request.param
+
+
+def test_save_and_read_back(tmp_path, engine) -> None:
+    storage = WellnessStorage(tmp_path, engine=engine)
+    for i in range(7):
+        assert storage.save_session(f"s{i}", "good", "7/10", [], [f"goal {i}"], "summary")
+
+    assert storage.get_session_count() == 7
+    assert [s["session_id"] for s in storage.get_recent_sessions(3)] == ["s4", "s5", "s6"]
+    assert storage.get_last_session()["session_id"] == "s6"
+    assert len(storage.get_all_sessions()) == 7
+    storage.close()
+
+    reopened = WellnessStorage(tmp_path, engine=engine)
+    assert reopened.get_session_count() == 7
+    assert reopened.get_last_session()["intentions"] == ["goal 6"]
+    reopened.close()
+
+
+def test_sessions_between_uses_timestamps(tmp_path, engine) -> None:
+    _legacy_log(tmp_path / "wellness_log.json", [
+        _session("a", "2025-11-20T09:00:00"),
+        _session("c", "2025-11-22T09:00:00"),
+        _session("b", "2025-11-21T09:00:00"),
+        _session("d", "2025-11-25T09:00:00"),
+    ])
+    storage = WellnessStorage(tmp_path, engine=engine)
+
+    found = storage.get_sessions_between(datetime(2025, 11, 21), datetime(2025, 11, 22, 23, 59))
+    assert [s["session_id"] for s in found] == ["b", "c"]
+    assert storage.get_sessions_between(datetime(2025, 12, 1), datetime(2025, 12, 31)) == []
+    storage.close()
+
+
+def test_legacy_log_is_imported_once(tmp_path, engine) -> None:
+    _legacy_log(tmp_path / "wellness_log.json", [
+        _session("old-1", "2025-11-23T08:00:00"),
+        _session("old-2", "2025-11-24T08:00:00"),
+    ])
+    storage = WellnessStorage(tmp_path, engine=engine)
+    assert storage.get_session_count() == 2
+    assert storage.get_streak() == 2
+    storage.save_session("new", "calm", "6/10", [], [], "")
+    storage.close()
+
+    reopened = WellnessStorage(tmp_path, engine=engine)
+    assert reopened.get_session_count() == 3
+    reopened.close()
+
+
+def test_torn_jsonl_tail_is_dropped(tmp_path) -> None:
+    storage = WellnessStorage(tmp_path, engine="jsonl")
+    storage.save_session("kept", "good", "8/10", [], [], "")
+    storage.close()
+    with open(tmp_path / "wellness_log.jsonl", "a") as f:
+        f.write('{"session_id": "torn", "time')
+
+    reopened = WellnessStorage(tmp_path, engine="jsonl")
+    assert reopened.get_session_count() == 1
+    reopened.save_session("after", "good", "8/10", [], [], "")
+    assert [s["session_id"] for s in reopened.get_all_sessions()] == ["kept", "after"]
+
+
+def test_unknown_engine_is_rejected(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        WellnessStorage(tmp_path, engine="csv")
+
+
+def test_engine_missing_a_method_fails_when_created() -> None:
+    class AppendOnly(StorageEngine):
+        def append(self, session):
+            pass
+
+    with pytest.raises(TypeError):
+        AppendOnly()
+
+
+def test_context_reads_the_log_once_until_a_write(tmp_path, engine, monkeypatch) -> None:
+    storage = WellnessStorage(tmp_path, engine=engine)
+    for i in range(4):
+        storage.save_session(f"s{i}", "good", "7/10", [], [], "")
+
+    reads = []
+    real_all = storage.engine.all
+    monkeypatch.setattr(storage.engine, "all", lambda: reads.append(1) or real_all())
+
+    context = storage.get_context(recent_limit=3)
+    assert context["last_session"]["session_id"] == "s3"
+    assert [s["session_id"] for s in context["recent_sessions"]] == ["s1", "s2", "s3"]
+    assert context["session_count"] == 4
+    assert context["streak"] == 1
+    storage.get_context()
+    storage.get_streak()
+    assert storage.get_session_count() == 4
+    assert len(reads) == 1
+
+    storage.save_session("s4", "good", "7/10", [], [], "")
+    assert storage.get_context()["session_count"] == 5
+    assert storage.get_last_session()["session_id"] == "s4"
+    assert len(reads) == 2
+
+
+def test_streak_is_tracked_incrementally_and_persisted(tmp_path, engine, monkeypatch) -> None:
+    _legacy_log(tmp_path / "wellness_log.json", [
+        _session("a", "2025-11-01T09:00:00"),
+        _session("b", "2025-11-02T09:00:00"),
+        _session("c", "2025-11-03T21:00:00"),
+        _session("d", "2025-11-10T09:00:00"),
+        _session("e", "2025-11-11T09:00:00"),
+    ])
+    storage = WellnessStorage(tmp_path, engine=engine)
+    assert storage.get_streak_info() == {"current": 2, "longest": 3, "last_date": "2025-11-11"}
+
+    days = iter([datetime(2025, 11, 12, 8), datetime(2025, 11, 12, 20), datetime(2025, 11, 13, 8)])
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(days)
+
+    monkeypatch.setattr("wellness_storage.datetime", Clock)
+    storage.engine.all = lambda: pytest.fail("streak update re-read the log")
+    for i in range(3):
+        storage.save_session(f"n{i}", "good", "7/10", [], [], "")
+    assert storage.get_streak_info() == {"current": 4, "longest": 4, "last_date": "2025-11-13"}
+    storage.close()
+
+    reopened = WellnessStorage(tmp_path, engine=engine)
+    assert reopened.get_streak() == 4
+    assert reopened.recompute_streak() == reopened._streak_state
+    reopened.close()
+
+
+def test_stale_streak_state_is_rebuilt(tmp_path, engine) -> None:
+    storage = WellnessStorage(tmp_path, engine=engine)
+    storage.save_session("s0", "good", "7/10", [], [], "")
+    storage.close()
+    (tmp_path / "wellness_streak.json").write_text(
+        json.dumps({"current": 9, "longest": 9, "last_date": "2020-01-01", "session_count": 7})
+    )
+
+    reopened = WellnessStorage(tmp_path, engine=engine)
+    assert reopened.get_streak_info()["current"] == 1
+    assert reopened.get_streak_info()["longest"] == 1
+    reopened.close()
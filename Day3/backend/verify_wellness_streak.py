@@ -0,0 +1,50 @@
+"""Check the persisted check-in streak against a from-scratch recomputation of the wellness log."""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from wellness_engines import ENGINES, open_engine
+from wellness_streak import (
+    STREAK_FILE,
+    StreakState,
+    load_streak,
+    save_streak,
+    session_date,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", type=Path, default=Path("."), help="directory holding the wellness log")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="jsonl", help="storage engine of the log")
+    parser.add_argument("--fix", action="store_true", help="overwrite the stored streak when it disagrees")
+    args = parser.parse_args()
+
+    streak_file = args.data_dir / STREAK_FILE
+    engine = open_engine(args.engine, args.data_dir)
+    try:
+        expected = StreakState.from_dates(session_date(s) for s in engine.all())
+    finally:
+        engine.close()
+    stored = load_streak(streak_file)
+
+    print(f"Recomputed: {expected.to_dict()}")
+    print(f"Stored:     {stored.to_dict() if stored else 'missing'}")
+
+    if stored == expected:
+        print("✅ Streak state is consistent")
+        return
+
+    if args.fix:
+        save_streak(streak_file, expected)
+        print(f"🔧 Rewrote {streak_file}")
+        return
+
+    print("❌ Streak state disagrees with the log (run with --fix to repair)")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { NextResponse } from 'next/server';
+import { type NextRequest, NextResponse } from 'next/server';
 import { AccessToken, type AccessTokenOptions, type VideoGrant } from 'livekit-server-sdk';
 import { RoomConfiguration } from '@livekit/protocol';
 
@@ -14,10 +14,14 @@ const API_KEY = process.env.LIVEKIT_API_KEY;
 const API_SECRET = process.env.LIVEKIT_API_SECRET;
 const LIVEKIT_URL = process.env.LIVEKIT_URL;
 
+// Remembers the browser's participant identity; the agent keys wellness history on it
+const USER_COOKIE = 'wellness_user_id';
+const USER_COOKIE_MAX_AGE = 60 * 60 * 24 * 365;
+
 // don't cache the results
 export const revalidate = 0;
 
-export async function POST(req: Request) {
+export async function POST(req: NextRequest) {
   try {
     if (LIVEKIT_URL === undefined) {
       throw new Error('LIVEKIT_URL is not defined');
@@ -35,7 +39,8 @@ export async function POST(req: Request) {
 
     // Generate participant token
     const participantName = 'user';
-    const participantIdentity = `voice_assistant_user_${Math.floor(Math.random() * 10_000)}`;
+    const participantIdentity =
+      req.cookies.get(USER_COOKIE)?.value ?? `voice_assistant_user_${crypto.randomUUID()}`;
     const roomName = `voice_assistant_room_${Math.floor(Math.random() * 10_000)}`;
 
     const participantToken = await createParticipantToken(
@@ -54,7 +59,14 @@ export async function POST(req: Request) {
     const headers = new Headers({
       'Cache-Control': 'no-store',
     });
-    return NextResponse.json(data, { headers });
+    const response = NextResponse.json(data, { headers });
+    response.cookies.set(USER_COOKIE, participantIdentity, {
+      httpOnly: true,
+      sameSite: 'lax',
+      path: '/',
+      maxAge: USER_COOKIE_MAX_AGE,
+    });
+    return response;
   } catch (error) {
     if (error instanceof Error) {
       console.error(error);
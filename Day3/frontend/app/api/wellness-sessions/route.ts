@@ -1,40 +1,73 @@
-import { NextResponse } from "next/server";
+import { type NextRequest, NextResponse } from "next/server";
+import { createHash } from "crypto";
 import fs from "fs";
 import path from "path";
 
-export async function GET() {
+// Set by /api/connection-details; the same identity the agent partitions storage by
+const USER_COOKIE = "wellness_user_id";
+
+const EMPTY_RESPONSE = {
+  stats: {
+    totalSessions: 0,
+    currentStreak: 0,
+    lastCheckIn: null,
+  },
+  recentSessions: [],
+};
+
+// Mirrors wellness_partitions.py: <data dir>/<first two hex digits>/<sha1 of identity>/
+function partitionDir(identity: string): string {
+  const key = createHash("sha1").update(identity, "utf-8").digest("hex");
+  return path.join(
+    process.cwd(),
+    "..",
+    "backend",
+    process.env.WELLNESS_DATA_DIR || "wellness_data",
+    key.slice(0, 2),
+    key
+  );
+}
+
+export async function GET(req: NextRequest) {
   try {
-    // Path to wellness log in backend
-    const wellnessLogPath = path.join(
-      process.cwd(),
-      "..",
-      "backend",
-      "wellness_log.json"
-    );
+    const identity = req.cookies.get(USER_COOKIE)?.value;
+    if (!identity) {
+      return NextResponse.json(EMPTY_RESPONSE);
+    }
+
+    // The backend keeps a summary next to the log, written the same way for every
+    // storage engine (see WellnessStorage._write_summary in wellness_storage.py)
+    const userDir = partitionDir(identity);
+    const summary = readSummary(userDir);
+    if (summary) {
+      return NextResponse.json(summary);
+    }
+
+    // Partitions last written before the summary existed: read the JSONL log directly
+    const wellnessLogPath = path.join(userDir, "wellness_log.jsonl");
 
     // Check if file exists
     if (!fs.existsSync(wellnessLogPath)) {
-      return NextResponse.json({
-        stats: {
-          totalSessions: 0,
-          currentStreak: 0,
-          lastCheckIn: null,
-        },
-        recentSessions: [],
-      });
+      return NextResponse.json(EMPTY_RESPONSE);
     }
 
-    // Read wellness log
+    // Read wellness log, one session per line; skip a line still being written
     const fileContent = fs.readFileSync(wellnessLogPath, "utf-8");
-    const data = JSON.parse(fileContent);
-    const sessions = data.sessions || [];
+    const sessions = fileContent.split("\n").flatMap((line) => {
+      if (!line.trim()) return [];
+      try {
+        return [JSON.parse(line)];
+      } catch {
+        return [];
+      }
+    });
 
     // Calculate stats
     const totalSessions = sessions.length;
     const lastCheckIn = sessions.length > 0 ? sessions[sessions.length - 1].timestamp : null;
 
-    // Calculate streak
-    const currentStreak = calculateStreak(sessions);
+    // Streak as tracked by the backend, calculated here if it has not been written yet
+    const currentStreak = readStoredStreak(userDir) ?? calculateStreak(sessions);
 
     // Get recent sessions (last 5)
     const recentSessions = sessions.slice(-5).reverse();
@@ -56,6 +89,35 @@ export async function GET() {
   }
 }
 
+function readSummary(userDir: string) {
+  try {
+    const summary = JSON.parse(
+      fs.readFileSync(path.join(userDir, "wellness_summary.json"), "utf-8")
+    );
+    return {
+      stats: {
+        totalSessions: summary.total_sessions,
+        currentStreak: summary.current_streak,
+        lastCheckIn: summary.last_check_in,
+      },
+      recentSessions: summary.recent_sessions,
+    };
+  } catch {
+    return null;
+  }
+}
+
+function readStoredStreak(userDir: string): number | null {
+  try {
+    const state = JSON.parse(
+      fs.readFileSync(path.join(userDir, "wellness_streak.json"), "utf-8")
+    );
+    return typeof state.current === "number" ? state.current : null;
+  } catch {
+    return null;
+  }
+}
+
 function calculateStreak(sessions: any[]): number {
   if (sessions.length === 0) return 0;
 
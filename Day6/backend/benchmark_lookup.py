@@ -0,0 +1,135 @@
+"""Benchmark get_fraud_case_by_username lookups before and after the username index."""
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from fraud_database import (
+    CREATE_PENDING_LOOKUP_INDEX,
+    PRAGMAS,
+    SELECT_PENDING_CASE_BY_USERNAME,
+)
+
+FIRST_NAMES = ["John", "Sarah", "Michael", "Emily", "David", "Priya", "Wei", "Fatima", "Carlos", "Aisha"]
+LAST_NAMES = ["Smith", "Williams", "Chen", "Rodriguez", "Thompson", "Patel", "Kim", "Okafor", "Garcia", "Nguyen"]
+STATUSES = ["pending_review", "confirmed_safe", "confirmed_fraud", "verification_failed"]
+
+CREATE_TABLE = """
+    CREATE TABLE fraud_cases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        userName TEXT NOT NULL,
+        securityIdentifier TEXT NOT NULL,
+        cardEnding TEXT NOT NULL,
+        status TEXT DEFAULT 'pending_review',
+        transactionName TEXT NOT NULL,
+        transactionAmount REAL NOT NULL,
+        transactionTime TEXT NOT NULL,
+        transactionCategory TEXT NOT NULL,
+        transactionSource TEXT NOT NULL,
+        transactionLocation TEXT NOT NULL,
+        securityQuestion TEXT NOT NULL,
+        securityAnswer TEXT NOT NULL,
+        outcomeNote TEXT,
+        createdAt TEXT DEFAULT CURRENT_TIMESTAMP,
+        updatedAt TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def user_name(i: int) -> str:
+    return f"{FIRST_NAMES[i % 10]} {LAST_NAMES[(i // 10) % 10]} {i // 100}"
+
+
+def populate(conn: sqlite3.Connection, rows: int, users: int) -> None:
+    """Fill fraud_cases with synthetic cases spread over `users` customers."""
+    rng = random.Random(42)
+
+    def generate():
+        for i in range(rows):
+            yield (
+                user_name(rng.randrange(users)),
+                f"{rng.randrange(100000):05d}",
+                f"{rng.randrange(10000):04d}",
+                rng.choice(STATUSES),
+                "Synthetic Merchant",
+                round(rng.uniform(5, 20000), 2),
+                "2025-11-27 02:34:15",
+                "e-commerce",
+                "example.com",
+                "Nowhere",
+                "What is your favorite color?",
+                "Blue",
+                f"2025-{1 + i % 12:02d}-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:{i % 59:02d}",
+            )
+
+    conn.executemany("""
+        INSERT INTO fraud_cases (
+            userName, securityIdentifier, cardEnding, status,
+            transactionName, transactionAmount, transactionTime,
+            transactionCategory, transactionSource, transactionLocation,
+            securityQuestion, securityAnswer, createdAt
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, generate())
+    conn.commit()
+
+
+def time_lookups(conn: sqlite3.Connection, names: list) -> list:
+    timings = []
+    for name in names:
+        start = time.perf_counter()
+        conn.execute(SELECT_PENDING_CASE_BY_USERNAME, (name,)).fetchone()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def report(label: str, timings: list) -> None:
+    p99 = timings[max(0, int(len(timings) * 0.99) - 1)]
+    print(f"{label:<8} mean {statistics.mean(timings):9.3f} ms   p50 {timings[len(timings) // 2]:9.3f} ms   p99 {p99:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic fraud cases to insert")
+    parser.add_argument("--users", type=int, default=100_000, help="distinct customer names")
+    parser.add_argument("--lookups", type=int, default=200, help="lookups per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.db")
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        conn.execute(CREATE_TABLE)
+
+        print(f"\n🏦 Inserting {args.rows:,} synthetic fraud cases...")
+        start = time.perf_counter()
+        populate(conn, args.rows, args.users)
+        print(f"   done in {time.perf_counter() - start:.1f} s\n")
+
+        rng = random.Random(7)
+        # Spoken names arrive in any case
+        names = [user_name(rng.randrange(args.users)).lower() for _ in range(args.lookups)]
+
+        plan = conn.execute("EXPLAIN QUERY PLAN " + SELECT_PENDING_CASE_BY_USERNAME, (names[0],)).fetchall()
+        print(f"Plan before: {plan[0][3]}")
+        report("before", time_lookups(conn, names))
+
+        start = time.perf_counter()
+        conn.execute(CREATE_PENDING_LOOKUP_INDEX)
+        conn.execute("ANALYZE")
+        print(f"\n🗂️  Index built in {time.perf_counter() - start:.1f} s\n")
+
+        plan = conn.execute("EXPLAIN QUERY PLAN " + SELECT_PENDING_CASE_BY_USERNAME, (names[0],)).fetchall()
+        print(f"Plan after:  {plan[0][3]}")
+        report("after", time_lookups(conn, names))
+        print()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import json
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -23,16 +23,17 @@ from livekit.plugins import murf, silero, google, assemblyai, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
 from fraud_database import (
-    get_fraud_case_by_username,
-    update_fraud_case_status
+    get_fraud_case_by_username_async,
+    update_fraud_case_status_async
 )
+from case_archive import CaseArchive
 
 logger = logging.getLogger("fraud_agent")
 load_dotenv(".env")
 
-# JSON output directory
+# Resolved cases are archived in batches, off the event loop
 RESOLVED_CASES_DIR = Path(__file__).parent.parent / "resolved_cases"
-RESOLVED_CASES_DIR.mkdir(exist_ok=True)
+case_archive = CaseArchive(RESOLVED_CASES_DIR)
 
 
 class FraudAlertAgent(Agent):
@@ -119,7 +120,7 @@ Remember: You're here to protect the customer and resolve the fraud alert effici
         """
         logger.info(f"🔍 Loading fraud case for: {name}")
         
-        fraud_case = get_fraud_case_by_username(name)
+        fraud_case = await get_fraud_case_by_username_async(name)
         
         if not fraud_case:
             logger.warning(f"❌ No pending fraud case found for: {name}")
@@ -170,12 +171,12 @@ Remember: You're here to protect the customer and resolve the fraud alert effici
         case_id = self.current_case['id']
         outcome_note = f"Customer {self.customer_name} confirmed transaction as legitimate on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        update_fraud_case_status(case_id, "confirmed_safe", outcome_note)
+        await update_fraud_case_status_async(case_id, "confirmed_safe", outcome_note)
         
         logger.info(f"✅ Case {case_id} marked as SAFE")
         
-        # Save to JSON file
-        self._save_case_to_json("confirmed_safe", outcome_note)
+        # Archive the resolved case
+        self._archive_case("confirmed_safe", outcome_note)
         
         return f"Excellent! I've marked this transaction as authorized. No further action is needed on your part. Your card remains active and you can continue using it normally. Thank you for confirming, {self.customer_name}."
 
@@ -192,22 +193,21 @@ Remember: You're here to protect the customer and resolve the fraud alert effici
         case = self.current_case
         outcome_note = f"Customer {self.customer_name} denied transaction. Card blocked. Dispute initiated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        update_fraud_case_status(case_id, "confirmed_fraud", outcome_note)
+        await update_fraud_case_status_async(case_id, "confirmed_fraud", outcome_note)
         
         logger.info(f"🚨 Case {case_id} marked as FRAUDULENT")
         
-        # Save to JSON file
-        self._save_case_to_json("confirmed_fraud", outcome_note)
+        # Archive the resolved case
+        self._archive_case("confirmed_fraud", outcome_note)
         
         return f"I understand, {self.customer_name}. I've immediately blocked your card ending in {case['cardEnding']} to prevent any further unauthorized charges. You will NOT be charged for this ${case['transactionAmount']:.2f} transaction. We'll mail you a replacement card within 3 to 5 business days to your address on file. You'll also receive an email with dispute details and next steps."
 
-    def _save_case_to_json(self, final_status: str, outcome_note: str):
-        """Save the resolved fraud case to a JSON file."""
+    def _archive_case(self, final_status: str, outcome_note: str):
+        """Queue the resolved fraud case for the case archive."""
         if not self.current_case:
             return
         
         case = self.current_case
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         case_data = {
             "case_id": case['id'],
@@ -232,14 +232,8 @@ Remember: You're here to protect the customer and resolve the fraud alert effici
             "outcome": outcome_note
         }
         
-        # Save to JSON file
-        filename = f"case_{case['id']}_{self.customer_name.replace(' ', '_')}_{timestamp}.json"
-        filepath = RESOLVED_CASES_DIR / filename
-        
-        with open(filepath, 'w') as f:
-            json.dump(case_data, f, indent=2)
-        
-        logger.info(f"💾 Saved case to: {filepath}")
+        case_archive.submit(case_data)
+        logger.info(f"🗄️ Queued case {case['id']} for archiving")
 
 
 def prewarm(proc: JobProcess):
@@ -278,6 +272,11 @@ async def entrypoint(ctx: JobContext):
 
     ctx.add_shutdown_callback(log_usage)
 
+    async def flush_case_archive():
+        await asyncio.to_thread(case_archive.flush)
+
+    ctx.add_shutdown_callback(flush_case_archive)
+
     await session.start(
         agent=FraudAlertAgent(),
         room=ctx.room,
@@ -0,0 +1,328 @@
+"""Batched, compressed archive of resolved fraud cases."""
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("case_archive")
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_SEGMENT_MAX_RECORDS = 10_000
+
+SEGMENT_PATTERN = "segment-{:06d}.jsonl.gz"
+INDEX_FILE = "index.jsonl"
+
+# How often a waiting flush() checks that the writer thread is still running
+_FLUSH_POLL_INTERVAL = 0.5
+
+_STOP = object()
+
+
+class _Location(NamedTuple):
+    """Where a case's latest record is: its gzip member's byte range and the line within it."""
+
+    segment: str
+    offset: int
+    length: int
+    line: int
+
+
+class _FlushRequest:
+    """Marker queued behind pending cases; set once everything before it is written or has failed to be."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class CaseArchive:
+    """
+    Archive of resolved cases written by a background thread.
+
+    submit() only enqueues, so callers on the event loop never wait on disk.
+    The writer thread collects cases into batches (up to ``batch_size`` cases
+    or ``flush_interval`` seconds) and appends each batch as one gzip member to
+    the current segment file. Segments rotate after ``segment_max_records``
+    cases. index.jsonl maps every case_id to its member's byte range in a
+    segment, so get() decompresses one batch and never reads past what the
+    writer has finished. If the index is missing or behind the segments (a
+    crash between the two writes), it is rebuilt from the segments. A batch
+    that fails to write is kept and retried with the next one.
+    """
+
+    def __init__(
+        self,
+        archive_dir: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        segment_max_records: int = DEFAULT_SEGMENT_MAX_RECORDS,
+    ):
+        self.archive_dir = Path(archive_dir)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_max_records = segment_max_records
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        # Guards the index; held only to load or update it, never during compression or writes
+        self._lock = threading.Lock()
+        # Guards starting and stopping the writer thread
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # case_id -> location of its latest record; loaded from index.jsonl on first use
+        self._index: Optional[Dict[str, _Location]] = None
+        # Only the writer thread moves these once the index is loaded
+        self._segment_number = 1
+        self._segment_records = 0
+
+    def _load_index(self) -> Dict[str, _Location]:
+        """Read index.jsonl and work out which segment to append to. Caller holds the lock."""
+        if self._index is not None:
+            return self._index
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        index: Dict[str, _Location] = {}
+        per_segment: Dict[str, int] = {}
+        # End of the last indexed member per segment, to spot segments the index is behind on
+        indexed_end: Dict[str, int] = {}
+        stale = False
+        index_path = self.archive_dir / INDEX_FILE
+        if index_path.exists():
+            with open(index_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        location = _Location(entry["segment"], entry["offset"], entry["length"], entry["line"])
+                    except (json.JSONDecodeError, KeyError):
+                        # Torn last line, or an index written before byte offsets were recorded
+                        stale = True
+                        continue
+                    index[str(entry["case_id"])] = location
+                    per_segment[location.segment] = per_segment.get(location.segment, 0) + 1
+                    end = location.offset + location.length
+                    indexed_end[location.segment] = max(indexed_end.get(location.segment, 0), end)
+
+        segments = sorted(self.archive_dir.glob("segment-*.jsonl.gz"))
+        if not stale:
+            stale = any(path.stat().st_size != indexed_end.get(path.name, 0) for path in segments)
+        if stale:
+            index, per_segment = self._rebuild_index(segments)
+
+        if segments:
+            self._segment_number = max(int(p.name.split("-")[1].split(".")[0]) for p in segments)
+            self._segment_records = per_segment.get(SEGMENT_PATTERN.format(self._segment_number), 0)
+
+        self._index = index
+        return index
+
+    def _rebuild_index(self, segments: List[Path]) -> Tuple[Dict[str, _Location], Dict[str, int]]:
+        """Re-derive index.jsonl from the segment files. Caller holds the lock."""
+        index: Dict[str, _Location] = {}
+        per_segment: Dict[str, int] = {}
+        entries = []
+        for path in segments:
+            end = 0
+            for offset, length, lines in _read_members(path.read_bytes()):
+                for line_number, line in enumerate(lines):
+                    case_id = str(json.loads(line).get("case_id"))
+                    location = _Location(path.name, offset, length, line_number)
+                    index[case_id] = location
+                    entries.append({"case_id": case_id, **location._asdict()})
+                per_segment[path.name] = per_segment.get(path.name, 0) + len(lines)
+                end = offset + length
+            if end != path.stat().st_size:
+                # A batch cut short by a crash; drop it so later appends stay readable
+                logger.warning(f"⚠️ Truncating incomplete batch at the end of {path.name}")
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+
+        index_path = self.archive_dir / INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, index_path)
+        logger.info(f"🗂️ Rebuilt case archive index from {len(segments)} segment(s), {len(index)} case(s)")
+        return index, per_segment
+
+    def _start(self) -> None:
+        with self._thread_lock:
+            if self._closed:
+                raise RuntimeError("Case archive is closed")
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="case-archive", daemon=True)
+                self._thread.start()
+
+    def submit(self, case_data: Dict[str, Any]) -> None:
+        """Queue a resolved case for archiving. Never blocks on disk."""
+        self._start()
+        self._queue.put(case_data)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every case submitted so far is written. Returns False on timeout.
+
+        Returns True straight away if nothing was ever submitted or the archive
+        is closed (close() writes what is pending). Raises RuntimeError if the
+        pending cases could not be written (they stay queued for a retry) or
+        the writer thread has died with cases still queued, rather than waiting forever.
+        """
+        with self._thread_lock:
+            thread = self._thread
+        if thread is None:
+            return True
+        if not thread.is_alive():
+            raise RuntimeError("Case archive writer is not running")
+
+        request = _FlushRequest()
+        self._queue.put(request)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = _FLUSH_POLL_INTERVAL if deadline is None else min(_FLUSH_POLL_INTERVAL, deadline - time.monotonic())
+            if request.done.wait(max(wait, 0)):
+                if request.error is not None:
+                    raise RuntimeError("Case archive failed to write pending cases") from request.error
+                return True
+            if not thread.is_alive():
+                raise RuntimeError("Case archive writer stopped before flushing")
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write pending cases and stop the writer thread. Later submit() calls raise."""
+        with self._thread_lock:
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("⚠️ Case archive writer is still running after close()")
+            return
+        with self._thread_lock:
+            self._thread = None
+
+    def _run(self) -> None:
+        # Cases not yet written, kept across failed attempts
+        batch: List[Dict[str, Any]] = []
+        while True:
+            waiters: List[_FlushRequest] = []
+            stop = False
+            try:
+                # With a failed batch pending, retry after flush_interval even if nothing new arrives
+                item = self._queue.get(timeout=self.flush_interval if batch else None)
+            except queue.Empty:
+                item = None
+
+            # Gather a batch: take what is queued, waiting up to flush_interval for more
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+
+            error = None
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    error = e
+                    logger.error(f"❌ Failed to archive {len(batch)} resolved case(s), will retry: {e}")
+                else:
+                    batch = []
+            for waiter in waiters:
+                waiter.error = error
+                waiter.done.set()
+            if stop:
+                if batch:
+                    logger.error(f"❌ Case archive closed with {len(batch)} resolved case(s) not written")
+                return
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        # Runs on the writer thread only, so the segment counters and files are its own;
+        # the lock is taken just to load the index and to publish the new entries
+        with self._lock:
+            index = self._load_index()
+        entries = []
+        start = 0
+        while start < len(batch):
+            if self._segment_records >= self.segment_max_records:
+                self._segment_number += 1
+                self._segment_records = 0
+            room = self.segment_max_records - self._segment_records
+            chunk = batch[start:start + room]
+            segment = SEGMENT_PATTERN.format(self._segment_number)
+
+            payload = "".join(json.dumps(case, separators=(",", ":")) + "\n" for case in chunk)
+            # Each batch is its own gzip member; readers see one continuous stream
+            member = gzip.compress(payload.encode("utf-8"))
+            with open(self.archive_dir / segment, "ab") as f:
+                offset = f.tell()
+                try:
+                    f.write(member)
+                    f.flush()
+                except OSError:
+                    # Don't leave half a member for the retry to append after
+                    f.truncate(offset)
+                    raise
+
+            for line_number, case in enumerate(chunk):
+                location = _Location(segment, offset, len(member), line_number)
+                entries.append((str(case["case_id"]), location))
+            self._segment_records += len(chunk)
+            start += len(chunk)
+
+        with open(self.archive_dir / INDEX_FILE, "a") as f:
+            f.write("".join(json.dumps({"case_id": case_id, **location._asdict()}) + "\n" for case_id, location in entries))
+        # Readers only learn about a member once it is fully written
+        with self._lock:
+            index.update(entries)
+
+        logger.info(f"💾 Archived {len(batch)} resolved case(s) to {segment}")
+
+    def get(self, case_id: Any) -> Optional[Dict[str, Any]]:
+        """Read back the latest archived record for a case."""
+        with self._lock:
+            location = self._load_index().get(str(case_id))
+        if location is None:
+            return None
+
+        # Only this case's batch, which was complete before it was indexed
+        with open(self.archive_dir / location.segment, "rb") as f:
+            f.seek(location.offset)
+            member = f.read(location.length)
+        lines = gzip.decompress(member).splitlines()
+        return json.loads(lines[location.line])
+
+
+def _read_members(data: bytes) -> Iterator[Tuple[int, int, List[bytes]]]:
+    """Split a segment into its gzip members: (offset, length, lines). Stops at an incomplete member."""
+    offset = 0
+    while offset < len(data):
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            payload = decompressor.decompress(data[offset:])
+        except zlib.error:
+            return
+        if not decompressor.eof:
+            return
+        length = len(data) - offset - len(decompressor.unused_data)
+        yield offset, length, payload.splitlines()
+        offset += length
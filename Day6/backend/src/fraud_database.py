@@ -1,18 +1,187 @@
 """Fraud case database management using SQLite."""
+import asyncio
+import functools
+import queue
 import sqlite3
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 logger = logging.getLogger("fraud_database")
 
 DB_PATH = Path(__file__).parent.parent / "fraud_cases.db"
 
+POOL_SIZE = 4
+# Prepared statements kept per connection; every query below is a fixed string so it hits this cache
+CACHED_STATEMENTS = 64
+BUSY_TIMEOUT_MS = 5000
 
-def init_database():
-    """Initialize the fraud cases database with sample data."""
-    conn = sqlite3.connect(DB_PATH)
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA mmap_size = 67108864",
+)
+
+# Expression index matching SELECT_PENDING_CASE_BY_USERNAME term for term, so the
+# case-insensitive lookup is an index seek instead of a full table scan
+CREATE_PENDING_LOOKUP_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_fraud_cases_username_status_created
+    ON fraud_cases (LOWER(userName), status, createdAt DESC)
+"""
+
+SELECT_PENDING_CASE_BY_USERNAME = """
+    SELECT * FROM fraud_cases 
+    WHERE LOWER(userName) = LOWER(?) 
+    AND status = 'pending_review'
+    ORDER BY createdAt DESC
+    LIMIT 1
+"""
+
+UPDATE_CASE_STATUS = """
+    UPDATE fraud_cases 
+    SET status = ?, 
+        outcomeNote = ?,
+        updatedAt = ?
+    WHERE id = ?
+"""
+
+SELECT_ALL_CASES = "SELECT * FROM fraud_cases ORDER BY createdAt DESC"
+
+# Keyset pagination, newest first: each page resumes after the (createdAt, id)
+# of the previous page's last row, so deep pages cost the same as the first
+SELECT_CASES_FIRST_PAGE = """
+    SELECT * FROM fraud_cases
+    ORDER BY createdAt DESC, id DESC
+    LIMIT ?
+"""
+
+SELECT_CASES_NEXT_PAGE = """
+    SELECT * FROM fraud_cases
+    WHERE (createdAt, id) < (?, ?)
+    ORDER BY createdAt DESC, id DESC
+    LIMIT ?
+"""
+
+SELECT_CASES_BY_STATUS_FIRST_PAGE = """
+    SELECT * FROM fraud_cases
+    WHERE status = ?
+    ORDER BY createdAt DESC, id DESC
+    LIMIT ?
+"""
+
+SELECT_CASES_BY_STATUS_NEXT_PAGE = """
+    SELECT * FROM fraud_cases
+    WHERE status = ? AND (createdAt, id) < (?, ?)
+    ORDER BY createdAt DESC, id DESC
+    LIMIT ?
+"""
+
+COUNT_CASES_BY_STATUS = "SELECT status, COUNT(*) FROM fraud_cases GROUP BY status"
+
+DEFAULT_PAGE_SIZE = 500
+
+# (createdAt, id) of the last row on a page
+PageCursor = Tuple[str, int]
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable SQLite connections to one database file.
+
+    Nothing touches the disk until the first connection is borrowed; that
+    connection applies any pending schema migrations before it is handed out.
+    """
+
+    def __init__(self, db_path: Path, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        """Bring the database up to date the first time this process connects to it."""
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                migrate(conn)
+                self._schema_ready = True
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; blocks if all of them are in use."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get()
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pool = ConnectionPool(DB_PATH)
+
+# Queries run here when called from async code, so the agent's event loop never waits on disk
+_executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="fraud-db")
+
+
+async def _run_in_executor(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args))
+
+
+def _migration_1_create_fraud_cases(conn: sqlite3.Connection):
+    """Create the fraud_cases table and seed it with sample cases."""
     cursor = conn.cursor()
     
     # Create fraud_cases table
@@ -125,30 +294,71 @@ def init_database():
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, sample_cases)
         
-        conn.commit()
         logger.info(f"✅ Initialized database with {len(sample_cases)} sample fraud cases")
     else:
         logger.info(f"📊 Database already contains {count} fraud cases")
-    
-    conn.close()
+
+
+def _migration_2_username_lookup_index(conn: sqlite3.Connection):
+    """Index the case-insensitive pending-case lookup."""
+    conn.execute(CREATE_PENDING_LOOKUP_INDEX)
+
+
+def _migration_3_pagination_indexes(conn: sqlite3.Connection):
+    """Index newest-first paging and per-status counts."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fraud_cases_created ON fraud_cases (createdAt, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fraud_cases_status_created ON fraud_cases (status, createdAt, id)")
+
+
+# Applied in order; the database's PRAGMA user_version records how many have run
+MIGRATIONS = [
+    _migration_1_create_fraud_cases,
+    _migration_2_username_lookup_index,
+    _migration_3_pagination_indexes,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply any migrations this database has not seen yet.
+
+    Each migration runs in its own write transaction together with the bump of
+    user_version, so concurrent processes apply it exactly once and a failed
+    migration leaves the database at the previous version.
+
+    Returns:
+        The schema version after migrating
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    while version < SCHEMA_VERSION:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the write lock
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                migration = MIGRATIONS[version]
+                migration(conn)
+                version += 1
+                conn.execute(f"PRAGMA user_version = {version}")
+                logger.info(f"🗂️  Applied fraud database migration {version}: {migration.__doc__}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return version
+
+
+def init_database():
+    """Apply pending schema migrations now rather than on the first query."""
+    with _pool.connection():
+        pass
 
 
 def get_fraud_case_by_username(username: str) -> Optional[Dict[str, Any]]:
     """Retrieve a pending fraud case by username."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM fraud_cases 
-        WHERE LOWER(userName) = LOWER(?) 
-        AND status = 'pending_review'
-        ORDER BY createdAt DESC
-        LIMIT 1
-    """, (username,))
-    
-    row = cursor.fetchone()
-    conn.close()
+    with _pool.connection() as conn:
+        row = conn.execute(SELECT_PENDING_CASE_BY_USERNAME, (username,)).fetchone()
     
     if row:
         return dict(row)
@@ -157,20 +367,9 @@ def get_fraud_case_by_username(username: str) -> Optional[Dict[str, Any]]:
 
 def update_fraud_case_status(case_id: int, status: str, outcome_note: str):
     """Update the status of a fraud case."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        UPDATE fraud_cases 
-        SET status = ?, 
-            outcomeNote = ?,
-            updatedAt = ?
-        WHERE id = ?
-    """, (status, outcome_note, datetime.now().isoformat(), case_id))
-    
-    conn.commit()
-    affected = cursor.rowcount
-    conn.close()
+    with _pool.connection() as conn, conn:
+        cursor = conn.execute(UPDATE_CASE_STATUS, (status, outcome_note, datetime.now().isoformat(), case_id))
+        affected = cursor.rowcount
     
     logger.info(f"✅ Updated fraud case {case_id} to status: {status}")
     return affected > 0
@@ -178,16 +377,76 @@ def update_fraud_case_status(case_id: int, status: str, outcome_note: str):
 
 def get_all_fraud_cases():
     """Retrieve all fraud cases for debugging."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM fraud_cases ORDER BY createdAt DESC")
-    rows = cursor.fetchall()
-    conn.close()
+    with _pool.connection() as conn:
+        rows = conn.execute(SELECT_ALL_CASES).fetchall()
     
     return [dict(row) for row in rows]
 
 
-# Initialize database on module import
-init_database()
+def get_fraud_cases_page(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[PageCursor] = None,
+    status: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[PageCursor]]:
+    """
+    Fetch one page of fraud cases, newest first.
+
+    Args:
+        limit: Maximum number of cases on the page
+        cursor: Cursor returned with the previous page; None for the first page
+        status: Only return cases with this status
+
+    Returns:
+        The cases on this page, and the cursor for the next page (None when done)
+    """
+    # One extra row tells us whether another page follows, so the last page has no cursor
+    fetch = limit + 1
+    if status is None:
+        if cursor is None:
+            sql, params = SELECT_CASES_FIRST_PAGE, (fetch,)
+        else:
+            sql, params = SELECT_CASES_NEXT_PAGE, (*cursor, fetch)
+    else:
+        if cursor is None:
+            sql, params = SELECT_CASES_BY_STATUS_FIRST_PAGE, (status, fetch)
+        else:
+            sql, params = SELECT_CASES_BY_STATUS_NEXT_PAGE, (status, *cursor, fetch)
+
+    with _pool.connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    cases = [dict(row) for row in rows[:limit]]
+    next_cursor = (cases[-1]["createdAt"], cases[-1]["id"]) if len(rows) > limit else None
+    return cases, next_cursor
+
+
+def iter_fraud_cases(page_size: int = DEFAULT_PAGE_SIZE, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield every fraud case, newest first, holding at most one page in memory."""
+    cursor: Optional[PageCursor] = None
+    while True:
+        cases, cursor = get_fraud_cases_page(page_size, cursor, status)
+        yield from cases
+        if cursor is None:
+            return
+
+
+def count_fraud_cases_by_status() -> Dict[str, int]:
+    """Count fraud cases per status in SQL."""
+    with _pool.connection() as conn:
+        return dict(conn.execute(COUNT_CASES_BY_STATUS).fetchall())
+
+
+async def get_fraud_case_by_username_async(username: str) -> Optional[Dict[str, Any]]:
+    """Async version of get_fraud_case_by_username, run on the database executor."""
+    return await _run_in_executor(get_fraud_case_by_username, username)
+
+
+async def update_fraud_case_status_async(case_id: int, status: str, outcome_note: str) -> bool:
+    """Async version of update_fraud_case_status, run on the database executor."""
+    return await _run_in_executor(update_fraud_case_status, case_id, status, outcome_note)
+
+
+async def get_all_fraud_cases_async():
+    """Async version of get_all_fraud_cases, run on the database executor."""
+    return await _run_in_executor(get_all_fraud_cases)
+
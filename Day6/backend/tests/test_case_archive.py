@@ -0,0 +1,185 @@
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+from case_archive import INDEX_FILE, CaseArchive
+
+
+def _case(case_id, status="confirmed_safe"):
+    return {"case_id": case_id, "customer_name": f"Customer {case_id}", "status": status}
+
+
+def test_round_trip_returns_the_latest_record(tmp_path) -> None:
+    archive = CaseArchive(tmp_path, flush_interval=0.01)
+    for case_id in range(5):
+        archive.submit(_case(case_id))
+    archive.submit(_case(3, "confirmed_fraud"))
+    assert archive.flush(timeout=5)
+
+    assert archive.get(0) == _case(0)
+    assert archive.get("3") == _case(3, "confirmed_fraud")
+    assert archive.get(99) is None
+    archive.close()
+
+
+def test_segments_rotate(tmp_path) -> None:
+    archive = CaseArchive(tmp_path, batch_size=2, flush_interval=0.01, segment_max_records=3)
+    for case_id in range(7):
+        archive.submit(_case(case_id))
+    archive.close()
+
+    assert sorted(p.name for p in tmp_path.glob("segment-*")) == [
+        "segment-000001.jsonl.gz",
+        "segment-000002.jsonl.gz",
+        "segment-000003.jsonl.gz",
+    ]
+    assert [archive.get(case_id)["case_id"] for case_id in range(7)] == list(range(7))
+
+    # A reopened archive keeps filling the last segment
+    reopened = CaseArchive(tmp_path, flush_interval=0.01, segment_max_records=3)
+    for case_id in range(7, 10):
+        reopened.submit(_case(case_id))
+    reopened.close()
+    assert len(list(tmp_path.glob("segment-*"))) == 4
+    assert reopened._index["8"].segment == "segment-000003.jsonl.gz"
+    assert reopened.get(9) == _case(9)
+
+
+def test_index_is_rebuilt_from_segments(tmp_path) -> None:
+    archive = CaseArchive(tmp_path, batch_size=2, flush_interval=0.01, segment_max_records=3)
+    for case_id in range(5):
+        archive.submit(_case(case_id))
+    archive.submit(_case(1, "confirmed_fraud"))
+    archive.close()
+    written = (tmp_path / INDEX_FILE).read_text()
+
+    (tmp_path / INDEX_FILE).unlink()
+    rebuilt = CaseArchive(tmp_path)
+    assert rebuilt.get(1) == _case(1, "confirmed_fraud")
+    assert rebuilt.get(4) == _case(4)
+    assert (tmp_path / INDEX_FILE).read_text().splitlines()[-1] == written.splitlines()[-1]
+
+
+def test_incomplete_batch_is_dropped_on_reopen(tmp_path) -> None:
+    archive = CaseArchive(tmp_path, flush_interval=0.01)
+    archive.submit(_case(1))
+    archive.close()
+
+    # A crash mid-append leaves half a gzip member and no index entry for it
+    segment = tmp_path / "segment-000001.jsonl.gz"
+    size = segment.stat().st_size
+    with open(segment, "ab") as f:
+        f.write(segment.read_bytes()[: size // 2])
+
+    reopened = CaseArchive(tmp_path, flush_interval=0.01)
+    assert reopened.get(1) == _case(1)
+    assert segment.stat().st_size == size
+    reopened.submit(_case(2))
+    reopened.close()
+    assert reopened.get(2) == _case(2)
+
+
+def test_reads_during_writes_see_only_complete_batches(tmp_path) -> None:
+    archive = CaseArchive(tmp_path, batch_size=5, flush_interval=0.001)
+    errors = []
+    done = threading.Event()
+
+    def read_back():
+        while not done.is_set():
+            for case_id in range(200):
+                try:
+                    case = archive.get(case_id)
+                except Exception as e:
+                    errors.append(e)
+                    return
+                if case is not None and case["case_id"] != case_id:
+                    errors.append(case)
+
+    reader = threading.Thread(target=read_back)
+    reader.start()
+    for case_id in range(200):
+        archive.submit(_case(case_id))
+    archive.flush(timeout=10)
+    done.set()
+    reader.join()
+
+    assert errors == []
+    lines = (tmp_path / INDEX_FILE).read_text().splitlines()
+    assert {json.loads(line)["case_id"] for line in lines} == {str(i) for i in range(200)}
+    archive.close()
+
+
+def test_flush_and_submit_after_close(tmp_path) -> None:
+    archive = CaseArchive(tmp_path, flush_interval=0.01)
+    assert archive.flush(timeout=1)
+    archive.submit(_case(1))
+    archive.close()
+    archive.close()
+
+    assert archive.flush() is True
+    with pytest.raises(RuntimeError):
+        archive.submit(_case(2))
+    assert archive.get(1) == _case(1)
+
+
+def test_flush_raises_if_the_writer_died(tmp_path, monkeypatch) -> None:
+    archive = CaseArchive(tmp_path, flush_interval=0.01)
+    # A writer that exits without draining the queue
+    monkeypatch.setattr(archive, "_run", lambda: None)
+    archive.submit(_case(1))
+    archive._thread.join()
+    with pytest.raises(RuntimeError):
+        archive.flush()
+
+
+def test_submit_does_not_wait_for_a_batch_being_written(tmp_path, monkeypatch) -> None:
+    archive = CaseArchive(tmp_path, batch_size=1, flush_interval=0.01)
+    writing = threading.Event()
+    release = threading.Event()
+    compress = gzip.compress
+
+    def slow_compress(data):
+        writing.set()
+        release.wait(5)
+        return compress(data)
+
+    monkeypatch.setattr(gzip, "compress", slow_compress)
+    archive.submit(_case(1))
+    assert writing.wait(5)
+
+    started = time.monotonic()
+    archive.submit(_case(2))
+    assert archive.get(1) is None
+    assert time.monotonic() - started < 0.5
+    release.set()
+    archive.close()
+    assert archive.get(2) == _case(2)
+
+
+def test_failed_batch_is_reported_and_retried(tmp_path, monkeypatch) -> None:
+    archive = CaseArchive(tmp_path, flush_interval=0.01)
+    write_batch = archive._write_batch
+    disk_full = threading.Event()
+    disk_full.set()
+
+    def flaky_write_batch(batch):
+        if disk_full.is_set():
+            raise OSError("disk full")
+        write_batch(batch)
+
+    monkeypatch.setattr(archive, "_write_batch", flaky_write_batch)
+    archive.submit(_case(1))
+    with pytest.raises(RuntimeError) as excinfo:
+        archive.flush(timeout=5)
+    assert isinstance(excinfo.value.__cause__, OSError)
+    assert archive.get(1) is None
+
+    disk_full.clear()
+    archive.submit(_case(2))
+    assert archive.flush(timeout=5)
+    assert archive.get(1) == _case(1)
+    assert archive.get(2) == _case(2)
+    archive.close()
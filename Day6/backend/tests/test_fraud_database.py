@@ -0,0 +1,225 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+import fraud_database
+from fraud_database import SCHEMA_VERSION, ConnectionPool
+
+# fraud_cases as the pre-migration init_database() created it
+OLD_SCHEMA = """
+    CREATE TABLE fraud_cases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        userName TEXT NOT NULL,
+        securityIdentifier TEXT NOT NULL,
+        cardEnding TEXT NOT NULL,
+        status TEXT DEFAULT 'pending_review',
+        transactionName TEXT NOT NULL,
+        transactionAmount REAL NOT NULL,
+        transactionTime TEXT NOT NULL,
+        transactionCategory TEXT NOT NULL,
+        transactionSource TEXT NOT NULL,
+        transactionLocation TEXT NOT NULL,
+        securityQuestion TEXT NOT NULL,
+        securityAnswer TEXT NOT NULL,
+        outcomeNote TEXT,
+        createdAt TEXT DEFAULT CURRENT_TIMESTAMP,
+        updatedAt TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+INSERT_CASE = """
+    INSERT INTO fraud_cases (
+        userName, securityIdentifier, cardEnding, status,
+        transactionName, transactionAmount, transactionTime,
+        transactionCategory, transactionSource, transactionLocation,
+        securityQuestion, securityAnswer
+    ) VALUES (?, '1', '0000', 'pending_review', 'Shop', 10.0, '2025-11-27 00:00:00',
+              'retail', 'shop.example', 'Nowhere', 'Q?', 'A')
+"""
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    """A fresh database behind the module's pool."""
+    pool = ConnectionPool(tmp_path / "fraud_cases.db", size=2)
+    monkeypatch.setattr(fraud_database, "_pool", pool)
+    yield pool
+    pool.close()
+
+
+def _indexes(conn: sqlite3.Connection):
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'fraud_cases'")
+    return {name for (name,) in rows if not name.startswith("sqlite_")}
+
+
+def test_old_database_migrates_forward(tmp_path) -> None:
+    db_path = tmp_path / "fraud_cases.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(OLD_SCHEMA)
+        conn.execute(INSERT_CASE, ("Existing Customer",))
+    assert sqlite3.connect(db_path).execute("PRAGMA user_version").fetchone()[0] == 0
+
+    pool = ConnectionPool(db_path)
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION == 3
+        assert _indexes(conn) == {
+            "idx_fraud_cases_username_status_created",
+            "idx_fraud_cases_created",
+            "idx_fraud_cases_status_created",
+        }
+        # Existing cases are kept and no sample cases are seeded on top of them
+        names = [row["userName"] for row in conn.execute("SELECT userName FROM fraud_cases")]
+        assert names == ["Existing Customer"]
+    pool.close()
+
+
+def test_migration_resumes_from_recorded_version(tmp_path) -> None:
+    db_path = tmp_path / "fraud_cases.db"
+    with sqlite3.connect(db_path) as conn:
+        fraud_database._migration_1_create_fraud_cases(conn)
+        conn.execute("PRAGMA user_version = 1")
+
+    with sqlite3.connect(db_path) as conn:
+        assert fraud_database.migrate(conn) == SCHEMA_VERSION
+        assert "idx_fraud_cases_status_created" in _indexes(conn)
+        assert conn.execute("SELECT COUNT(*) FROM fraud_cases").fetchone()[0] == 5
+        # Already current: nothing to do
+        assert fraud_database.migrate(conn) == SCHEMA_VERSION
+
+
+def test_pooled_connections_apply_pragmas(pool) -> None:
+    with pool.connection() as first, pool.connection() as second:
+        assert first is not second
+        for conn in (first, second):
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == fraud_database.BUSY_TIMEOUT_MS
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8000
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 0
+
+    # Returned connections are reused, not reopened
+    with pool.connection() as again:
+        assert again in (first, second)
+    assert pool._created == 2
+
+
+def test_pool_rolls_back_unfinished_transactions(pool) -> None:
+    with pool.connection() as conn:
+        conn.execute(INSERT_CASE, ("Never Committed",))
+        assert conn.in_transaction
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert fraud_database.get_fraud_case_by_username("never committed") is None
+
+
+async def test_concurrent_async_calls_share_the_pool(pool) -> None:
+    case = await fraud_database.get_fraud_case_by_username_async("john smith")
+    assert case is not None
+
+    calls = []
+    for i in range(40):
+        calls.append(fraud_database.get_fraud_case_by_username_async("JOHN SMITH"))
+        calls.append(fraud_database.update_fraud_case_status_async(case["id"], "pending_review", f"note {i}"))
+        calls.append(fraud_database.get_all_fraud_cases_async())
+    results = await asyncio.wait_for(asyncio.gather(*calls), timeout=30)
+
+    assert all(result is True for result in results[1::3])
+    assert all(len(result) == 5 for result in results[2::3])
+    assert pool._created <= pool.size
+    assert pool._idle.qsize() == pool._created
+
+
+def _insert(conn: sqlite3.Connection, name: str, created_at: str, status: str = "pending_review") -> int:
+    cursor = conn.execute(INSERT_CASE, (name,))
+    conn.execute("UPDATE fraud_cases SET createdAt = ?, status = ? WHERE id = ?", (created_at, status, cursor.lastrowid))
+    return cursor.lastrowid
+
+
+@pytest.fixture
+def paged_cases(pool):
+    """Eight cases, three of them sharing one createdAt, and no seeded samples."""
+    with pool.connection() as conn, conn:
+        conn.execute("DELETE FROM fraud_cases")
+        ids = [_insert(conn, f"Customer {i}", f"2025-11-2{i} 00:00:00") for i in range(5)]
+        ids += [_insert(conn, f"Tied {i}", "2025-11-23 00:00:00", "confirmed_fraud") for i in range(3)]
+    return ids
+
+
+def _all_pages(limit, status=None):
+    pages, cursor = [], None
+    while True:
+        cases, cursor = fraud_database.get_fraud_cases_page(limit, cursor, status)
+        pages.append([case["id"] for case in cases])
+        if cursor is None:
+            return pages
+
+
+def test_pages_break_created_at_ties_by_id(paged_cases) -> None:
+    expected = [case["id"] for case in sorted(
+        fraud_database.get_all_fraud_cases(), key=lambda case: (case["createdAt"], case["id"]), reverse=True
+    )]
+    for limit in (1, 2, 3, 7):
+        pages = _all_pages(limit)
+        assert [case_id for page in pages for case_id in page] == expected
+        assert all(len(page) == limit for page in pages[:-1])
+
+    # The tied rows straddle the first page boundary without repeats or gaps
+    tied = paged_cases[5:]
+    assert _all_pages(2, "confirmed_fraud") == [tied[::-1][:2], tied[::-1][2:]]
+    assert [case["id"] for case in fraud_database.iter_fraud_cases(2)] == expected
+
+
+def test_last_page_has_no_cursor(paged_cases) -> None:
+    # A page that ends exactly on the last row doesn't send the caller back for an empty one
+    assert [len(page) for page in _all_pages(4)] == [4, 4]
+    assert [len(page) for page in _all_pages(8)] == [8]
+    cases, cursor = fraud_database.get_fraud_cases_page(8, status="confirmed_fraud")
+    assert len(cases) == 3 and cursor is None
+
+
+def test_empty_table(pool) -> None:
+    with pool.connection() as conn, conn:
+        conn.execute("DELETE FROM fraud_cases")
+    assert fraud_database.get_fraud_cases_page(10) == ([], None)
+    assert list(fraud_database.iter_fraud_cases(10)) == []
+
+
+def test_cursor_survives_inserts_and_deletes(pool, paged_cases) -> None:
+    first, cursor = fraud_database.get_fraud_cases_page(3)
+    seen = [case["id"] for case in first]
+
+    with pool.connection() as conn, conn:
+        # Newer than the cursor: belongs before the pages already read, so not repeated
+        _insert(conn, "Late Arrival", "2025-12-01 00:00:00")
+        # Older than the cursor: shows up on a later page
+        older = _insert(conn, "Backfilled", "2025-11-19 00:00:00")
+        # The cursor row itself and a row on the next page go away
+        conn.execute("DELETE FROM fraud_cases WHERE id IN (?, ?)", (cursor[1], paged_cases[2]))
+
+    rest = []
+    while cursor is not None:
+        cases, cursor = fraud_database.get_fraud_cases_page(3, cursor)
+        rest += [case["id"] for case in cases]
+
+    assert not set(seen) & set(rest)
+    assert paged_cases[2] not in rest
+    assert rest[-1] == older
+    # One backfilled, one deleted from the unread pages
+    assert len(seen) + len(rest) == len(paged_cases)
+
+
+def test_counts_by_status_match_the_rows(pool, paged_cases) -> None:
+    fraud_database.update_fraud_case_status(paged_cases[0], "confirmed_safe", "Customer recognised it")
+    counts = fraud_database.count_fraud_cases_by_status()
+    assert counts == {"pending_review": 4, "confirmed_fraud": 3, "confirmed_safe": 1}
+
+    expected = {}
+    for case in fraud_database.iter_fraud_cases(3):
+        expected[case["status"]] = expected.get(case["status"], 0) + 1
+    assert counts == expected
+
+    with pool.connection() as conn, conn:
+        conn.execute("DELETE FROM fraud_cases")
+    assert fraud_database.count_fraud_cases_by_status() == {}
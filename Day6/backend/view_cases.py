@@ -5,7 +5,7 @@ from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from fraud_database import get_all_fraud_cases
+from fraud_database import count_fraud_cases_by_status, iter_fraud_cases
 
 
 def format_status(status):
@@ -20,25 +20,25 @@ def format_status(status):
 
 
 def view_cases():
-    """Display all fraud cases in a nice format."""
-    cases = get_all_fraud_cases()
+    """Display all fraud cases in a nice format, streaming them page by page."""
+    counts = count_fraud_cases_by_status()
     
     print("\n" + "=" * 80)
     print("🏦 SECUREBANK FRAUD CASES DASHBOARD")
     print("=" * 80)
-    print(f"\nTotal Cases: {len(cases)}")
+    print(f"\nTotal Cases: {sum(counts.values())}")
     
     # Count by status
-    pending = sum(1 for c in cases if c['status'] == 'pending_review')
-    safe = sum(1 for c in cases if c['status'] == 'confirmed_safe')
-    fraud = sum(1 for c in cases if c['status'] == 'confirmed_fraud')
+    pending = counts.get('pending_review', 0)
+    safe = counts.get('confirmed_safe', 0)
+    fraud = counts.get('confirmed_fraud', 0)
     
     print(f"  ⏳ Pending: {pending}")
     print(f"  ✅ Safe: {safe}")
     print(f"  🚨 Fraud: {fraud}")
     print("\n" + "-" * 80)
     
-    for i, case in enumerate(cases, 1):
+    for case in iter_fraud_cases():
         print(f"\n📋 Case #{case['id']} - {format_status(case['status'])}")
         print("-" * 80)
         print(f"👤 Customer:        {case['userName']}")
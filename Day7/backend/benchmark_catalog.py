@@ -0,0 +1,98 @@
+"""Micro-benchmark: CatalogIndex lookups vs. the old linear catalog scan."""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from catalog_index import CatalogIndex
+
+BRANDS = ["Amul", "FreshBake", "FarmFresh", "India Gate", "Fortune", "Local Farm", "Nestle", "Britannia"]
+ADJECTIVES = ["Fresh", "Organic", "Salted", "Classic", "Whole", "Roasted", "Spicy", "Frozen", "Premium", "Lite"]
+NOUNS = ["Bread", "Milk", "Eggs", "Butter", "Rice", "Oil", "Onions", "Tomatoes", "Pasta", "Cheese",
+         "Biscuits", "Chips", "Noodles", "Cashews", "Juice", "Yogurt", "Paneer", "Coffee", "Tea", "Sugar"]
+TAGS = ["vegetarian", "vegan", "dairy", "snack", "breakfast", "cooking", "staple", "protein", "gluten-free"]
+
+
+def build_catalog(size: int, seed: int = 7) -> list:
+    """Generate a synthetic catalog shaped like catalog.json."""
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(size):
+        noun = rng.choice(NOUNS)
+        name = f"{rng.choice(ADJECTIVES)} {noun} {i}"
+        catalog.append({
+            "id": f"sku_{i}",
+            "name": name,
+            "category": "groceries",
+            "price": float(rng.randint(10, 500)),
+            "brand": rng.choice(BRANDS),
+            "unit": "1 pack",
+            "tags": rng.sample(TAGS, 2),
+        })
+    return catalog
+
+
+def scan_by_id(catalog: list, item_id: str):
+    for item in catalog:
+        if item["id"] == item_id:
+            return item
+    return None
+
+
+def scan_by_name(catalog: list, name: str):
+    name_lower = name.lower()
+    for item in catalog:
+        if name_lower in item["name"].lower():
+            return item
+    return None
+
+
+def time_lookups(fn, queries: list) -> list:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1] if len(timings) >= 100 else timings[-1]
+    print(f"{label:<28} mean {statistics.mean(timings):8.4f} ms   p99 {p99:8.4f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000, help="number of synthetic SKUs")
+    parser.add_argument("--queries", type=int, default=500, help="lookups per benchmark")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    catalog = build_catalog(args.size)
+
+    start = time.perf_counter()
+    index = CatalogIndex(catalog)
+    print(f"\n📦 {args.size:,} SKUs, index built in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    ids = [f"sku_{rng.randrange(args.size)}" for _ in range(args.queries)]
+    # Mix of exact names, partial names and spoken-style plurals/phrases
+    names = []
+    for _ in range(args.queries):
+        item = catalog[rng.randrange(args.size)]
+        words = item["name"].split()
+        names.append(rng.choice([item["name"], " ".join(words[:2]), words[1].lower(), f"{words[0]} {words[1]}".lower()]))
+
+    report("scan   find_item_by_id", time_lookups(lambda q: scan_by_id(catalog, q), ids))
+    report("index  find_item_by_id", time_lookups(index.get, ids))
+    report("scan   find_item_by_name", time_lookups(lambda q: scan_by_name(catalog, q), names))
+    report("index  find_item_by_name", time_lookups(index.find, names))
+    print()
+
+
+if __name__ == "__main__":
+    main()
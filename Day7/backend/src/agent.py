@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from typing import Optional
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -20,19 +22,22 @@ from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
 try:
     from .cart_manager import CartManager
+    from .cart_store import CartStore, session_key
 except ImportError:
     from cart_manager import CartManager
+    from cart_store import CartStore, session_key
 
 logger = logging.getLogger("agent")
 
 load_dotenv(".env")
 
-# Global cart manager instance
-cart_manager = CartManager()
+# Per-session carts; the catalog and recipes are loaded once and shared
+cart_store = CartStore()
 
 
 class Assistant(Agent):
-    def __init__(self) -> None:
+    def __init__(self, cart: Optional[CartManager] = None) -> None:
+        self.cart = cart if cart is not None else cart_store.new_cart()
         super().__init__(
             instructions="""You are a friendly food and grocery ordering assistant for QuickBasket. You help users:
             - Order groceries, snacks, and simple prepared foods
@@ -65,11 +70,11 @@ class Assistant(Agent):
         logger.info(f"🛒 Adding to cart: {quantity}x {item_name}")
         
         # Find item by name
-        item = cart_manager.find_item_by_name(item_name)
+        item = self.cart.find_item_by_name(item_name)
         if not item:
             return f"Sorry, I couldn't find {item_name} in our catalog. Could you try a different name?"
         
-        result = cart_manager.add_to_cart(item["id"], quantity)
+        result = self.cart.add_to_cart(item["id"], quantity)
         return result
 
     @function_tool
@@ -81,11 +86,11 @@ class Assistant(Agent):
         """
         logger.info(f"🗑️ Removing from cart: {item_name}")
         
-        item = cart_manager.find_item_by_name(item_name)
+        item = self.cart.find_item_by_name(item_name, match_all=True)
         if not item:
             return f"I couldn't find {item_name} in your cart."
         
-        result = cart_manager.remove_from_cart(item["id"])
+        result = self.cart.remove_from_cart(item["id"])
         return result
 
     @function_tool
@@ -98,11 +103,11 @@ class Assistant(Agent):
         """
         logger.info(f"📝 Updating cart: {item_name} to {quantity}")
         
-        item = cart_manager.find_item_by_name(item_name)
+        item = self.cart.find_item_by_name(item_name, match_all=True)
         if not item:
             return f"I couldn't find {item_name} in your cart."
         
-        result = cart_manager.update_quantity(item["id"], quantity)
+        result = self.cart.update_quantity(item["id"], quantity)
         return result
 
     @function_tool
@@ -110,7 +115,7 @@ class Assistant(Agent):
         """Get the current cart contents and total price."""
         logger.info("📋 Listing cart contents")
         
-        cart_data = cart_manager.list_cart()
+        cart_data = self.cart.list_cart()
         
         if not cart_data["items"]:
             return "Your cart is empty."
@@ -134,7 +139,7 @@ class Assistant(Agent):
         """
         logger.info(f"📖 Adding ingredients for: {dish_name} (servings: {servings})")
         
-        result = cart_manager.add_ingredients_for_dish(dish_name, servings)
+        result = self.cart.add_ingredients_for_dish(dish_name, servings)
         return result
 
     @function_tool
@@ -148,14 +153,11 @@ class Assistant(Agent):
         """
         logger.info(f"💾 Placing order for: {customer_name}")
         
-        # Get cart summary first
-        cart_data = cart_manager.list_cart()
-        
-        if not cart_data["items"]:
+        if not self.cart.item_count:
             return "Your cart is empty. Please add some items before placing an order."
         
         # Save order
-        order = cart_manager.save_order(customer_name, customer_address, delivery_instructions)
+        order = self.cart.save_order(customer_name, customer_address, delivery_instructions)
         
         if "error" in order:
             return f"Sorry, there was an error placing your order: {order['error']}"
@@ -166,12 +168,14 @@ class Assistant(Agent):
     async def clear_cart(self, context: RunContext):
         """Clear all items from the cart."""
         logger.info("🗑️ Clearing cart")
-        result = cart_manager.clear_cart()
+        result = self.cart.clear_cart()
         return result
 
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    # Load the catalog, recipes and their indexes here rather than on the event loop of the first session
+    proc.userdata["cart_prototype"] = cart_store.prototype
 
 
 async def entrypoint(ctx: JobContext):
@@ -233,6 +237,27 @@ async def entrypoint(ctx: JobContext):
 
     ctx.add_shutdown_callback(log_usage)
 
+    # Make sure batched order journal writes reach disk before the job exits, and
+    # compact the journal here rather than during a checkout
+    async def sync_orders():
+        journal = cart_store.prototype.order_journal
+        journal.sync()
+        await asyncio.to_thread(journal.compact_if_due)
+
+    ctx.add_shutdown_callback(sync_orders)
+
+    # One cart per shopper: connect first so the cart can be keyed by who joined
+    await ctx.connect()
+    participant = await ctx.wait_for_participant()
+    cart_key = session_key(ctx.room.name, participant.identity)
+    cart = cart_store.get(cart_key)
+
+    # Drop the cart when the session ends instead of leaving it for the idle sweep
+    async def release_cart():
+        cart_store.release(cart_key)
+
+    ctx.add_shutdown_callback(release_cart)
+
     # # Add a virtual avatar to the session, if desired
     # # For other providers, see https://docs.livekit.io/agents/models/avatar/
     # avatar = hedra.AvatarSession(
@@ -243,17 +268,16 @@ async def entrypoint(ctx: JobContext):
 
     # Start the session, which initializes the voice pipeline and warms up the models
     await session.start(
-        agent=Assistant(),
+        agent=Assistant(cart=cart),
         room=ctx.room,
         room_input_options=RoomInputOptions(
+            # Listen to the shopper who owns this cart
+            participant_identity=participant.identity,
             # For telephony applications, use `BVCTelephony` for best results
             noise_cancellation=noise_cancellation.BVC(),
         ),
     )
 
-    # Join the room and connect to the user
-    await ctx.connect()
-
 
 if __name__ == "__main__":
     cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
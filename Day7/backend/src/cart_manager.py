@@ -9,24 +9,92 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    from .catalog_index import CatalogIndex
+    from .order_journal import OrderJournal
+    from .recipe_index import RecipeIndex
+except ImportError:
+    from catalog_index import CatalogIndex
+    from order_journal import OrderJournal
+    from recipe_index import RecipeIndex
+
 logger = logging.getLogger("cart_manager")
 
 # File paths
 BASE_DIR = Path(__file__).parent.parent
 CATALOG_FILE = BASE_DIR / "catalog.json"
 RECIPES_FILE = BASE_DIR / "recipes.json"
-ORDERS_FILE = BASE_DIR / "orders.json"
+
+
+class CartLine:
+    """One product in a cart. Serialized to the order/cart dict shape only on demand."""
+
+    __slots__ = ("item_id", "name", "notes", "quantity", "unit_price")
+
+    def __init__(self, item_id: str, name: str, quantity: int, unit_price: float, notes: str = ""):
+        self.item_id = item_id
+        self.name = name
+        self.quantity = quantity
+        self.unit_price = unit_price
+        self.notes = notes
+
+    @property
+    def line_total(self) -> float:
+        return self.quantity * self.unit_price
+
+    def to_dict(self) -> Dict:
+        return {
+            "item_id": self.item_id,
+            "name": self.name,
+            "quantity": self.quantity,
+            "unit_price": self.unit_price,
+            "line_total": self.line_total,
+            "notes": self.notes,
+        }
 
 
 class CartManager:
     """Manages shopping cart operations and order processing."""
 
-    def __init__(self):
-        self.cart: Dict[str, List[Dict]] = {"items": []}
-        self.catalog: List[Dict] = self._load_catalog()
-        self.recipes: Dict[str, List[str]] = self._load_recipes()
+    def __init__(
+        self,
+        catalog: Optional[List[Dict]] = None,
+        recipes: Optional[Dict[str, List[str]]] = None,
+        catalog_index: Optional[CatalogIndex] = None,
+        order_journal: Optional[OrderJournal] = None,
+        recipe_index: Optional[RecipeIndex] = None,
+    ):
+        """
+        Initialize a cart.
+
+        Args:
+            catalog: Already loaded catalog to share; loaded from catalog.json if omitted
+            recipes: Already loaded recipes to share; loaded from recipes.json if omitted
+            catalog_index: Already built index over catalog; built here if omitted
+            order_journal: Journal to record orders in; a new one on the default files if omitted
+            recipe_index: Already built index over recipes; built here if omitted
+        """
+        # Lines keyed by item_id, in the order they were added; the total is kept
+        # up to date on every change so reading it never re-sums the cart
+        self.lines: Dict[str, CartLine] = {}
+        self._total: float = 0.0
+        self.catalog: List[Dict] = catalog if catalog is not None else self._load_catalog()
+        self.recipes: Dict[str, List[str]] = recipes if recipes is not None else self._load_recipes()
+        self.catalog_index: CatalogIndex = catalog_index if catalog_index is not None else CatalogIndex(self.catalog)
+        self.order_journal: OrderJournal = order_journal if order_journal is not None else OrderJournal()
+        self.recipe_index: RecipeIndex = recipe_index if recipe_index is not None else RecipeIndex(self.recipes)
         logger.info("🛒 CartManager initialized")
 
+    def new_session(self) -> "CartManager":
+        """Create an empty cart that shares this manager's catalog, recipes, indexes and journal."""
+        return CartManager(
+            catalog=self.catalog,
+            recipes=self.recipes,
+            catalog_index=self.catalog_index,
+            order_journal=self.order_journal,
+            recipe_index=self.recipe_index,
+        )
+
     def _load_catalog(self) -> List[Dict]:
         """Load product catalog from JSON."""
         try:
@@ -51,18 +119,16 @@ class CartManager:
 
     def find_item_by_id(self, item_id: str) -> Optional[Dict]:
         """Find item in catalog by ID."""
-        for item in self.catalog:
-            if item["id"] == item_id:
-                return item
-        return None
-
-    def find_item_by_name(self, name: str) -> Optional[Dict]:
-        """Find item in catalog by name (case-insensitive partial match)."""
-        name_lower = name.lower()
-        for item in self.catalog:
-            if name_lower in item["name"].lower():
-                return item
-        return None
+        return self.catalog_index.get(item_id)
+
+    def find_item_by_name(self, name: str, match_all: bool = False) -> Optional[Dict]:
+        """
+        Find the best matching catalog item for a spoken name (see CatalogIndex.search).
+
+        Pass match_all=True when acting on an item the user already has, so a
+        name sharing only one word with an item never picks it.
+        """
+        return self.catalog_index.find(name, match_all=match_all)
 
     def add_to_cart(self, item_id: str, quantity: int = 1, notes: Optional[str] = None) -> str:
         """
@@ -82,23 +148,16 @@ class CartManager:
             return f"Sorry, I couldn't find that item in our catalog."
 
         # Check if item already in cart
-        for cart_item in self.cart["items"]:
-            if cart_item["item_id"] == item_id:
-                cart_item["quantity"] += quantity
-                cart_item["line_total"] = cart_item["quantity"] * cart_item["unit_price"]
-                logger.info(f"✅ Updated {item['name']} quantity to {cart_item['quantity']}")
-                return f"Updated {item['name']} to {cart_item['quantity']} units in your cart."
+        line = self.lines.get(item_id)
+        if line:
+            line.quantity += quantity
+            self._total += quantity * line.unit_price
+            logger.info(f"✅ Updated {item['name']} quantity to {line.quantity}")
+            return f"Updated {item['name']} to {line.quantity} units in your cart."
 
         # Add new item
-        cart_item = {
-            "item_id": item_id,
-            "name": item["name"],
-            "quantity": quantity,
-            "unit_price": item["price"],
-            "line_total": quantity * item["price"],
-            "notes": notes or ""
-        }
-        self.cart["items"].append(cart_item)
+        self.lines[item_id] = CartLine(item_id, item["name"], quantity, item["price"], notes or "")
+        self._total += quantity * item["price"]
         logger.info(f"✅ Added {quantity}x {item['name']} to cart")
         return f"Added {quantity} {item['name']} to your cart."
 
@@ -112,12 +171,12 @@ class CartManager:
         Returns:
             Confirmation message
         """
-        for i, cart_item in enumerate(self.cart["items"]):
-            if cart_item["item_id"] == item_id:
-                removed_item = self.cart["items"].pop(i)
-                logger.info(f"🗑️ Removed {removed_item['name']} from cart")
-                return f"Removed {removed_item['name']} from your cart."
-        
+        removed = self.lines.pop(item_id, None)
+        if removed:
+            self._total = self._total - removed.line_total if self.lines else 0.0
+            logger.info(f"🗑️ Removed {removed.name} from cart")
+            return f"Removed {removed.name} from your cart."
+
         logger.warning(f"⚠️ Item not in cart: {item_id}")
         return "That item is not in your cart."
 
@@ -135,12 +194,12 @@ class CartManager:
         if quantity <= 0:
             return self.remove_from_cart(item_id)
 
-        for cart_item in self.cart["items"]:
-            if cart_item["item_id"] == item_id:
-                cart_item["quantity"] = quantity
-                cart_item["line_total"] = quantity * cart_item["unit_price"]
-                logger.info(f"✅ Updated {cart_item['name']} quantity to {quantity}")
-                return f"Updated {cart_item['name']} to {quantity} units."
+        line = self.lines.get(item_id)
+        if line:
+            self._total += (quantity - line.quantity) * line.unit_price
+            line.quantity = quantity
+            logger.info(f"✅ Updated {line.name} quantity to {quantity}")
+            return f"Updated {line.name} to {quantity} units."
 
         logger.warning(f"⚠️ Item not in cart: {item_id}")
         return "That item is not in your cart."
@@ -152,34 +211,36 @@ class CartManager:
         Returns:
             Dict with items and total
         """
-        total = sum(item["line_total"] for item in self.cart["items"])
         return {
-            "items": self.cart["items"],
-            "total": total,
-            "item_count": len(self.cart["items"])
+            "items": [line.to_dict() for line in self.lines.values()],
+            "total": self.total,
+            "item_count": self.item_count
         }
 
+    @property
+    def total(self) -> float:
+        """Cart total, maintained incrementally."""
+        return round(self._total, 2)
+
+    @property
+    def item_count(self) -> int:
+        """Number of distinct products in the cart."""
+        return len(self.lines)
+
     def add_ingredients_for_dish(self, dish_name: str, servings: int = 1) -> str:
         """
         Add ingredients for a recipe to cart.
         
         Args:
-            dish_name: Name of the dish (case-insensitive)
+            dish_name: Spoken name of the dish, matched fuzzily (see RecipeIndex)
             servings: Number of servings (multiplies quantities)
             
         Returns:
             Confirmation message
         """
-        dish_lower = dish_name.lower()
-        
-        # Find matching recipe
-        recipe_items = None
-        matched_dish = None
-        for recipe_key, items in self.recipes.items():
-            if dish_lower in recipe_key.lower() or recipe_key.lower() in dish_lower:
-                recipe_items = items
-                matched_dish = recipe_key
-                break
+        # Find the closest recipe
+        matched_dish = self.recipe_index.resolve(dish_name)
+        recipe_items = self.recipes.get(matched_dish) if matched_dish else None
 
         if not recipe_items:
             logger.warning(f"⚠️ Recipe not found: {dish_name}")
@@ -200,7 +261,7 @@ class CartManager:
 
     def save_order(self, customer_name: str, customer_address: str = "", delivery_instructions: str = "") -> Dict:
         """
-        Save current cart as an order to orders.json.
+        Save current cart as an order in the order journal.
         
         Args:
             customer_name: Customer's name
@@ -210,7 +271,7 @@ class CartManager:
         Returns:
             Order object
         """
-        if not self.cart["items"]:
+        if not self.lines:
             logger.warning("⚠️ Attempted to save empty cart")
             return {"error": "Cart is empty"}
 
@@ -225,36 +286,33 @@ class CartManager:
             "customer_name": customer_name,
             "customer_address": customer_address,
             "delivery_instructions": delivery_instructions,
-            "items": self.cart["items"].copy(),
-            "order_total": sum(item["line_total"] for item in self.cart["items"])
+            "items": [line.to_dict() for line in self.lines.values()],
+            "order_total": self.total
         }
 
-        # Load existing orders
+        # Append to the order journal
         try:
-            with open(ORDERS_FILE, "r") as f:
-                orders = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            orders = []
-
-        # Append new order
-        orders.append(order)
-
-        # Save to file
-        try:
-            with open(ORDERS_FILE, "w") as f:
-                json.dump(orders, f, indent=2)
-            logger.info(f"💾 Saved order {order_id} for {customer_name}")
+            order = self.order_journal.append(order)
+            logger.info(f"💾 Saved order {order['order_id']} for {customer_name}")
         except Exception as e:
             logger.error(f"❌ Failed to save order: {e}")
             return {"error": "Failed to save order"}
 
         # Clear cart
-        self.cart = {"items": []}
+        self._reset()
 
         return order
 
+    def _reset(self) -> None:
+        self.lines = {}
+        self._total = 0.0
+
+    def get_order(self, order_id: str) -> Optional[Dict]:
+        """Look up a placed order by its ID."""
+        return self.order_journal.get(order_id)
+
     def clear_cart(self) -> str:
         """Clear all items from cart."""
-        self.cart = {"items": []}
+        self._reset()
         logger.info("🗑️ Cart cleared")
         return "Your cart has been cleared."
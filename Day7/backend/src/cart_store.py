@@ -0,0 +1,142 @@
+"""
+Session-keyed cart storage for QuickBasket.
+Keeps one CartManager per room/participant so concurrent shoppers never share a cart.
+"""
+
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+try:
+    from .cart_manager import CartManager
+except ImportError:
+    from cart_manager import CartManager
+
+logger = logging.getLogger("cart_store")
+
+DEFAULT_STRIPES = 16
+DEFAULT_TTL_SECONDS = 30 * 60
+DEFAULT_MAX_SESSIONS = 1024
+
+
+def session_key(room_name: str, participant_identity: Optional[str] = None) -> str:
+    """Build the cart key for a room, optionally scoped to a single participant."""
+    if participant_identity:
+        return f"{room_name}:{participant_identity}"
+    return room_name
+
+
+class _Shard:
+    """One stripe of the store: its own lock and its own LRU-ordered carts."""
+
+    __slots__ = ("carts", "lock")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (cart, last_access); oldest access first
+        self.carts: "OrderedDict[str, Tuple[CartManager, float]]" = OrderedDict()
+
+
+class CartStore:
+    """
+    Sharded in-memory store of per-session carts.
+
+    Keys are hashed onto a fixed number of stripes, each guarded by its own lock,
+    so sessions in different stripes never contend. Carts idle for longer than
+    ``ttl_seconds`` are evicted, and each stripe holds at most
+    ``max_sessions / stripes`` carts, dropping the least recently used first.
+    """
+
+    def __init__(
+        self,
+        stripes: int = DEFAULT_STRIPES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        prototype: Optional[CartManager] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._shards: List[_Shard] = [_Shard() for _ in range(stripes)]
+        self._per_shard_limit = max(1, max_sessions // stripes)
+        self._clock = clock
+        self._prototype = prototype
+        self._prototype_lock = threading.Lock()
+
+    @property
+    def prototype(self) -> CartManager:
+        """Shared CartManager whose catalog and recipes every session cart reuses."""
+        if self._prototype is None:
+            with self._prototype_lock:
+                if self._prototype is None:
+                    self._prototype = CartManager()
+        return self._prototype
+
+    def _shard_for(self, key: str) -> _Shard:
+        return self._shards[zlib.crc32(key.encode("utf-8")) % len(self._shards)]
+
+    def _evict_expired(self, shard: _Shard, now: float) -> None:
+        """Drop idle carts from the front of a shard. Caller holds the shard lock."""
+        while shard.carts:
+            key, (_, last_access) = next(iter(shard.carts.items()))
+            if now - last_access < self.ttl_seconds:
+                break
+            shard.carts.popitem(last=False)
+            logger.info(f"⌛ Evicted idle cart: {key}")
+
+    def new_cart(self) -> CartManager:
+        """Create an unregistered cart sharing the store's catalog and recipes."""
+        return self.prototype.new_session()
+
+    def get(self, key: str) -> CartManager:
+        """
+        Get the cart for a session, creating it on first use.
+
+        Args:
+            key: Session key, usually from session_key()
+
+        Returns:
+            The CartManager owned by that session
+        """
+        shard = self._shard_for(key)
+        now = self._clock()
+        with shard.lock:
+            self._evict_expired(shard, now)
+            entry = shard.carts.get(key)
+            if entry is not None:
+                cart = entry[0]
+                shard.carts.move_to_end(key)
+            else:
+                cart = self.new_cart()
+                while len(shard.carts) >= self._per_shard_limit:
+                    evicted_key, _ = shard.carts.popitem(last=False)
+                    logger.warning(f"⚠️ Cart store full, evicted cart: {evicted_key}")
+                logger.info(f"🛒 Created cart for session: {key}")
+            shard.carts[key] = (cart, now)
+            return cart
+
+    def release(self, key: str) -> bool:
+        """Remove a session's cart. Returns True if a cart was removed."""
+        shard = self._shard_for(key)
+        with shard.lock:
+            return shard.carts.pop(key, None) is not None
+
+    def evict_expired(self) -> None:
+        """Sweep every shard for idle carts."""
+        now = self._clock()
+        for shard in self._shards:
+            with shard.lock:
+                self._evict_expired(shard, now)
+
+    def __contains__(self, key: str) -> bool:
+        shard = self._shard_for(key)
+        with shard.lock:
+            return key in shard.carts
+
+    def __len__(self) -> int:
+        return sum(len(shard.carts) for shard in self._shards)
@@ -0,0 +1,204 @@
+"""
+Catalog index for QuickBasket.
+Built once when the catalog loads; answers id lookups and ranked name searches
+without scanning the catalog.
+"""
+
+import bisect
+import functools
+import heapq
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# How much a matching token counts, by the field it was found in
+NAME_WEIGHT = 30
+TAG_WEIGHT = 20
+BRAND_WEIGHT = 10
+
+# Prefix matches ("mar" -> "marie") count a little less than exact tokens;
+# plural endings ("tomato" -> "tomatoes") count in full
+PREFIX_PERCENT = 80
+PLURAL_SUFFIXES = ("s", "es")
+MIN_PREFIX_LEN = 3
+MAX_PREFIX_EXPANSIONS = 32
+TOKEN_CACHE_SIZE = 4096
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _variants(token: str) -> List[str]:
+    """The token plus naive singular forms, so "onions" also finds "onion"."""
+    variants = [token]
+    if len(token) > 4 and token.endswith("es"):
+        variants.append(token[:-2])
+    if len(token) > 3 and token.endswith("s"):
+        variants.append(token[:-1])
+    return variants
+
+
+class _TokenMatches:
+    """Items matching one query token: weights by position, and best-first order."""
+
+    __slots__ = ("best", "ranked", "weights")
+
+    def __init__(self, weights: Dict[int, int]):
+        self.weights = weights
+        # (-weight, position) so iteration visits the strongest matches first
+        self.ranked: List[Tuple[int, int]] = sorted((-w, pos) for pos, w in weights.items())
+        self.best = -self.ranked[0][0] if self.ranked else 0
+
+
+class CatalogIndex:
+    """
+    In-memory index over catalog items.
+
+    Keeps an id -> item dict and an inverted index from tokens in each item's
+    name, tags and brand to the items containing them. Name searches score items
+    by which fields their tokens matched in, prefer items matching every spoken
+    word, and break ties by catalog order so results are deterministic.
+    """
+
+    def __init__(self, catalog: Iterable[Dict]):
+        self.items: List[Dict] = list(catalog)
+        self._by_id: Dict[str, Dict] = {}
+        # token -> {item position: best field weight}
+        postings: Dict[str, Dict[int, int]] = {}
+
+        for pos, item in enumerate(self.items):
+            self._by_id.setdefault(item["id"], item)
+            self._add_tokens(postings, pos, tokenize(item.get("name", "")), NAME_WEIGHT)
+            for tag in item.get("tags", []):
+                self._add_tokens(postings, pos, tokenize(tag), TAG_WEIGHT)
+            self._add_tokens(postings, pos, tokenize(item.get("brand", "")), BRAND_WEIGHT)
+
+        self._postings: Dict[str, _TokenMatches] = {
+            token: _TokenMatches(weights) for token, weights in postings.items()
+        }
+        self._vocabulary: List[str] = sorted(self._postings)
+        self._matches_for = functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)(self._expand_token)
+
+    @staticmethod
+    def _add_tokens(postings: Dict[str, Dict[int, int]], pos: int, tokens: List[str], weight: int) -> None:
+        for token in tokens:
+            weights = postings.setdefault(token, {})
+            if weights.get(pos, 0) < weight:
+                weights[pos] = weight
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        """Look up an item by its catalog id."""
+        return self._by_id.get(item_id)
+
+    def _expand_token(self, token: str) -> Optional[_TokenMatches]:
+        """Items matching one query token, exactly, as a singular, or by prefix."""
+        sources: List[Tuple[_TokenMatches, int]] = []
+        for variant in _variants(token):
+            matches = self._postings.get(variant)
+            if matches is not None:
+                sources.append((matches, 100))
+
+        if len(token) >= MIN_PREFIX_LEN:
+            start = bisect.bisect_left(self._vocabulary, token)
+            end = min(start + MAX_PREFIX_EXPANSIONS, len(self._vocabulary))
+            for i in range(start, end):
+                candidate = self._vocabulary[i]
+                if not candidate.startswith(token):
+                    break
+                if candidate != token:
+                    percent = 100 if candidate[len(token):] in PLURAL_SUFFIXES else PREFIX_PERCENT
+                    sources.append((self._postings[candidate], percent))
+
+        if not sources:
+            return None
+        if len(sources) == 1 and sources[0][1] == 100:
+            return sources[0][0]
+
+        weights: Dict[int, int] = {}
+        for matches, percent in sources:
+            for pos, weight in matches.weights.items():
+                weight = weight * percent // 100
+                if weights.get(pos, 0) < weight:
+                    weights[pos] = weight
+        return _TokenMatches(weights)
+
+    def search(self, query: str, limit: int = 5, match_all: bool = False) -> List[Dict]:
+        """
+        Rank catalog items against a spoken item name.
+
+        Args:
+            query: What the user asked for (e.g. "peanut butter", "tomatoes")
+            limit: Maximum number of items to return
+            match_all: Only return items matching every word; otherwise fall back
+                to items matching some of them when none match all
+
+        Returns:
+            Matching items, best first
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        per_token = [m for m in map(self._matches_for, tokens) if m is not None]
+        if not per_token or limit < 1:
+            return []
+
+        if match_all and len(per_token) < len(tokens):
+            # A word that matches nothing can't be matched by every item either
+            return []
+        results = self._search_all(per_token, limit)
+        if not results and not match_all:
+            results = self._search_any(per_token, limit)
+        return [self.items[pos] for _, pos in results]
+
+    def _search_all(self, per_token: List[_TokenMatches], limit: int) -> List[Tuple[int, int]]:
+        """
+        Top items matching every token, as (-score, position).
+
+        Walks the rarest token's matches strongest first and stops as soon as no
+        remaining item could outrank the current top results.
+        """
+        per_token = sorted(per_token, key=lambda m: len(m.ranked))
+        driver, others = per_token[0], per_token[1:]
+        others_best = sum(m.best for m in others)
+
+        # Min-heap of (score, -position): the root is the weakest result kept so far
+        top: List[Tuple[int, int]] = []
+        for neg_weight, pos in driver.ranked:
+            if len(top) == limit:
+                worst_score, worst_pos = top[0][0], -top[0][1]
+                bound = -neg_weight + others_best
+                if worst_score > bound or (worst_score == bound and worst_pos < pos):
+                    break
+
+            score = -neg_weight
+            for matches in others:
+                weight = matches.weights.get(pos)
+                if weight is None:
+                    break
+                score += weight
+            else:
+                if len(top) < limit:
+                    heapq.heappush(top, (score, -pos))
+                elif (score, -pos) > top[0]:
+                    heapq.heapreplace(top, (score, -pos))
+
+        return [(-score, -neg_pos) for score, neg_pos in sorted(top, reverse=True)]
+
+    def _search_any(self, per_token: List[_TokenMatches], limit: int) -> List[Tuple[int, int]]:
+        """Top items matching any token, preferring items that match more of them."""
+        totals: Dict[int, Tuple[int, int]] = {}
+        for matches in per_token:
+            for pos, weight in matches.weights.items():
+                hits, score = totals.get(pos, (0, 0))
+                totals[pos] = (hits + 1, score + weight)
+        ranked = heapq.nsmallest(limit, ((-hits, -score, pos) for pos, (hits, score) in totals.items()))
+        return [(neg_score, pos) for _, neg_score, pos in ranked]
+
+    def find(self, query: str, match_all: bool = False) -> Optional[Dict]:
+        """Return the best matching item for a spoken name, or None (see search())."""
+        results = self.search(query, limit=1, match_all=match_all)
+        return results[0] if results else None
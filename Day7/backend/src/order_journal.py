@@ -0,0 +1,274 @@
+"""
+Append-only order journal for QuickBasket.
+Checkouts append one JSON line instead of rewriting every past order.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("order_journal")
+
+BASE_DIR = Path(__file__).parent.parent
+ORDERS_FILE = BASE_DIR / "orders.json"
+ORDERS_JOURNAL_FILE = BASE_DIR / "orders.journal.jsonl"
+ORDERS_SNAPSHOT_FILE = BASE_DIR / "orders.snapshot.jsonl"
+
+DEFAULT_FSYNC_EVERY = 8
+DEFAULT_FSYNC_INTERVAL = 1.0
+DEFAULT_COMPACT_EVERY = 1000
+
+
+def _encode(order: Dict) -> bytes:
+    return (json.dumps(order, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make a rename in this directory durable (a no-op where directories can't be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class OrderJournal:
+    """
+    Orders stored as JSON Lines in two files.
+
+    New orders are appended to the journal, flushed to the OS right away and
+    fsynced in batches (every ``fsync_every`` orders or ``fsync_interval``
+    seconds, whichever comes first). Checkout only ever appends. Compaction
+    is a separate maintenance step (compact_if_due() once the journal holds
+    ``compact_every`` orders, or compact()): it rewrites the snapshot as the
+    newest record of every order, oldest first, into a temp file renamed
+    over the old one, then truncates the journal. An in-memory index maps
+    each order_id to its file and byte offset for direct lookups.
+
+    Compaction is idempotent: if the process dies after the rename but before
+    the journal is truncated, the journal's records are replayed on top of
+    the snapshot and the next compaction collapses them again by order_id.
+
+    Files are opened on first use. On the very first open, orders from the
+    legacy orders.json array are imported into the snapshot.
+    """
+
+    def __init__(
+        self,
+        journal_path: Path = ORDERS_JOURNAL_FILE,
+        snapshot_path: Path = ORDERS_SNAPSHOT_FILE,
+        legacy_path: Optional[Path] = ORDERS_FILE,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ):
+        self.journal_path = Path(journal_path)
+        self.snapshot_path = Path(snapshot_path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+
+        self._lock = threading.RLock()
+        # Append-only descriptor for the journal
+        self._journal: Optional[int] = None
+        # order_id -> (path, byte offset of its line)
+        self._index: Dict[str, Tuple[Path, int]] = {}
+        self._journal_count = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _ensure_open(self) -> int:
+        """Open files and build the offset index. Caller holds the lock."""
+        if self._journal is not None:
+            return self._journal
+
+        if not self.snapshot_path.exists():
+            self._import_legacy()
+
+        self._scan(self.snapshot_path)
+        self._journal_count = self._scan(self.journal_path)
+        self._journal = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        logger.info(f"📒 Order journal ready with {len(self._index)} orders")
+        return self._journal
+
+    def _import_legacy(self) -> None:
+        """Seed the snapshot from the legacy orders.json array."""
+        orders = []
+        if self.legacy_path and self.legacy_path.exists():
+            try:
+                with open(self.legacy_path) as f:
+                    orders = json.load(f)
+            except json.JSONDecodeError as e:
+                logger.error(f"❌ Could not import {self.legacy_path}: {e}")
+
+        temp_file = self.snapshot_path.with_suffix(".tmp")
+        with open(temp_file, "wb") as f:
+            for order in orders:
+                f.write(_encode(order))
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(self.snapshot_path)
+        if orders:
+            logger.info(f"📥 Imported {len(orders)} orders from {self.legacy_path.name}")
+
+    def _scan(self, path: Path) -> int:
+        """Index every complete line in a file, dropping a torn final line."""
+        if not path.exists():
+            return 0
+
+        count = 0
+        with open(path, "rb+") as f:
+            offset = 0
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    logger.warning(f"⚠️ Dropping incomplete order record at end of {path.name}")
+                    f.truncate(offset)
+                    break
+                try:
+                    order_id = json.loads(line)["order_id"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(f"⚠️ Skipping unreadable order record in {path.name} at byte {offset}")
+                else:
+                    self._index[order_id] = (path, offset)
+                    count += 1
+                offset += len(line)
+        return count
+
+    def _unique_id(self, order_id: str) -> str:
+        """Suffix order ids that collide with one already recorded."""
+        if order_id not in self._index:
+            return order_id
+        n = 2
+        while f"{order_id}-{n}" in self._index:
+            n += 1
+        return f"{order_id}-{n}"
+
+    def append(self, order: Dict) -> Dict:
+        """
+        Record an order.
+
+        Args:
+            order: Order object with an "order_id"
+
+        Returns:
+            The order as stored; its order_id is suffixed if it collided
+        """
+        with self._lock:
+            journal = self._ensure_open()
+            order_id = self._unique_id(order["order_id"])
+            if order_id != order["order_id"]:
+                order = {**order, "order_id": order_id}
+
+            offset = os.lseek(journal, 0, os.SEEK_END)
+            os.write(journal, _encode(order))
+            self._index[order_id] = (self.journal_path, offset)
+            self._journal_count += 1
+            self._unsynced += 1
+
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync_locked()
+            return order
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        """Look up an order by id without reading the rest of the history."""
+        with self._lock:
+            self._ensure_open()
+            location = self._index.get(order_id)
+            if location is None:
+                return None
+            path, offset = location
+            with open(path, "rb") as f:
+                f.seek(offset)
+                return json.loads(f.readline())
+
+    def __contains__(self, order_id: str) -> bool:
+        with self._lock:
+            self._ensure_open()
+            return order_id in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_open()
+            return len(self._index)
+
+    def _sync_locked(self) -> None:
+        if self._journal is not None and self._unsynced:
+            os.fsync(self._journal)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Force any batched orders to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def _compact_locked(self) -> None:
+        journal = self._ensure_open()
+        self._sync_locked()
+        if not self._journal_count:
+            return
+
+        # Copy only the line each order_id's index entry points at, i.e. its newest record
+        index: Dict[str, Tuple[Path, int]] = {}
+        temp_file = self.snapshot_path.with_suffix(".tmp")
+        with open(temp_file, "wb") as dst:
+            for path in (self.snapshot_path, self.journal_path):
+                if not path.exists():
+                    continue
+                with open(path, "rb") as src:
+                    offset = 0
+                    for line in src:
+                        try:
+                            order_id = json.loads(line)["order_id"]
+                        except (json.JSONDecodeError, KeyError, TypeError):
+                            order_id = None
+                        if order_id is not None and self._index.get(order_id) == (path, offset):
+                            index[order_id] = (self.snapshot_path, dst.tell())
+                            dst.write(line)
+                        offset += len(line)
+            dst.flush()
+            os.fsync(dst.fileno())
+        temp_file.replace(self.snapshot_path)
+        _fsync_dir(self.snapshot_path.parent)
+        self._index = index
+
+        os.ftruncate(journal, 0)
+        os.fsync(journal)
+        logger.info(f"🗜️ Compacted {self._journal_count} orders into {self.snapshot_path.name} ({len(index)} orders)")
+        self._journal_count = 0
+
+    def compact(self) -> None:
+        """Rewrite the snapshot with the newest record of every order and start a fresh journal."""
+        with self._lock:
+            self._compact_locked()
+
+    def compact_if_due(self) -> bool:
+        """
+        Compact once the journal holds ``compact_every`` orders.
+
+        Reads the whole history, so run it off the checkout path (e.g. in a
+        thread at shutdown). Returns whether it compacted.
+        """
+        with self._lock:
+            self._ensure_open()
+            if self._journal_count < self.compact_every:
+                return False
+            self._compact_locked()
+            return True
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        with self._lock:
+            if self._journal is not None:
+                self._sync_locked()
+                os.close(self._journal)
+                self._journal = None
+                self._index.clear()
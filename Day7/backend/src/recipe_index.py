@@ -0,0 +1,124 @@
+"""
+Recipe index for QuickBasket.
+Resolves spoken dish names to recipes.json keys by scored similarity instead of
+taking the first substring hit.
+"""
+
+import functools
+import heapq
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words people wrap around a dish name that say nothing about the dish
+FILLER_WORDS = frozenset({
+    "a", "an", "the", "some", "please", "for", "to", "of", "me", "i", "we",
+    "want", "need", "make", "making", "get", "add",
+    "ingredient", "ingredients", "recipe", "stuff", "things", "everything",
+})
+
+TRIGRAM_WEIGHT = 0.6
+TOKEN_WEIGHT = 0.4
+# Added when every word of the recipe name was spoken
+CONTAINMENT_BONUS = 0.2
+MIN_SCORE = 0.45
+RESOLVE_CACHE_SIZE = 1024
+
+
+def _singular(token: str) -> str:
+    if len(token) > 4 and token.endswith(("ches", "shes", "xes", "ses")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize(text: str) -> Tuple[str, ...]:
+    """Lowercase, drop filler words and plurals: "Ingredients for Tea-Time Snacks" -> ("tea", "time", "snack")."""
+    return tuple(_singular(t) for t in _TOKEN_RE.findall(text.lower()) if t not in FILLER_WORDS)
+
+
+def trigrams(tokens: Iterable[str]) -> Set[str]:
+    """Character trigrams of the joined tokens, padded so word edges count."""
+    text = f"  {' '.join(tokens)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class RecipeIndex:
+    """
+    Precomputed similarity index over recipe names.
+
+    Each recipe name is normalized to tokens and character trigrams once. A dish
+    name is scored only against recipes sharing at least one trigram with it,
+    using trigram Dice similarity plus token overlap, with a bonus when the
+    whole recipe name was spoken. Ties break on the recipe name, so the result
+    never depends on recipes.json ordering. Resolved utterances are cached.
+    """
+
+    def __init__(self, recipe_names: Iterable[str], cache_size: int = RESOLVE_CACHE_SIZE):
+        self._names: List[str] = sorted(set(recipe_names))
+        self._tokens: List[Set[str]] = []
+        self._trigram_counts: List[int] = []
+        self._by_trigram: Dict[str, List[int]] = {}
+
+        for i, name in enumerate(self._names):
+            tokens = normalize(name) or tuple(_TOKEN_RE.findall(name.lower()))
+            grams = trigrams(tokens)
+            self._tokens.append(set(tokens))
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._by_trigram.setdefault(gram, []).append(i)
+
+        self._resolve_normalized = functools.lru_cache(maxsize=cache_size)(self._best_match)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def rank(self, dish_name: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """Score recipes against a dish name, best first, as (recipe name, score)."""
+        scored = heapq.nsmallest(limit, self._score(normalize(dish_name)))
+        return [(name, -neg_score) for neg_score, name in scored]
+
+    def _score(self, tokens: Tuple[str, ...]) -> List[Tuple[float, str]]:
+        """(-score, recipe name) for every recipe sharing a trigram with the tokens."""
+        if not tokens:
+            return []
+
+        grams = trigrams(tokens)
+        shared: Counter = Counter()
+        for gram in grams:
+            for i in self._by_trigram.get(gram, ()):
+                shared[i] += 1
+
+        spoken = set(tokens)
+        scored = []
+        for i, common in shared.items():
+            dice = 2 * common / (len(grams) + self._trigram_counts[i])
+            recipe_tokens = self._tokens[i]
+            overlap = len(spoken & recipe_tokens) / len(spoken | recipe_tokens)
+            score = TRIGRAM_WEIGHT * dice + TOKEN_WEIGHT * overlap
+            if recipe_tokens <= spoken:
+                score += CONTAINMENT_BONUS
+            scored.append((-score, self._names[i]))
+        return scored
+
+    def _best_match(self, tokens: Tuple[str, ...]) -> Optional[str]:
+        scored = self._score(tokens)
+        if not scored:
+            return None
+        neg_score, name = min(scored)
+        return name if -neg_score >= MIN_SCORE else None
+
+    def resolve(self, dish_name: str) -> Optional[str]:
+        """
+        Find the recipe a spoken dish name refers to.
+
+        Args:
+            dish_name: What the user asked for (e.g. "a peanut butter sandwich", "tea snacks")
+
+        Returns:
+            The matching recipe name, or None if nothing is close enough
+        """
+        return self._resolve_normalized(normalize(dish_name))
@@ -0,0 +1,250 @@
+import json
+
+from cart_manager import CartManager
+from cart_store import CartStore, session_key
+from catalog_index import CatalogIndex
+from order_journal import OrderJournal
+from recipe_index import RecipeIndex
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _store(**kwargs) -> CartStore:
+    return CartStore(prototype=CartManager(), **kwargs)
+
+
+def test_sessions_do_not_share_carts() -> None:
+    store = _store()
+    alice = store.get(session_key("room-a"))
+    bob = store.get(session_key("room-b"))
+
+    alice.add_to_cart("eggs_brown", 2)
+
+    assert alice is not bob
+    assert alice.list_cart()["item_count"] == 1
+    assert bob.list_cart()["item_count"] == 0
+    assert store.get(session_key("room-a")) is alice
+
+
+def test_session_carts_share_catalog() -> None:
+    store = _store()
+    first = store.get("room-a")
+    second = store.get("room-b")
+
+    assert first.catalog is second.catalog
+    assert first.recipes is second.recipes
+
+
+def test_idle_carts_expire() -> None:
+    clock = FakeClock()
+    store = _store(ttl_seconds=60, clock=clock)
+    cart = store.get("room-a")
+
+    clock.now = 30
+    assert store.get("room-a") is cart
+
+    clock.now = 100
+    store.evict_expired()
+    assert "room-a" not in store
+    assert store.get("room-a") is not cart
+
+
+def test_store_is_bounded() -> None:
+    store = _store(stripes=1, max_sessions=2)
+    store.get("room-a")
+    store.get("room-b")
+    store.get("room-a")
+    store.get("room-c")
+
+    assert len(store) == 2
+    assert "room-a" in store
+    assert "room-b" not in store
+
+
+def test_session_key_scopes_participant() -> None:
+    assert session_key("room") == "room"
+    assert session_key("room", "user-1") == "room:user-1"
+
+    store = _store()
+    first = store.get(session_key("room", "user-1"))
+    second = store.get(session_key("room", "user-2"))
+    assert first is not second
+
+    assert store.release(session_key("room", "user-1"))
+    assert not store.release(session_key("room", "user-1"))
+    assert len(store) == 1
+
+
+def test_catalog_index_lookups() -> None:
+    index = CartManager().catalog_index
+
+    assert index.get("eggs_brown")["name"] == "Brown Eggs"
+    assert index.get("missing") is None
+    assert index.find("peanut butter")["id"] == "peanut_butter_jar"
+    assert index.find("tomatoes")["id"] == "tomato"
+    assert index.find("tomato")["id"] == "tomato"
+    assert index.find("amul butter")["id"] == "butter_salted"
+    assert index.find("spaceship") is None
+
+
+def test_catalog_index_prefers_items_matching_every_word() -> None:
+    index = CatalogIndex([
+        {"id": "a", "name": "Salted Chips", "brand": "Crunch", "tags": ["snack"]},
+        {"id": "b", "name": "Salted Butter", "brand": "Amul", "tags": ["dairy"]},
+        {"id": "c", "name": "Butter Cookies", "brand": "Amul", "tags": ["snack"]},
+    ])
+
+    assert next(iter(item["id"] for item in index.search("salted butter"))) == "b"
+    assert [item["id"] for item in index.search("amul snack")] == ["c"]
+    assert [item["id"] for item in index.search("amul chips")] == ["a", "b", "c"]
+    assert index.search("amul chips", match_all=True) == []
+
+
+def test_remove_and_update_only_act_on_a_full_name_match() -> None:
+    cart = CartManager()
+    cart.add_to_cart("milk_full_cream", 1)
+
+    # "oat milk" shares one word with Full Cream Milk; suggestions may offer it, removal must not
+    assert cart.find_item_by_name("oat milk")["id"] == "milk_full_cream"
+    assert cart.find_item_by_name("oat milk", match_all=True) is None
+    assert cart.find_item_by_name("cream milk", match_all=True)["id"] == "milk_full_cream"
+
+
+def _journal(tmp_path, **kwargs) -> OrderJournal:
+    return OrderJournal(
+        journal_path=tmp_path / "orders.journal.jsonl",
+        snapshot_path=tmp_path / "orders.snapshot.jsonl",
+        legacy_path=tmp_path / "orders.json",
+        **kwargs,
+    )
+
+
+def test_save_order_appends_to_journal(tmp_path) -> None:
+    (tmp_path / "orders.json").write_text(json.dumps([{"order_id": "ORD-OLD", "items": []}]))
+    journal = _journal(tmp_path)
+    cart = CartManager(order_journal=journal)
+    cart.add_to_cart("eggs_brown", 2)
+
+    order = cart.save_order("Asha")
+
+    assert order["order_total"] == 180.0
+    assert cart.list_cart()["item_count"] == 0
+    assert cart.get_order(order["order_id"])["customer_name"] == "Asha"
+    assert journal.get("ORD-OLD") == {"order_id": "ORD-OLD", "items": []}
+    assert len(journal) == 2
+
+
+def test_journal_suffixes_colliding_order_ids(tmp_path) -> None:
+    journal = _journal(tmp_path)
+
+    first = journal.append({"order_id": "ORD-1"})
+    second = journal.append({"order_id": "ORD-1"})
+
+    assert first["order_id"] == "ORD-1"
+    assert second["order_id"] == "ORD-1-2"
+
+
+def test_journal_compacts_into_snapshot(tmp_path) -> None:
+    journal = _journal(tmp_path, compact_every=3)
+    for i in range(2):
+        journal.append({"order_id": f"ORD-{i}", "n": i})
+    assert not journal.compact_if_due()
+
+    # Checkout only appends; compaction waits for the maintenance step
+    for i in range(2, 4):
+        journal.append({"order_id": f"ORD-{i}", "n": i})
+    assert len((tmp_path / "orders.journal.jsonl").read_text().splitlines()) == 4
+    assert journal.compact_if_due()
+
+    assert len((tmp_path / "orders.snapshot.jsonl").read_text().splitlines()) == 4
+    assert (tmp_path / "orders.journal.jsonl").read_bytes() == b""
+    journal.append({"order_id": "ORD-4", "n": 4})
+    assert journal.get("ORD-0")["n"] == 0
+    assert journal.get("ORD-3")["n"] == 3
+
+    journal.close()
+    reopened = _journal(tmp_path)
+    assert len(reopened) == 5
+    assert reopened.get("ORD-2")["n"] == 2
+    assert reopened.get("ORD-4")["n"] == 4
+
+
+def test_recipe_index_resolves_spoken_dish_names() -> None:
+    index = RecipeIndex(["maggi", "simple maggi", "peanut butter sandwich", "tea time snacks", "basic cooking"])
+
+    assert index.resolve("Maggi") == "maggi"
+    assert index.resolve("simple maggi") == "simple maggi"
+    assert index.resolve("ingredients for a peanut butter sandwich please") == "peanut butter sandwich"
+    assert index.resolve("tea snacks") == "tea time snacks"
+    assert index.resolve("maggie") == "maggi"
+    assert index.resolve("chicken curry") is None
+
+
+def test_recipe_resolution_ignores_recipe_order() -> None:
+    names = ["simple sandwich", "peanut butter sandwich", "simple pasta", "pasta for two"]
+
+    assert RecipeIndex(names).resolve("sandwich") == RecipeIndex(reversed(names)).resolve("sandwich")
+    assert RecipeIndex(names).resolve("pasta") == RecipeIndex(reversed(names)).resolve("pasta")
+
+
+def test_add_ingredients_for_dish_uses_best_match() -> None:
+    cart = CartManager()
+
+    message = cart.add_ingredients_for_dish("I want to make maggi", servings=2)
+
+    assert "for maggi" in message
+    assert {item["item_id"] for item in cart.list_cart()["items"]} == {"instant_noodles", "butter_salted", "onion"}
+
+
+def test_cart_total_is_maintained_incrementally() -> None:
+    cart = CartManager()
+    cart.add_to_cart("eggs_brown", 2)
+    cart.add_to_cart("milk_full_cream")
+    cart.add_to_cart("eggs_brown")
+    cart.update_quantity("milk_full_cream", 3)
+
+    assert cart.total == 3 * 90.0 + 3 * 65.0
+    assert cart.list_cart()["items"][0] == {
+        "item_id": "eggs_brown",
+        "name": "Brown Eggs",
+        "quantity": 3,
+        "unit_price": 90.0,
+        "line_total": 270.0,
+        "notes": "",
+    }
+
+    cart.remove_from_cart("eggs_brown")
+    assert cart.total == 195.0
+    assert cart.item_count == 1
+
+    cart.update_quantity("milk_full_cream", 0)
+    assert cart.list_cart() == {"items": [], "total": 0.0, "item_count": 0}
+
+
+def test_compaction_keeps_one_record_per_order_after_a_crash(tmp_path) -> None:
+    journal = _journal(tmp_path, compact_every=100)
+    for i in range(3):
+        journal.append({"order_id": f"ORD-{i}", "n": i})
+    journal.sync()
+    pending = (tmp_path / "orders.journal.jsonl").read_bytes()
+    journal.compact()
+    journal.close()
+
+    # Died after the snapshot was renamed into place but before the journal was truncated
+    (tmp_path / "orders.journal.jsonl").write_bytes(pending)
+    reopened = _journal(tmp_path, compact_every=100)
+    assert len(reopened) == 3
+    reopened.append({"order_id": "ORD-3", "n": 3})
+    reopened.compact()
+
+    lines = (tmp_path / "orders.snapshot.jsonl").read_text().splitlines()
+    assert [json.loads(line)["order_id"] for line in lines] == ["ORD-0", "ORD-1", "ORD-2", "ORD-3"]
+    assert (tmp_path / "orders.journal.jsonl").read_bytes() == b""
+    assert not (tmp_path / "orders.snapshot.tmp").exists()
+    assert reopened.get("ORD-1") == {"order_id": "ORD-1", "n": 1}
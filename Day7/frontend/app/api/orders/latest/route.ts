@@ -1,13 +1,65 @@
 import { NextResponse } from 'next/server';
-import { readFile } from 'fs/promises';
+import { open, readFile } from 'fs/promises';
 import { join } from 'path';
 
+// Written by backend/src/order_journal.py: new orders are appended to the journal,
+// and compaction rewrites the snapshot with one line per order, newest last
+const BACKEND_DIR = join(process.cwd(), '..', 'backend');
+const ORDER_FILES = ['orders.journal.jsonl', 'orders.snapshot.jsonl'];
+
+// Bytes read per step backwards from the end of a file
+const TAIL_CHUNK = 64 * 1024;
+
+// Only the end of the file is read, so the cost doesn't grow with the order history
+async function lastLine(path: string) {
+  let file;
+  try {
+    file = await open(path, 'r');
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code === 'ENOENT') {
+      return null;
+    }
+    throw error;
+  }
+
+  try {
+    const { size } = await file.stat();
+    let end = size;
+    let tail = Buffer.alloc(0);
+    while (end > 0) {
+      const start = Math.max(0, end - TAIL_CHUNK);
+      const chunk = Buffer.alloc(end - start);
+      await file.read(chunk, 0, chunk.length, start);
+      tail = Buffer.concat([chunk, tail]);
+      end = start;
+
+      // A line without its trailing newline is still being written
+      const lines = tail.toString('utf-8').split('\n').slice(0, -1);
+      // The first line may be cut off unless we've reached the start of the file
+      const firstComplete = end > 0 ? 1 : 0;
+      for (let i = lines.length - 1; i >= firstComplete; i--) {
+        if (lines[i].trim()) {
+          return JSON.parse(lines[i]);
+        }
+      }
+    }
+  } finally {
+    await file.close();
+  }
+  return null;
+}
+
 export async function GET() {
   try {
-    // Path to orders.json in backend directory
-    const ordersPath = join(process.cwd(), '..', 'backend', 'orders.json');
-    
-    const fileContent = await readFile(ordersPath, 'utf-8');
+    for (const file of ORDER_FILES) {
+      const order = await lastLine(join(BACKEND_DIR, file));
+      if (order) {
+        return NextResponse.json({ order });
+      }
+    }
+
+    // Orders from before the journal, not yet imported by the backend
+    const fileContent = await readFile(join(BACKEND_DIR, 'orders.json'), 'utf-8');
     const orders = JSON.parse(fileContent);
 
     if (!orders || orders.length === 0) {
@@ -16,7 +68,7 @@ export async function GET() {
 
     // Return the last order
     const lastOrder = orders[orders.length - 1];
-    
+
     return NextResponse.json({ order: lastOrder });
   } catch (error) {
     console.error('Error reading orders:', error);